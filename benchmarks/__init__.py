@@ -0,0 +1,6 @@
+"""
+인증 방식별 성능 벤치마크
+
+- run: 파일 키 / Vault KV / Vault Transit 앱을 로컬 대역으로 실행하여 sign, verify, login, /api/user 측정
+- batch_signing: Transit 토큰당 서명 vs batch_input 일괄 서명 비교 (실제 Vault 필요)
+"""
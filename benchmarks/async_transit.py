@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Vault Transit 앱 동기(Flask, 스레드) vs 비동기(Quart, ASGI) 벤치마크
+
+두 앱을 각각 별도 프로세스의 HTTP 서버로 실행하고 /api/user/<id>에 고정 동시성으로 요청을 보내
+p50/p95/p99 지연 시간, 처리량, 서버 스레드 수, Vault 대역 서버가 받은 TCP 연결 수를 비교합니다.
+Vault는 HTTP 대역 서버(benchmarks.vault_server), PostgreSQL은 지연을 넣은 메모리 대역으로 대체합니다.
+토큰 캐시는 끄고(TOKEN_CACHE_SIZE=0) 요청마다 Vault 서명 검증이 일어나도록 합니다.
+
+사용법:
+    python3 -m benchmarks.async_transit --concurrency 8 32 128 --requests 2000 \
+        --vault-latency-ms 5 --db-latency-ms 5 --output async_bench.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import threading
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TRANSIT_APP_DIR = os.path.join(REPO_ROOT, 'vault-transit-solution')
+
+
+def serve(args):
+    """앱 서버 프로세스: DB 조회를 대역으로 바꾸고 동기(werkzeug) 또는 비동기(uvicorn) 서버 실행"""
+    sys.path.insert(0, TRANSIT_APP_DIR)
+    sys.path.insert(0, REPO_ROOT)
+    from benchmarks.standins import AsyncUserStore, UserStore
+
+    if args.serve == 'sync':
+        from werkzeug.serving import WSGIRequestHandler, make_server
+        import app as app_module
+        import database
+
+        store = UserStore(database.User, count=args.users, latency_ms=args.db_latency_ms)
+        app_module.get_user_by_id = store.get_user_by_id
+        app_module.get_user_by_username_with_hash = store.get_user_by_username_with_hash
+
+        class KeepAliveHandler(WSGIRequestHandler):
+            # 부하 발생기의 keep-alive 연결 재사용 (비동기 서버와 같은 조건)
+            protocol_version = 'HTTP/1.1'
+            disable_nagle_algorithm = True
+
+            def log_request(self, *args, **kwargs):
+                pass
+
+        server = make_server('127.0.0.1', args.port, app_module.app, threaded=True, request_handler=KeepAliveHandler)
+        server.serve_forever()
+    else:
+        import uvicorn
+        import asgi_app
+        import database
+
+        store = AsyncUserStore(database.User, count=args.users, latency_ms=args.db_latency_ms)
+        asgi_app.get_user_by_id = store.get_user_by_id
+        asgi_app.get_user_by_username_with_hash = store.get_user_by_username_with_hash
+        uvicorn.run(asgi_app.app, host='127.0.0.1', port=args.port, log_level='warning', access_log=False)
+
+
+def start_server(kind, port, args, standin):
+    env = dict(
+        os.environ,
+        VAULT_ADDR=standin.url,
+        VAULT_TOKEN=standin.token,
+        TRANSIT_VERIFY_MODE='vault',
+        TOKEN_CACHE_SIZE='0',
+        CLIENT_REJECT_THRESHOLD='0',
+    )
+    command = [
+        sys.executable, '-m', 'benchmarks.async_transit', '--serve', kind, '--port', str(port),
+        '--users', str(args.users), '--db-latency-ms', str(args.db_latency_ms),
+    ]
+    process = subprocess.Popen(command, cwd=REPO_ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    import httpx
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"{kind} 서버 실행 실패:\n{process.stderr.read().decode()}")
+        try:
+            httpx.get(f'http://127.0.0.1:{port}/api/token-cache/stats', timeout=1)
+            return process
+        except httpx.TransportError:
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError(f"{kind} 서버가 30초 안에 시작되지 않았습니다")
+
+
+def thread_count(pid):
+    """프로세스의 스레드 수 (Linux /proc, 다른 OS에서는 None)"""
+    try:
+        with open(f'/proc/{pid}/status') as f:
+            for line in f:
+                if line.startswith('Threads:'):
+                    return int(line.split()[1])
+    except OSError:
+        return None
+    return None
+
+
+class ThreadSampler:
+    """측정 구간 동안 서버 프로세스의 최대 스레드 수 기록"""
+
+    def __init__(self, pid, interval=0.05):
+        self.pid = pid
+        self.interval = interval
+        self.peak = thread_count(pid)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            count = thread_count(self.pid)
+            if count is not None:
+                self.peak = max(self.peak or 0, count)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+async def run_load(base_url, tokens, users, total, concurrency):
+    """GET /api/user/<id>를 total번, concurrency개 연결로 실행"""
+    import httpx
+    from benchmarks.harness import summarize
+
+    latencies = []
+    errors = 0
+    counter = iter(range(total))
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+        async def worker():
+            nonlocal errors
+            for i in counter:
+                index = i % len(tokens)
+                started = time.perf_counter()
+                try:
+                    response = await client.get(
+                        f'/api/user/{users[index]}',
+                        headers={'Authorization': f'Bearer {tokens[index]}'}
+                    )
+                    ok = response.status_code == 200
+                except httpx.HTTPError:
+                    ok = False
+                latencies.append(time.perf_counter() - started)
+                if not ok:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    return summarize(latencies, elapsed, errors)
+
+
+def mint_tokens(count):
+    """벤치마크용 토큰 발급 (앱의 auth 모듈로 Vault 대역에서 일괄 서명)"""
+    sys.path.insert(0, TRANSIT_APP_DIR)
+    import auth
+    users = [
+        {'user_id': user_id, 'username': f'user{user_id}', 'email': f'user{user_id}@example.com'}
+        for user_id in range(1, count + 1)
+    ]
+    return [u['user_id'] for u in users], auth.create_tokens(users)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Vault Transit 앱 동기 / 비동기(ASGI) 벤치마크')
+    parser.add_argument('--apps', nargs='+', choices=['sync', 'async'], default=['sync', 'async'])
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[8, 32, 128])
+    parser.add_argument('--requests', type=int, default=2000, help='동시성 단계별 요청 수')
+    parser.add_argument('--warmup', type=int, default=50)
+    parser.add_argument('--users', type=int, default=500, help='대역 저장소의 사용자 수 (= 발급할 토큰 수)')
+    parser.add_argument('--vault-latency-ms', type=float, default=5.0, help='Vault 대역 호출당 지연')
+    parser.add_argument('--db-latency-ms', type=float, default=5.0, help='DB 대역 호출당 지연')
+    parser.add_argument('--port', type=int, default=5099, help='앱 서버 포트')
+    parser.add_argument('--output', default='async_bench.json', help='결과 JSON 파일 경로')
+    parser.add_argument('--serve', choices=['sync', 'async'], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args)
+        return
+
+    sys.path.insert(0, REPO_ROOT)
+    from benchmarks.vault_server import VaultStandin
+
+    standin = VaultStandin(latency_ms=0, seed=0).start()
+    os.environ['VAULT_ADDR'] = standin.url
+    os.environ['VAULT_TOKEN'] = standin.token
+    user_ids, tokens = mint_tokens(args.users)
+    standin.configure(latency_ms=args.vault_latency_ms)
+
+    results = []
+    try:
+        for kind in args.apps:
+            print(f"[{kind}] 실행 중...", file=sys.stderr)
+            process = start_server(kind, args.port, args, standin)
+            base_url = f'http://127.0.0.1:{args.port}'
+            try:
+                asyncio.run(run_load(base_url, tokens, user_ids, args.warmup, min(args.warmup, 8)))
+                for concurrency in args.concurrency:
+                    calls_before = standin.calls.total()
+                    opened_before = standin.connections_opened
+                    standin.reset_connection_peak()
+                    with ThreadSampler(process.pid) as threads:
+                        summary = asyncio.run(run_load(base_url, tokens, user_ids, args.requests, concurrency))
+                    summary.update({
+                        'app': kind,
+                        'concurrency': concurrency,
+                        'vault_calls_per_request': round((standin.calls.total() - calls_before) / args.requests, 4),
+                        'vault_connections_opened': standin.connections_opened - opened_before,
+                        'vault_connections_peak': standin.connections_peak,
+                        'server_threads_peak': threads.peak,
+                    })
+                    results.append(summary)
+            finally:
+                process.terminate()
+                process.wait(timeout=10)
+    finally:
+        standin.stop()
+
+    report = {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'requests': args.requests,
+            'concurrency': args.concurrency,
+            'vault_latency_ms': args.vault_latency_ms,
+            'db_latency_ms': args.db_latency_ms,
+        },
+        'results': results,
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print_table(results)
+    print(f"\n결과 저장: {args.output}")
+
+
+def print_table(results):
+    header = (f"{'app':<7}{'conc':>6}{'rps':>10}{'p50':>9}{'p95':>9}{'p99':>9}"
+              f"{'vault conn':>12}{'peak':>6}{'threads':>9}{'err':>6}")
+    print(header)
+    print('-' * len(header))
+    for r in results:
+        print(f"{r['app']:<7}{r['concurrency']:>6}{r['throughput_rps']:>10.1f}"
+              f"{r['p50_ms']:>9.2f}{r['p95_ms']:>9.2f}{r['p99_ms']:>9.2f}"
+              f"{r['vault_connections_opened']:>12}{r['vault_connections_peak']:>6}"
+              f"{str(r['server_threads_peak']):>9}{r['errors']:>6}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Vault Transit 토큰 발급 벤치마크: 토큰당 sign 호출 vs batch_input 일괄 서명
+
+사용법:
+    VAULT_ADDR=http://localhost:8200 VAULT_TOKEN=root-token \
+        python3 benchmarks/batch_signing.py --count 2000 --chunk-size 50 250 1000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+TRANSIT_APP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'vault-transit-solution')
+sys.path.insert(0, TRANSIT_APP_DIR)
+
+from auth import create_token, create_tokens  # noqa: E402
+
+
+def make_users(count):
+    return [
+        {'user_id': i, 'username': f'svc-{i}', 'email': f'svc-{i}@example.com'}
+        for i in range(1, count + 1)
+    ]
+
+
+def bench_loop(users):
+    started = time.perf_counter()
+    tokens = [create_token(u['user_id'], u['username'], u['email']) for u in users]
+    return tokens, time.perf_counter() - started
+
+
+def bench_batch(users, chunk_size):
+    started = time.perf_counter()
+    tokens = create_tokens(users, chunk_size=chunk_size)
+    return tokens, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Transit 토큰 발급 처리량 비교')
+    parser.add_argument('--count', type=int, default=1000, help='발급할 토큰 수')
+    parser.add_argument('--chunk-size', type=int, nargs='+', default=[50, 250, 1000], help='batch_input chunk 크기')
+    parser.add_argument('--skip-loop', action='store_true', help='토큰당 호출 루프 측정 생략')
+    args = parser.parse_args()
+
+    users = make_users(args.count)
+    print(f"토큰 {args.count}개 발급 (Vault: {os.getenv('VAULT_ADDR', 'http://localhost:8200')})")
+    print(f"{'방식':<24}{'Vault 호출':>12}{'소요(초)':>12}{'토큰/초':>12}{'배율':>8}")
+
+    baseline = None
+    if not args.skip_loop:
+        tokens, elapsed = bench_loop(users)
+        assert len(tokens) == args.count
+        baseline = args.count / elapsed
+        print(f"{'토큰당 sign 호출':<24}{args.count:>12}{elapsed:>12.3f}{baseline:>12.1f}{'1.0x':>8}")
+
+    for chunk_size in args.chunk_size:
+        tokens, elapsed = bench_batch(users, chunk_size)
+        assert len(tokens) == args.count
+        rate = args.count / elapsed
+        calls = -(-args.count // chunk_size)
+        speedup = f"{rate / baseline:.1f}x" if baseline else '-'
+        print(f"{f'batch (chunk={chunk_size})':<24}{calls:>12}{elapsed:>12.3f}{rate:>12.1f}{speedup:>8}")
+
+
+if __name__ == '__main__':
+    main()
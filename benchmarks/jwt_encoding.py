@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Transit 토큰 조립 / 파싱 마이크로 벤치마크: 이전 PyJWT + base64 왕복 vs jwt_codec
+
+Vault 호출을 제외한 앱 쪽 비용만 토큰 1개 단위로 비교합니다.
+- 발급: 서명할 데이터(header.payload) 생성 + Transit input(base64) + Transit 서명 -> JWT 서명 세그먼트
+- 검증: TokenPreflight.check (헤더 / 페이로드 / 서명 디코딩과 클레임 확인)
+  이전 방식은 base64.urlsafe_b64decode를 쓰고 헤더를 매번 파싱하도록 되돌려 측정
+토큰당 시간은 timeit 최솟값, 메모리는 tracemalloc으로 잰 토큰 1개 처리 중 최대 임시 할당량입니다.
+
+사용법:
+    python3 benchmarks/jwt_encoding.py --number 20000 --repeat 5
+"""
+
+import argparse
+import base64
+import json
+import os
+import sys
+import timeit
+import tracemalloc
+
+TRANSIT_APP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'vault-transit-solution')
+sys.path.insert(0, TRANSIT_APP_DIR)
+
+import jwt  # noqa: E402
+import jwt_codec  # noqa: E402
+import token_preflight  # noqa: E402
+
+ISSUER = 'vault-transit-app'
+KEY_VERSION = 1
+CLAIMS = {
+    'user_id': 12345,
+    'username': 'svc-12345',
+    'email': 'svc-12345@example.com',
+    'iat': 1760000000,
+    'exp': 4102444800,
+    'iss': ISSUER,
+}
+# RSA-2048 서명 크기(256바이트)의 Transit 서명
+TRANSIT_SIGNATURE = f"vault:v{KEY_VERSION}:{base64.b64encode(os.urandom(256)).decode()}"
+
+
+def legacy_assemble():
+    """이전 auth.py의 발급 경로 (PyJWT로 페이로드 세그먼트, 서명은 디코딩 후 재인코딩)"""
+    header = {'alg': 'RS256', 'typ': 'JWT', 'kid': f'v{KEY_VERSION}'}
+    header_b64 = base64.urlsafe_b64encode(
+        json.dumps(header, separators=(',', ':')).encode('utf-8')
+    ).decode().rstrip('=')
+    payload_b64 = jwt.encode(CLAIMS, '', algorithm='none').split('.')[1]
+    signing_input = f"{header_b64}.{payload_b64}"
+    transit_input = base64.b64encode(signing_input.encode('utf-8')).decode('utf-8')
+    signature_bytes = base64.b64decode(TRANSIT_SIGNATURE[len(f'vault:v{KEY_VERSION}:'):])
+    signature_b64 = base64.urlsafe_b64encode(signature_bytes).decode().rstrip('=')
+    return transit_input, f"{signing_input}.{signature_b64}"
+
+
+def codec_assemble():
+    """jwt_codec 발급 경로"""
+    signing_input = jwt_codec.signing_input(KEY_VERSION, CLAIMS)
+    transit_input = jwt_codec.transit_input(signing_input)
+    signature_b64 = jwt_codec.transit_signature_segment(TRANSIT_SIGNATURE[len(f'vault:v{KEY_VERSION}:'):])
+    return transit_input, f"{signing_input}.{signature_b64}"
+
+
+def legacy_b64url_decode(segment):
+    return base64.urlsafe_b64decode(segment + '=' * (-len(segment) % 4))
+
+
+class LegacyDecoding:
+    """측정 구간 동안 token_preflight를 이전 디코딩(헤더 캐시 없음)으로 되돌림"""
+
+    def __enter__(self):
+        self._saved = token_preflight.b64url_decode, token_preflight.decode_header
+        token_preflight.b64url_decode = legacy_b64url_decode
+        token_preflight.decode_header = token_preflight.decode_header.__wrapped__
+        return self
+
+    def __exit__(self, *exc):
+        token_preflight.b64url_decode, token_preflight.decode_header = self._saved
+
+
+def measure(func, number, repeat):
+    """(토큰당 µs, 토큰 1개 처리 중 최대 임시 할당 바이트)"""
+    func()
+    best = min(timeit.repeat(func, number=number, repeat=repeat)) / number
+    tracemalloc.start()
+    try:
+        peaks = []
+        for _ in range(100):
+            baseline = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            func()
+            peaks.append(tracemalloc.get_traced_memory()[1] - baseline)
+    finally:
+        tracemalloc.stop()
+    return best * 1e6, sorted(peaks)[len(peaks) // 2]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Transit 토큰 조립 / 파싱 비용 비교')
+    parser.add_argument('--number', type=int, default=20000, help='반복당 실행 횟수')
+    parser.add_argument('--repeat', type=int, default=5, help='timeit 반복 횟수 (최솟값 사용)')
+    args = parser.parse_args()
+
+    legacy_input, legacy_token = legacy_assemble()
+    codec_input, codec_token = codec_assemble()
+    assert (legacy_input, legacy_token) == (codec_input, codec_token), '두 방식의 토큰이 다릅니다'
+
+    legacy_preflight = token_preflight.TokenPreflight(ISSUER)
+    codec_preflight = token_preflight.TokenPreflight(ISSUER)
+    assert codec_preflight.check(codec_token).key_version == KEY_VERSION
+
+    results = [
+        ('발급', measure(legacy_assemble, args.number, args.repeat), measure(codec_assemble, args.number, args.repeat)),
+    ]
+    with LegacyDecoding():
+        legacy_check = measure(lambda: legacy_preflight.check(codec_token), args.number, args.repeat)
+    codec_check = measure(lambda: codec_preflight.check(codec_token), args.number, args.repeat)
+    results.append(('검증 (preflight)', legacy_check, codec_check))
+
+    print(f"토큰 길이 {len(codec_token)}바이트, 반복 {args.repeat}회 x {args.number}개")
+    print(f"{'단계':<18}{'이전 µs':>10}{'codec µs':>10}{'배율':>8}{'이전 할당':>12}{'codec 할당':>12}")
+    for name, (legacy_us, legacy_bytes), (codec_us, codec_bytes) in results:
+        print(f"{name:<18}{legacy_us:>10.2f}{codec_us:>10.2f}{legacy_us / codec_us:>7.1f}x"
+              f"{legacy_bytes:>11}B{codec_bytes:>11}B")
+
+
+if __name__ == '__main__':
+    main()
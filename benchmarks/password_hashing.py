@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+비밀번호 해시(KDF) 비용별 로그인 처리량 벤치마크
+
+KDF 설정(scrypt n / PBKDF2 반복 수)과 실행 방식(요청 스레드에서 직접 / 프로세스 풀)마다
+취약한 앱의 POST /login을 고정 동시성으로 실행하고 logins/sec, p50/p99 지연 시간을 측정합니다.
+같은 시간 동안 GET /readyz를 계속 호출해 해시 계산이 다른 요청을 얼마나 막는지(GIL 점유)도 기록합니다.
+PostgreSQL은 메모리 저장소(DATABASE_URL=memory://)로 대체하며, 측정 전에 사용자마다 한 번 로그인해
+이전 SHA256 해시를 현재 설정의 해시로 업그레이드해 둡니다.
+
+사용법:
+    python3 -m benchmarks.password_hashing \
+        --costs scrypt:n=16384 scrypt:n=32768 pbkdf2_sha256:i=600000 \
+        --modes inline pool --workers 2 --concurrency 1 8 --requests 200
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import threading
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_DIR = os.path.join(REPO_ROOT, 'vulnerable-app')
+
+# 비용 표기의 파라미터 이름 -> 앱 환경 변수
+COST_ENV = {
+    'n': 'PASSWORD_HASH_SCRYPT_N',
+    'r': 'PASSWORD_HASH_SCRYPT_R',
+    'p': 'PASSWORD_HASH_SCRYPT_P',
+    'i': 'PASSWORD_HASH_PBKDF2_ITERATIONS',
+}
+
+
+def cost_env(cost):
+    """'scrypt:n=16384,r=8' -> 앱 환경 변수"""
+    algorithm, _, raw_params = cost.partition(':')
+    env = {'PASSWORD_HASH_ALGORITHM': algorithm}
+    for item in filter(None, raw_params.split(',')):
+        name, _, value = item.partition('=')
+        env[COST_ENV[name]] = value
+    return env
+
+
+class Prober:
+    """측정 구간 동안 GET /readyz를 반복 호출하여 지연 시간 기록 (해시 계산이 다른 요청을 막는 정도)"""
+
+    def __init__(self, client):
+        self.client = client
+        self.latencies = []
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.is_set():
+            started = time.perf_counter()
+            self.client.get('/readyz')
+            self.latencies.append(time.perf_counter() - started)
+            self._stop.wait(0.005)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+def run_worker(args):
+    """현재 프로세스에 앱을 로드하여 한 가지 설정(비용, 실행 방식)을 측정"""
+    sys.path.insert(0, APP_DIR)
+    sys.path.insert(0, REPO_ROOT)
+    from benchmarks.harness import run_concurrent, summarize
+    from benchmarks.standins import DEMO_PASSWORD
+    import app as app_module
+    from auth import password_hasher
+
+    app_module.warmup.warm_worker()
+    flask_app = app_module.app
+    local = threading.local()
+
+    def client():
+        if not hasattr(local, 'client'):
+            local.client = flask_app.test_client()
+        return local.client
+
+    def op_login(i):
+        response = client().post('/login', data={'username': f'user{i % args.users + 1}', 'password': DEMO_PASSWORD})
+        return response.status_code == 302
+
+    # 이전 SHA256 해시 -> 현재 설정 해시 (측정 구간에는 업그레이드 비용이 섞이지 않게 함)
+    for i in range(args.users):
+        op_login(i)
+
+    results = []
+    for concurrency in args.concurrency:
+        rejected_before = password_hasher.stats()['rejected']
+        with Prober(flask_app.test_client()) as prober:
+            summary = run_concurrent(op_login, args.requests, concurrency)
+        probe = summarize(prober.latencies, 1, 0)
+        summary.update({
+            'cost': args.cost,
+            'mode': args.mode,
+            'concurrency': concurrency,
+            'hash_workers': password_hasher.workers,
+            'rejected': password_hasher.stats()['rejected'] - rejected_before,
+            'probe_p50_ms': probe['p50_ms'],
+            'probe_p99_ms': probe['p99_ms'],
+        })
+        results.append(summary)
+    print(json.dumps(results))
+
+
+def run_subprocess(cost, mode, args):
+    """설정은 앱 import 시점에 읽히므로 조합마다 별도 프로세스에서 실행"""
+    command = [
+        sys.executable, '-m', 'benchmarks.password_hashing', '--worker', '--cost', cost, '--mode', mode,
+        '--requests', str(args.requests), '--users', str(args.users),
+        '--concurrency', *map(str, args.concurrency),
+    ]
+    env = dict(
+        os.environ,
+        DATABASE_URL=f'memory://?users={args.users}',
+        PASSWORD_HASH_WORKERS=str(args.workers if mode == 'pool' else 0),
+        PASSWORD_HASH_MAX_QUEUE=str(args.max_queue),
+        SERVER_TIMING_HEADER='false',
+        **cost_env(cost),
+    )
+    completed = subprocess.run(command, cwd=REPO_ROOT, env=env, capture_output=True, text=True)
+    if completed.returncode != 0:
+        raise RuntimeError(f"{cost} / {mode} 벤치마크 실패:\n{completed.stderr}")
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def print_table(results):
+    header = (f"{'cost':<26}{'mode':<8}{'conc':>6}{'logins/s':>10}{'p50':>9}{'p99':>9}"
+              f"{'probe p50':>11}{'probe p99':>11}{'503':>6}{'err':>6}")
+    print(header)
+    print('-' * len(header))
+    for r in results:
+        print(f"{r['cost']:<26}{r['mode']:<8}{r['concurrency']:>6}{r['throughput_rps']:>10.1f}"
+              f"{r['p50_ms']:>9.2f}{r['p99_ms']:>9.2f}{r['probe_p50_ms']:>11.2f}{r['probe_p99_ms']:>11.2f}"
+              f"{r['rejected']:>6}{r['errors']:>6}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='비밀번호 해시 비용별 로그인 처리량 벤치마크')
+    parser.add_argument('--costs', nargs='+', default=['scrypt:n=16384', 'scrypt:n=32768', 'pbkdf2_sha256:i=600000'],
+                        help="KDF 설정 (예: scrypt:n=16384,r=8,p=1, pbkdf2_sha256:i=600000)")
+    parser.add_argument('--modes', nargs='+', choices=['inline', 'pool'], default=['inline', 'pool'],
+                        help='inline: 요청 스레드에서 직접 계산, pool: 프로세스 풀에서 계산')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='pool 모드의 해시 프로세스 수')
+    parser.add_argument('--max-queue', type=int, default=32, help='pool 모드의 대기열 길이')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 8])
+    parser.add_argument('--requests', type=int, default=200, help='동시성 단계별 로그인 수')
+    parser.add_argument('--users', type=int, default=50, help='메모리 저장소의 사용자 수')
+    parser.add_argument('--output', default='password_hashing_bench.json', help='결과 JSON 파일 경로')
+    parser.add_argument('--worker', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--cost', help=argparse.SUPPRESS)
+    parser.add_argument('--mode', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args)
+        return
+
+    results = []
+    for cost in args.costs:
+        for mode in args.modes:
+            print(f"[{cost} / {mode}] 실행 중...", file=sys.stderr)
+            results.extend(run_subprocess(cost, mode, args))
+
+    report = {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'requests': args.requests,
+            'concurrency': args.concurrency,
+            'hash_workers': args.workers,
+        },
+        'results': results,
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print_table(results)
+    print(f"\n결과 저장: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+인증 방식별 종단간 벤치마크
+
+파일 키(vulnerable-app), Vault KV, Vault Transit 앱의 create_token / verify_token,
+/login, /api/user/<id>를 고정 동시성으로 실행하고 p50/p95/p99 지연 시간, 처리량,
+요청당 Vault 호출 수를 JSON으로 저장합니다. Vault는 로컬 대역으로, PostgreSQL은 앱의 메모리 저장소
+(DATABASE_URL=memory://)로 대체하므로 암호화 / Vault 비용을 DB 비용과 분리해 볼 수 있습니다.
+--vault-mode http를 사용하면 Vault 대역 HTTP 서버(benchmarks.vault_server)에 실제 hvac 클라이언트로 접속합니다.
+
+사용법:
+    python3 -m benchmarks.run --apps file kv transit transit-local \
+        --concurrency 1 8 32 --requests 2000 --output bench_results.json
+
+    # 토큰 검증 캐시 없이 순수 서명 검증 비용 측정
+    python3 -m benchmarks.run --env TOKEN_CACHE_SIZE=0
+
+    # 사용자 캐시 없이 요청마다 저장소 조회 (--db-latency-ms 지연 포함)
+    python3 -m benchmarks.run --env USER_CACHE_SIZE=0
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import threading
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 앱 이름 -> (디렉토리, 추가 환경 변수)
+APPS = {
+    'file': ('vulnerable-app', {}),
+    'kv': ('vault-kv-solution', {}),
+    'transit': ('vault-transit-solution', {'TRANSIT_VERIFY_MODE': 'vault'}),
+    'transit-local': ('vault-transit-solution', {'TRANSIT_VERIFY_MODE': 'local'}),
+}
+
+SCENARIOS = ['sign', 'verify', 'login', 'api_user']
+
+
+def parse_env(pairs):
+    env = {}
+    for pair in pairs:
+        key, _, value = pair.partition('=')
+        env[key] = value
+    return env
+
+
+def run_worker(args):
+    """한 앱을 현재 프로세스에 로드하여 시나리오 실행 (앱마다 별도 프로세스에서 호출됨)"""
+    app_dir, app_env = APPS[args.app]
+    os.environ.update(app_env)
+    os.environ['DATABASE_URL'] = args.database_url or f'memory://?users={args.users}&latency_ms={args.db_latency_ms}'
+    sys.path.insert(0, os.path.join(REPO_ROOT, app_dir))
+    sys.path.insert(0, REPO_ROOT)
+
+    from benchmarks.harness import run_concurrent
+    from benchmarks.standins import DEMO_PASSWORD, FakeVaultClient
+    from benchmarks.vault_server import VaultStandin
+
+    standin = None
+    if args.vault_mode == 'http':
+        # 앱의 실제 hvac 클라이언트가 HTTP 대역 서버에 접속 (config import 전에 주소 설정)
+        standin = VaultStandin(latency_ms=args.vault_latency_ms, seed=0).start()
+        os.environ['VAULT_ADDR'] = standin.url
+        os.environ['VAULT_TOKEN'] = standin.token
+
+    import config
+    import database
+    import auth
+    import app as app_module
+
+    key_dir = os.path.join(REPO_ROOT, 'vulnerable-app')
+    with open(os.path.join(key_dir, 'private_key.pem')) as f:
+        private_key_pem = f.read()
+    with open(os.path.join(key_dir, 'public_key.pem')) as f:
+        public_key_pem = f.read()
+
+    if standin is not None:
+        vault_calls = standin.calls
+    else:
+        vault = FakeVaultClient(private_key_pem, public_key_pem, latency_ms=args.vault_latency_ms)
+        vault_calls = vault.calls
+        if hasattr(config.Config, 'get_vault_client'):
+            config.Config.get_vault_client = staticmethod(lambda: vault)
+
+    users = [database.User(*row, None, None) for row in database.store.list_page(0, args.users)]
+
+    def db_calls():
+        # memory:// 저장소만 호출 수를 셈 (--database-url로 PostgreSQL을 지정하면 0)
+        return database.store.stats().get('calls', 0)
+    flask_app = app_module.app
+    local = threading.local()
+
+    def client():
+        if not hasattr(local, 'client'):
+            local.client = flask_app.test_client()
+        return local.client
+
+    tokens = [auth.create_token(u.id, u.username, u.email) for u in users[:min(len(users), args.requests)]]
+
+    def op_sign(i):
+        user = users[i % len(users)]
+        return bool(auth.create_token(user.id, user.username, user.email))
+
+    def op_verify(i):
+        return auth.verify_token(tokens[i % len(tokens)]) is not None
+
+    def op_login(i):
+        user = users[i % len(users)]
+        response = client().post('/login', data={'username': user.username, 'password': DEMO_PASSWORD})
+        return response.status_code == 302
+
+    def op_api_user(i):
+        index = i % len(tokens)
+        response = client().get(f'/api/user/{users[index].id}', headers={'Authorization': f'Bearer {tokens[index]}'})
+        return response.status_code == 200
+
+    operations = {'sign': op_sign, 'verify': op_verify, 'login': op_login, 'api_user': op_api_user}
+
+    results = []
+    for scenario in args.scenarios:
+        operation = operations[scenario]
+        for i in range(args.warmup):
+            operation(i)
+        if standin is not None:
+            # 오류 주입은 준비/워밍업이 끝난 뒤 측정 구간에만 적용
+            standin.configure(error_rate=args.vault_error_rate)
+        for concurrency in args.concurrency:
+            vault_before = vault_calls.total()
+            db_before = db_calls()
+            summary = run_concurrent(operation, args.requests, concurrency)
+            summary.update({
+                'app': args.app,
+                'scenario': scenario,
+                'concurrency': concurrency,
+                'vault_calls_per_request': round((vault_calls.total() - vault_before) / args.requests, 4),
+                'db_calls_per_request': round((db_calls() - db_before) / args.requests, 4),
+            })
+            results.append(summary)
+        if standin is not None:
+            standin.configure(error_rate=0.0)
+    if standin is not None:
+        standin.stop()
+    print(json.dumps(results))
+
+
+def run_app_subprocess(app_name, args):
+    """앱마다 모듈 이름(config, auth, database)이 겹치므로 별도 프로세스에서 실행"""
+    command = [
+        sys.executable, '-m', 'benchmarks.run', '--worker', '--app', app_name,
+        '--requests', str(args.requests), '--warmup', str(args.warmup), '--users', str(args.users),
+        '--vault-latency-ms', str(args.vault_latency_ms), '--db-latency-ms', str(args.db_latency_ms),
+        '--vault-mode', args.vault_mode, '--vault-error-rate', str(args.vault_error_rate),
+        *(['--database-url', args.database_url] if args.database_url else []),
+        '--concurrency', *map(str, args.concurrency), '--scenarios', *args.scenarios,
+    ]
+    env = dict(os.environ, **parse_env(args.env))
+    completed = subprocess.run(command, cwd=REPO_ROOT, env=env, capture_output=True, text=True)
+    if completed.returncode != 0:
+        raise RuntimeError(f"{app_name} 벤치마크 실패:\n{completed.stderr}")
+    # 앱이 출력하는 로그를 건너뛰고 마지막 줄의 JSON만 사용
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def print_table(results):
+    header = f"{'app':<14}{'scenario':<10}{'conc':>6}{'rps':>10}{'p50':>9}{'p95':>9}{'p99':>9}{'vault/req':>11}{'db/req':>8}{'err':>6}"
+    print(header)
+    print('-' * len(header))
+    for r in results:
+        print(f"{r['app']:<14}{r['scenario']:<10}{r['concurrency']:>6}{r['throughput_rps']:>10.1f}"
+              f"{r['p50_ms']:>9.2f}{r['p95_ms']:>9.2f}{r['p99_ms']:>9.2f}"
+              f"{r['vault_calls_per_request']:>11.3f}{r['db_calls_per_request']:>8.3f}{r['errors']:>6}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='파일 키 / Vault KV / Vault Transit 인증 벤치마크')
+    parser.add_argument('--apps', nargs='+', choices=sorted(APPS), default=['file', 'kv', 'transit', 'transit-local'])
+    parser.add_argument('--scenarios', nargs='+', choices=SCENARIOS, default=SCENARIOS)
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 8, 32])
+    parser.add_argument('--requests', type=int, default=1000, help='시나리오/동시성 단계별 요청 수')
+    parser.add_argument('--warmup', type=int, default=20)
+    parser.add_argument('--users', type=int, default=1000, help='대역 저장소의 사용자 수')
+    parser.add_argument('--vault-latency-ms', type=float, default=1.0, help='Vault 대역 호출당 지연 (네트워크 왕복 흉내)')
+    parser.add_argument('--db-latency-ms', type=float, default=0.5, help='메모리 저장소 호출당 지연')
+    parser.add_argument('--database-url', help='메모리 저장소 대신 사용할 DATABASE_URL (예: 시드한 PostgreSQL)')
+    parser.add_argument('--vault-mode', choices=['inproc', 'http'], default='inproc',
+                        help='inproc: hvac 클라이언트를 메모리 대역으로 교체, http: Vault HTTP 대역 서버에 실제 hvac로 접속')
+    parser.add_argument('--vault-error-rate', type=float, default=0.0, help='http 모드에서 Vault 대역이 503을 반환할 확률')
+    parser.add_argument('--env', nargs='*', default=[], metavar='KEY=VALUE', help='앱에 전달할 환경 변수')
+    parser.add_argument('--output', default='bench_results.json', help='결과 JSON 파일 경로')
+    parser.add_argument('--worker', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--app', choices=sorted(APPS), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args)
+        return
+
+    results = []
+    for app_name in args.apps:
+        print(f"[{app_name}] 실행 중...", file=sys.stderr)
+        results.extend(run_app_subprocess(app_name, args))
+
+    report = {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'requests': args.requests,
+            'concurrency': args.concurrency,
+            'vault_latency_ms': args.vault_latency_ms,
+            'db_latency_ms': args.db_latency_ms,
+            'vault_mode': args.vault_mode,
+            'vault_error_rate': args.vault_error_rate,
+            'env': parse_env(args.env),
+        },
+        'results': results,
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print_table(results)
+    print(f"\n결과 저장: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
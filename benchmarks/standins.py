@@ -0,0 +1,208 @@
+"""
+벤치마크용 로컬 대역 (Vault / PostgreSQL 없이 앱 코드를 실행)
+
+- FakeVaultClient: 앱이 사용하는 hvac 클라이언트 API 일부(KV v2, Transit)를 메모리에서 구현하고 호출 수를 셈
+- UserStore: 데모 사용자 데이터를 메모리에 보관하고 database 모듈의 조회 함수를 대신함
+- AsyncUserStore: UserStore의 비동기 버전 (async_database 모듈 대역)
+"""
+
+import asyncio
+import base64
+import hashlib
+import threading
+import time
+from types import SimpleNamespace
+
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import padding, rsa
+
+DEMO_PASSWORD = 'password123'
+
+
+class CallCounter:
+    """스레드 안전한 호출 카운터"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counts = {}
+
+    def add(self, name):
+        with self._lock:
+            self.counts[name] = self.counts.get(name, 0) + 1
+
+    def total(self):
+        with self._lock:
+            return sum(self.counts.values())
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self.counts)
+
+
+class FakeVaultClient:
+    """
+    hvac.Client 대역
+
+    latency_ms만큼 호출마다 대기하여 네트워크 왕복을 흉내냄
+    """
+
+    def __init__(self, private_key_pem=None, public_key_pem=None, latency_ms=0.0):
+        self.calls = CallCounter()
+        self.latency = latency_ms / 1000.0
+        self._kv_versions = {}
+        self._kv_version = 0
+        if private_key_pem is not None:
+            self.put_kv_keys(private_key_pem, public_key_pem)
+        self._transit_keys = {1: rsa.generate_private_key(public_exponent=65537, key_size=2048)}
+        self.secrets = SimpleNamespace(
+            kv=SimpleNamespace(v2=SimpleNamespace(
+                read_secret_version=self._read_secret_version,
+                read_secret_metadata=self._read_secret_metadata,
+            )),
+            transit=SimpleNamespace(
+                sign_data=self._sign_data,
+                verify_signed_data=self._verify_signed_data,
+                read_key=self._read_key,
+                rotate_key=self._rotate_key,
+            ),
+        )
+        self.auth = SimpleNamespace(token=SimpleNamespace(
+            lookup_self=self._lookup_self,
+            renew_self=self._lookup_self,
+        ))
+
+    def _call(self, name):
+        self.calls.add(name)
+        if self.latency:
+            time.sleep(self.latency)
+
+    def is_authenticated(self):
+        self._call('is_authenticated')
+        return True
+
+    def put_kv_keys(self, private_key_pem, public_key_pem):
+        return self.write_kv({'private_key': private_key_pem, 'public_key': public_key_pem})
+
+    def write_kv(self, data):
+        """KV 시크릿의 새 버전 저장 (키 교체 시나리오용)"""
+        self._kv_version += 1
+        self._kv_versions[self._kv_version] = dict(data)
+        return self._kv_version
+
+    def _read_secret_version(self, path, version=None, mount_point='secret', raise_on_deleted_version=None):
+        self._call('kv.read_secret_version')
+        version = version or self._kv_version
+        if version not in self._kv_versions:
+            raise KeyError(f"secret version not found: {version}")
+        return {'data': {'data': dict(self._kv_versions[version]), 'metadata': {'version': version}}}
+
+    def _read_secret_metadata(self, path, mount_point='secret'):
+        self._call('kv.read_secret_metadata')
+        return {'data': {
+            'current_version': self._kv_version,
+            'versions': {str(v): {'destroyed': False} for v in self._kv_versions},
+        }}
+
+    def _lookup_self(self):
+        self._call('auth.token.lookup_self')
+        return {'data': {'ttl': 0, 'renewable': False}}
+
+    def _sign_one(self, hash_input, key_version):
+        key = self._transit_keys[key_version]
+        signature = key.sign(
+            base64.b64decode(hash_input),
+            padding.PSS(mgf=padding.MGF1(hashes.SHA256()), salt_length=padding.PSS.MAX_LENGTH),
+            hashes.SHA256()
+        )
+        return f"vault:v{key_version}:{base64.b64encode(signature).decode()}"
+
+    def _sign_data(self, name, hash_input=None, key_version=None, signature_algorithm=None, batch_input=None, **kwargs):
+        self._call('transit.sign_data')
+        key_version = key_version or max(self._transit_keys)
+        if batch_input is not None:
+            return {'data': {'batch_results': [
+                {'signature': self._sign_one(item['input'], key_version)} for item in batch_input
+            ]}}
+        return {'data': {'signature': self._sign_one(hash_input, key_version)}}
+
+    def _verify_signed_data(self, name, hash_input, signature, signature_algorithm=None, **kwargs):
+        self._call('transit.verify_signed_data')
+        try:
+            _, version, signature_b64 = signature.split(':', 2)
+            key = self._transit_keys[int(version[1:])]
+            key.public_key().verify(
+                base64.b64decode(signature_b64),
+                base64.b64decode(hash_input),
+                padding.PSS(mgf=padding.MGF1(hashes.SHA256()), salt_length=padding.PSS.AUTO),
+                hashes.SHA256()
+            )
+            valid = True
+        except (InvalidSignature, KeyError, ValueError):
+            valid = False
+        return {'data': {'valid': valid}}
+
+    def _read_key(self, name, mount_point='transit'):
+        self._call('transit.read_key')
+        keys = {
+            str(version): {
+                'public_key': key.public_key().public_bytes(
+                    serialization.Encoding.PEM,
+                    serialization.PublicFormat.SubjectPublicKeyInfo
+                ).decode()
+            }
+            for version, key in self._transit_keys.items()
+        }
+        return {'data': {'latest_version': max(self._transit_keys), 'keys': keys}}
+
+    def _rotate_key(self, name, mount_point='transit'):
+        self._call('transit.rotate_key')
+        self._transit_keys[max(self._transit_keys) + 1] = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+
+class UserStore:
+    """데모 사용자 메모리 저장소 (database 모듈의 조회 함수 대역)"""
+
+    def __init__(self, user_cls, count=1000, latency_ms=0.0):
+        self.latency = latency_ms / 1000.0
+        self.calls = CallCounter()
+        password_hash = hashlib.sha256(DEMO_PASSWORD.encode('utf-8')).hexdigest()
+        self._by_id = {}
+        self._by_username = {}
+        for user_id in range(1, count + 1):
+            user = user_cls(user_id, f'user{user_id}', f'user{user_id}@example.com', '010-0000-0000', '서울시')
+            self._by_id[user_id] = user
+            self._by_username[user.username] = (user, password_hash)
+
+    def _call(self, name):
+        self.calls.add(name)
+        if self.latency:
+            time.sleep(self.latency)
+
+    def get_user_by_id(self, user_id):
+        self._call('get_user_by_id')
+        return self._by_id.get(user_id)
+
+    def get_user_by_username_with_hash(self, username):
+        self._call('get_user_by_username_with_hash')
+        return self._by_username.get(username)
+
+    def users(self):
+        return list(self._by_id.values())
+
+
+class AsyncUserStore(UserStore):
+    """UserStore의 비동기 버전 (async_database 모듈의 조회 함수 대역, 지연은 asyncio.sleep)"""
+
+    async def _call_async(self, name):
+        self.calls.add(name)
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+    async def get_user_by_id(self, user_id):
+        await self._call_async('get_user_by_id')
+        return self._by_id.get(user_id)
+
+    async def get_user_by_username_with_hash(self, username):
+        await self._call_async('get_user_by_username_with_hash')
+        return self._by_username.get(username)
@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+Vault HTTP API 대역 서버 (테스트 / 벤치마크용)
+
+KV v2와 Transit 중 앱이 사용하는 API만 구현합니다. 실제 hvac 클라이언트가 HTTP로 접속하므로
+커넥션 재사용, 타임아웃, 재시도, 캐시 동작을 Vault 컨테이너 없이 재현할 수 있습니다.
+
+- KV v2: GET/POST /v1/secret/data/<path>, GET /v1/secret/metadata/<path>
+- Transit: POST /v1/transit/sign/<name>(batch_input 포함), POST /v1/transit/verify/<name>,
+           GET /v1/transit/keys/<name>, POST /v1/transit/keys/<name>/rotate
+- 토큰: GET /v1/auth/token/lookup-self, POST /v1/auth/token/renew-self
+- 대역 전용: GET /v1/sys/health, GET/POST /v1/sys/standin (호출 수 조회, 지연/오류율 변경)
+
+latency_ms(+jitter_ms)만큼 응답을 지연하고, error_rate 확률로 503을 반환합니다.
+
+사용법:
+    python3 -m benchmarks.vault_server --port 8200 --latency-ms 2 --error-rate 0.01
+    VAULT_ADDR=http://127.0.0.1:8200 VAULT_TOKEN=root-token python3 vault-transit-solution/app.py
+"""
+
+import argparse
+import json
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from benchmarks.standins import CallCounter, FakeVaultClient
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class _Handler(BaseHTTPRequestHandler):
+    # keep-alive 지원 (앱의 커넥션 풀 재사용을 재현)
+    protocol_version = 'HTTP/1.1'
+    # 헤더와 본문을 따로 쓰므로 Nagle 지연(~40ms)이 응답 시간에 섞이지 않도록 비활성화
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def setup(self):
+        super().setup()
+        self.server.standin.connection_opened()
+
+    def finish(self):
+        try:
+            super().finish()
+        finally:
+            self.server.standin.connection_closed()
+
+    def do_GET(self):
+        self._dispatch('GET')
+
+    def do_POST(self):
+        self._dispatch('POST')
+
+    def do_PUT(self):
+        self._dispatch('POST')
+
+    def _send(self, status, body=None):
+        payload = json.dumps(body).encode('utf-8') if body is not None else b''
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        try:
+            self.wfile.write(payload)
+        except (BrokenPipeError, ConnectionResetError):
+            # 클라이언트가 타임아웃으로 먼저 연결을 끊은 경우 (지연 주입 시 정상 상황)
+            self.close_connection = True
+
+    def _read_body(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        if not length:
+            return {}
+        return json.loads(self.rfile.read(length) or b'{}')
+
+    def _dispatch(self, method):
+        standin = self.server.standin
+        url = urlparse(self.path)
+        path = url.path.rstrip('/')
+        body = self._read_body() if method == 'POST' else {}
+
+        # 대역 제어용 엔드포인트는 지연/오류 주입 대상에서 제외
+        if path == '/v1/sys/health':
+            return self._send(200, {'initialized': True, 'sealed': False, 'standby': False})
+        if path == '/v1/sys/standin':
+            if method == 'POST':
+                standin.configure(**body)
+            return self._send(200, standin.stats())
+
+        if self.headers.get('X-Vault-Token') != standin.token:
+            return self._send(403, {'errors': ['permission denied']})
+
+        standin.inject_latency()
+        if standin.should_fail():
+            standin.calls.add('injected_error')
+            return self._send(503, {'errors': ['injected failure (vault stand-in)']})
+
+        try:
+            route = standin.route(method, path, parse_qs(url.query), body)
+        except KeyError as e:
+            return self._send(404, {'errors': [f'not found: {e}']})
+        except (ValueError, TypeError) as e:
+            return self._send(400, {'errors': [str(e)]})
+        if route is None:
+            return self._send(404, {'errors': [f'unsupported path: {method} {path}']})
+        status, response = route
+        self._send(status, response)
+
+
+class VaultStandin:
+    """
+    프로세스 내에서 실행되는 Vault HTTP 대역 서버
+
+        standin = VaultStandin(latency_ms=2, error_rate=0.01).start()
+        os.environ['VAULT_ADDR'] = standin.url
+        ...
+        standin.stop()
+    """
+
+    def __init__(self, host='127.0.0.1', port=0, token='root-token', latency_ms=0.0, jitter_ms=0.0,
+                 error_rate=0.0, seed=None, kv_private_key_pem=None, kv_public_key_pem=None):
+        self.token = token
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+        self._random_lock = threading.Lock()
+        self.calls = CallCounter()
+        # TCP 연결 수 (앱의 커넥션 풀 재사용 / 동시 연결 수 확인용)
+        self._connections_lock = threading.Lock()
+        self.connections_opened = 0
+        self.connections_active = 0
+        self.connections_peak = 0
+        if kv_private_key_pem is None:
+            key_dir = os.path.join(REPO_ROOT, 'vulnerable-app')
+            with open(os.path.join(key_dir, 'private_key.pem')) as f:
+                kv_private_key_pem = f.read()
+            with open(os.path.join(key_dir, 'public_key.pem')) as f:
+                kv_public_key_pem = f.read()
+        # 실제 키 연산과 버전 관리는 인메모리 대역에 위임
+        self.backend = FakeVaultClient(kv_private_key_pem, kv_public_key_pem)
+        self._server = ThreadingHTTPServer((host, port), _Handler)
+        self._server.daemon_threads = True
+        self._server.standin = self
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name='vault-standin', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def configure(self, latency_ms=None, jitter_ms=None, error_rate=None, **kwargs):
+        """실행 중 지연/오류율 변경"""
+        if latency_ms is not None:
+            self.latency_ms = float(latency_ms)
+        if jitter_ms is not None:
+            self.jitter_ms = float(jitter_ms)
+        if error_rate is not None:
+            self.error_rate = float(error_rate)
+
+    def connection_opened(self):
+        with self._connections_lock:
+            self.connections_opened += 1
+            self.connections_active += 1
+            self.connections_peak = max(self.connections_peak, self.connections_active)
+
+    def connection_closed(self):
+        with self._connections_lock:
+            self.connections_active -= 1
+
+    def reset_connection_peak(self):
+        """최대 동시 연결 수를 현재 연결 수로 초기화 (측정 구간 시작 시 호출)"""
+        with self._connections_lock:
+            self.connections_peak = self.connections_active
+
+    def inject_latency(self):
+        delay = self.latency_ms
+        if self.jitter_ms:
+            with self._random_lock:
+                delay += self._random.uniform(0, self.jitter_ms)
+        if delay > 0:
+            time.sleep(delay / 1000.0)
+
+    def should_fail(self):
+        if self.error_rate <= 0:
+            return False
+        with self._random_lock:
+            return self._random.random() < self.error_rate
+
+    def stats(self):
+        return {
+            'calls': self.calls.snapshot(),
+            'total_calls': self.calls.total(),
+            'latency_ms': self.latency_ms,
+            'jitter_ms': self.jitter_ms,
+            'error_rate': self.error_rate,
+            'connections': {
+                'opened': self.connections_opened,
+                'active': self.connections_active,
+                'peak': self.connections_peak,
+            },
+        }
+
+    def route(self, method, path, query, body):
+        """(상태 코드, 응답 본문) 반환, 지원하지 않는 경로는 None"""
+        parts = path.strip('/').split('/')
+        if len(parts) < 3 or parts[0] != 'v1':
+            return None
+        backend = self.backend
+        engine, action, rest = parts[1], parts[2], parts[3:]
+
+        if engine == 'secret' and action == 'data' and rest:
+            if method == 'GET':
+                self.calls.add('kv.read')
+                version = int(query['version'][0]) if 'version' in query else None
+                return 200, backend._read_secret_version('/'.join(rest), version=version)
+            self.calls.add('kv.write')
+            version = backend.write_kv(body.get('data', {}))
+            return 200, {'data': {'version': version}}
+
+        if engine == 'secret' and action == 'metadata' and rest and method == 'GET':
+            self.calls.add('kv.metadata')
+            return 200, backend._read_secret_metadata('/'.join(rest))
+
+        if engine == 'transit' and action == 'sign' and rest and method == 'POST':
+            self.calls.add('transit.sign.batch' if body.get('batch_input') else 'transit.sign')
+            return 200, backend._sign_data(
+                rest[0],
+                hash_input=body.get('input'),
+                key_version=body.get('key_version'),
+                batch_input=body.get('batch_input'),
+            )
+
+        if engine == 'transit' and action == 'verify' and rest and method == 'POST':
+            self.calls.add('transit.verify')
+            return 200, backend._verify_signed_data(rest[0], hash_input=body['input'], signature=body['signature'])
+
+        if engine == 'transit' and action == 'keys' and rest:
+            if len(rest) == 1 and method == 'GET':
+                self.calls.add('transit.read_key')
+                return 200, backend._read_key(rest[0])
+            if len(rest) == 2 and rest[1] == 'rotate' and method == 'POST':
+                self.calls.add('transit.rotate')
+                backend._rotate_key(rest[0])
+                return 204, None
+
+        if engine == 'auth' and action == 'token' and rest:
+            if rest == ['lookup-self']:
+                self.calls.add('token.lookup_self')
+                return 200, backend._lookup_self()
+            if rest == ['renew-self'] and method == 'POST':
+                self.calls.add('token.renew_self')
+                return 200, {'auth': {'client_token': self.token, 'lease_duration': 0, 'renewable': False}}
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Vault KV v2 / Transit HTTP 대역 서버')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8200)
+    parser.add_argument('--token', default='root-token')
+    parser.add_argument('--latency-ms', type=float, default=0.0, help='응답마다 추가할 지연')
+    parser.add_argument('--jitter-ms', type=float, default=0.0, help='0~jitter 사이 무작위 추가 지연')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='503을 반환할 확률 (0~1)')
+    parser.add_argument('--seed', type=int, default=None, help='지연/오류 주입 난수 시드 (재현용)')
+    args = parser.parse_args()
+
+    standin = VaultStandin(
+        host=args.host, port=args.port, token=args.token,
+        latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate, seed=args.seed
+    )
+    print(f"Vault 대역 서버 실행 중: {standin.url} (토큰: {args.token})")
+    try:
+        standin._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        standin._server.server_close()
+
+
+if __name__ == '__main__':
+    main()
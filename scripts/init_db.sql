@@ -2,7 +2,7 @@
 CREATE TABLE IF NOT EXISTS users (
     id SERIAL PRIMARY KEY,
     username VARCHAR(100) UNIQUE NOT NULL,
-    password_hash VARCHAR(64) NOT NULL,  -- SHA256 해시 (64자)
+    password_hash VARCHAR(255) NOT NULL,  -- scrypt / PBKDF2 해시 (파라미터 포함), 이전 SHA256 해시(64자)는 로그인 시 교체
     email VARCHAR(255) NOT NULL,
     phone_num VARCHAR(20),
     address TEXT,
@@ -10,7 +10,7 @@ CREATE TABLE IF NOT EXISTS users (
 );
 
 -- 목업 데이터 삽입
--- 비밀번호는 모두 "password123"의 SHA256 해시
+-- 비밀번호는 모두 "password123"의 SHA256 해시 (이전 형식, 첫 로그인 때 앱이 scrypt 해시로 교체)
 -- SHA256("password123") = ef92b778bafe771e89245b89ecbc08a44a4e166c06659911881f383d4473e94f
 INSERT INTO users (username, password_hash, email, phone_num, address) VALUES
 ('alice', 'ef92b778bafe771e89245b89ecbc08a44a4e166c06659911881f383d4473e94f', 'alice@example.com', '010-1234-5678', '서울시 강남구 테헤란로 123'),
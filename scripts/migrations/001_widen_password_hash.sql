@@ -0,0 +1,4 @@
+-- password_hash 열을 KDF 해시 형식(scrypt / PBKDF2, 파라미터 포함)에 맞게 확장
+-- init_db.sql은 새 DB(빈 postgres_data 볼륨)에만 실행되므로 기존 DB에는 이 파일을 직접 적용
+-- 이전 VARCHAR(64) 열에서는 로그인 시 해시 업그레이드가 저장되지 못하고 중단됨 (여러 번 실행해도 안전)
+ALTER TABLE users ALTER COLUMN password_hash TYPE VARCHAR(255);
@@ -0,0 +1,211 @@
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+import psycopg2
+import psycopg2.extensions
+
+
+class PoolTimeout(Exception):
+    """풀에서 제한 시간 내에 연결을 얻지 못함"""
+
+
+class ConnectionPool:
+    """
+    스레드 안전한 PostgreSQL 커넥션 풀
+
+    - min/max 크기 제한, 풀이 가득 차면 timeout까지 대기
+    - 대여 시 상태 확인 (끊어진 연결 폐기, 오래 쉰 연결은 SELECT 1로 확인)
+    - max_idle보다 오래 쉰 연결은 min 크기까지 정리
+    - fork 이후 자식 프로세스는 부모의 연결을 버리고 새로 연결 (pre-fork 서버 대응)
+    - 대기 시간 및 포화도 통계 제공
+    - connect_timeout: 새 연결의 접속 제한 시간(초, libpq connect_timeout), DB 호스트가 응답하지 않아도 무한정 기다리지 않음
+    """
+
+    def __init__(self, dsn, minconn=1, maxconn=10, timeout=5.0, max_idle=300.0, check_after=30.0, connect_timeout=None):
+        self.dsn = dsn
+        self.connect_timeout = connect_timeout
+        self.minconn = minconn
+        self.maxconn = maxconn
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self.check_after = check_after
+        self._reset_state()
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._reset_state)
+
+    def _reset_state(self):
+        # 부모 프로세스의 소켓을 닫으면 부모 연결까지 종료되므로 참조만 버림
+        self._pid = os.getpid()
+        self._cond = threading.Condition()
+        self._idle = deque()  # (conn, 반납 시각)
+        self._size = 0
+        self._in_use = 0
+        self._checkouts = 0
+        self._waits = 0
+        self._timeouts = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._peak_in_use = 0
+        self._discarded = 0
+        self._reaped = 0
+
+    def _connect(self):
+        if self.connect_timeout:
+            # libpq는 정수 초만 받고 2초 미만은 2초로 처리
+            return psycopg2.connect(self.dsn, connect_timeout=max(int(self.connect_timeout), 2))
+        return psycopg2.connect(self.dsn)
+
+    def warm(self):
+        """minconn 개수만큼 미리 연결"""
+        conns = [self.getconn() for _ in range(max(self.minconn - self._size, 0))]
+        for conn in conns:
+            self.putconn(conn)
+
+    def getconn(self):
+        """풀에서 연결 대여"""
+        if self._pid != os.getpid():
+            self._reset_state()
+        started = time.monotonic()
+        waited = False
+        with self._cond:
+            self._reap_idle()
+            while True:
+                if self._idle:
+                    conn, returned_at = self._idle.pop()
+                    break
+                if self._size < self.maxconn:
+                    conn, returned_at = None, None
+                    self._size += 1
+                    break
+                waited = True
+                remaining = self.timeout - (time.monotonic() - started)
+                if remaining <= 0:
+                    self._timeouts += 1
+                    raise PoolTimeout(f"DB 커넥션 풀 대기 시간 초과 ({self.timeout}초, 최대 {self.maxconn}개 사용 중)")
+                self._cond.wait(remaining)
+            self._in_use += 1
+            self._checkouts += 1
+            self._peak_in_use = max(self._peak_in_use, self._in_use)
+            wait = time.monotonic() - started
+            if waited:
+                self._waits += 1
+            self._wait_total += wait
+            self._wait_max = max(self._wait_max, wait)
+
+        try:
+            if conn is not None and not self._is_healthy(conn, returned_at):
+                self._discard(conn)
+                conn = None
+            if conn is None:
+                conn = self._connect()
+        except Exception:
+            self._release_slot()
+            raise
+        return conn
+
+    def putconn(self, conn, discard=False):
+        """연결 반납 (열린 트랜잭션은 롤백)"""
+        if self._pid != os.getpid():
+            return
+        if not discard and not conn.closed:
+            try:
+                if conn.info.transaction_status != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+                    conn.rollback()
+            except psycopg2.Error:
+                discard = True
+        if discard or conn.closed:
+            self._discard(conn)
+            self._release_slot()
+            return
+        with self._cond:
+            self._in_use -= 1
+            self._idle.append((conn, time.monotonic()))
+            self._reap_idle()
+            self._cond.notify()
+
+    @contextmanager
+    def connection(self):
+        """with 블록 동안 연결을 대여하고 종료 시 반납"""
+        conn = self.getconn()
+        try:
+            yield conn
+        except psycopg2.OperationalError:
+            self.putconn(conn, discard=True)
+            raise
+        except BaseException:
+            self.putconn(conn)
+            raise
+        else:
+            self.putconn(conn)
+
+    def _is_healthy(self, conn, returned_at):
+        if conn.closed:
+            return False
+        if time.monotonic() - returned_at < self.check_after:
+            return True
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    def _discard(self, conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+        with self._cond:
+            self._discarded += 1
+
+    def _release_slot(self):
+        with self._cond:
+            self._size -= 1
+            self._in_use -= 1
+            self._cond.notify()
+
+    def _reap_idle(self):
+        # _cond를 잡은 상태에서 호출됨. 가장 오래 쉰 연결은 deque 왼쪽에 있음
+        now = time.monotonic()
+        while self._idle and self._size > self.minconn and now - self._idle[0][1] > self.max_idle:
+            conn, _ = self._idle.popleft()
+            self._size -= 1
+            self._reaped += 1
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+    def close_all(self):
+        """유휴 연결을 모두 닫음"""
+        with self._cond:
+            while self._idle:
+                conn, _ = self._idle.popleft()
+                self._size -= 1
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+
+    def stats(self):
+        """풀 크기, 대기 시간, 포화도 통계"""
+        with self._cond:
+            return {
+                'size': self._size,
+                'idle': len(self._idle),
+                'in_use': self._in_use,
+                'min': self.minconn,
+                'max': self.maxconn,
+                'saturation': self._in_use / self.maxconn if self.maxconn else 0.0,
+                'peak_in_use': self._peak_in_use,
+                'checkouts': self._checkouts,
+                'waits': self._waits,
+                'timeouts': self._timeouts,
+                'wait_avg_ms': (self._wait_total / self._checkouts * 1000) if self._checkouts else 0.0,
+                'wait_max_ms': self._wait_max * 1000,
+                'discarded': self._discarded,
+                'reaped': self._reaped,
+            }
@@ -0,0 +1,151 @@
+import threading
+import time
+from collections import namedtuple
+from singleflight import SingleFlight
+
+# 파싱이 끝난 키 쌍 스냅샷 (불변 객체로 통째로 교체하여 원자적으로 스왑)
+KeySnapshot = namedtuple('KeySnapshot', ['version', 'private_key', 'public_key'])
+
+
+class SigningKeyCache:
+    """
+    Vault KV 서명 키 인메모리 캐시
+
+    - 파싱된 키 객체를 메모리에 보관하여 요청마다 Vault 조회/PEM 파싱을 하지 않음
+    - TTL이 지나면 KV v2 메타데이터의 current_version만 확인하고,
+      버전이 바뀐 경우에만 시크릿을 다시 읽어 파싱
+    - 새 스냅샷은 (스냅샷, 만료시각) 튜플 하나로 교체되므로 읽는 쪽은 락이 필요 없음
+    - 만료 시 동시에 들어온 요청은 singleflight로 합쳐 Vault 조회를 한 번만 수행
+    - Vault 장애로 갱신에 실패하면 마지막으로 확인된 키를 max_stale(초)까지 계속 사용하고
+      stale_retry_interval마다 다시 시도 (장애 중에도 토큰 검증 유지)
+    """
+
+    def __init__(self, loader, version_probe, ttl=300, max_stale=900, stale_retry_interval=5):
+        # loader(version=None) -> KeySnapshot, version_probe() -> int
+        self._loader = loader
+        self._version_probe = version_probe
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self.stale_retry_interval = stale_retry_interval
+        self._validated_at = 0.0
+        self._stale_fallbacks = 0
+        self.last_error = None
+        self._entry = None
+        self._flight = SingleFlight('signing_key')
+        self._stats_lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._refreshes = 0
+        self._version_checks = 0
+        self._loaded_at = None
+        self._rotation_listeners = []
+
+    def add_rotation_listener(self, callback):
+        """키 버전이 바뀌었을 때 호출할 콜백 등록 (예: 검증 캐시 무효화)"""
+        self._rotation_listeners.append(callback)
+
+    def get_private_key(self):
+        """캐시된 개인키 반환"""
+        snapshot = self._get_snapshot()
+        if snapshot.private_key is None:
+            raise Exception("Vault KV에 private_key가 없습니다. Vault 초기화 스크립트를 실행하세요.")
+        return snapshot.private_key
+
+    def get_public_key(self):
+        """캐시된 공개키 반환"""
+        snapshot = self._get_snapshot()
+        if snapshot.public_key is None:
+            raise Exception("Vault KV에 public_key가 없습니다. Vault 초기화 스크립트를 실행하세요.")
+        return snapshot.public_key
+
+    def invalidate(self):
+        """다음 조회 시 Vault에서 키를 다시 읽도록 캐시 무효화"""
+        self._entry = None
+        self._notify_rotation()
+
+    def _notify_rotation(self):
+        for callback in self._rotation_listeners:
+            callback()
+
+    def _get_snapshot(self):
+        entry = self._entry
+        if entry is not None and time.monotonic() < entry[1]:
+            self._count_hit()
+            return entry[0]
+        return self._refresh()
+
+    def _refresh(self):
+        # 동시에 만료를 본 요청들은 진행 중인 갱신 하나의 결과를 함께 사용
+        return self._flight.do('snapshot', self._refresh_once)
+
+    def _refresh_once(self):
+        # 직전에 끝난 갱신이 이미 새 스냅샷을 넣었을 수 있음
+        entry = self._entry
+        if entry is not None and time.monotonic() < entry[1]:
+            self._count_hit()
+            return entry[0]
+
+        with self._stats_lock:
+            self._misses += 1
+
+        rotated = False
+        try:
+            if entry is None:
+                snapshot = self._load()
+            else:
+                # 메타데이터로 버전만 확인하고, 변경된 경우에만 다시 로드
+                current_version = self._version_probe()
+                with self._stats_lock:
+                    self._version_checks += 1
+                if current_version != entry[0].version:
+                    snapshot = self._load(current_version)
+                    rotated = True
+                else:
+                    snapshot = entry[0]
+        except Exception as e:
+            if entry is None or time.monotonic() - self._validated_at > self.max_stale:
+                raise
+            # Vault 장애: 마지막으로 확인된 키를 잠시 더 사용하고 나중에 다시 시도
+            self.last_error = str(e)
+            with self._stats_lock:
+                self._stale_fallbacks += 1
+            self._entry = (entry[0], time.monotonic() + min(self.stale_retry_interval, self.ttl))
+            return entry[0]
+
+        self._validated_at = time.monotonic()
+        self.last_error = None
+        self._entry = (snapshot, self._validated_at + self.ttl)
+        if rotated:
+            self._notify_rotation()
+        return snapshot
+
+    def _load(self, version=None):
+        snapshot = self._loader(version=version)
+        with self._stats_lock:
+            self._refreshes += 1
+        self._loaded_at = time.time()
+        return snapshot
+
+    def _count_hit(self):
+        with self._stats_lock:
+            self._hits += 1
+
+    def stats(self):
+        """캐시 적중/미스/갱신 카운터"""
+        entry = self._entry
+        flight = self._flight.stats()
+        with self._stats_lock:
+            return {
+                'hits': self._hits,
+                'misses': self._misses,
+                'refreshes': self._refreshes,
+                'version_checks': self._version_checks,
+                'coalesced': flight['coalesced'],
+                'stale_fallbacks': self._stale_fallbacks,
+                'stale_seconds': time.monotonic() - self._validated_at if entry else None,
+                'max_stale': self.max_stale,
+                'last_error': self.last_error,
+                'version': entry[0].version if entry else None,
+                'loaded_at': self._loaded_at,
+                'ttl': self.ttl,
+            }
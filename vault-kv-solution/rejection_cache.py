@@ -0,0 +1,116 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+
+class RejectedTokenCache:
+    """
+    검증에 실패한 토큰의 다이제스트 캐시 (네거티브 캐시) + 클라이언트별 거절 카운터
+
+    - 같은 위조 토큰을 반복해서 보내면 서명 검증(RSA / Vault 호출) 대신 해시 조회로 거절
+    - 항목은 ttl(초) 뒤 만료되고, maxsize를 넘으면 오래된 항목부터 제거 (LRU)
+    - 클라이언트가 window(초) 안에 threshold번 이상 거절되면 block_seconds 동안 차단 상태
+      차단은 토큰을 거절하지 않음 (같은 IP 뒤의 클라이언트들이 카운터 하나를 공유하므로
+      정상 토큰도 함께 막힐 수 있음), 호출자가 is_blocked()로 비싼 검증 경로를 피하는 데 사용
+    - Vault 장애처럼 토큰 자체가 잘못되지 않은 실패는 기록하지 않아야 함 (호출자 책임)
+    """
+
+    def __init__(self, maxsize=10000, ttl=60, threshold=20, window=60, block_seconds=60, max_clients=10000):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.threshold = threshold
+        self.window = window
+        self.block_seconds = block_seconds
+        self.max_clients = max_clients
+        self._entries = OrderedDict()  # digest -> expires_at
+        self._clients = OrderedDict()  # client_id -> [window_start, count, blocked_until]
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._blocked_hits = 0
+        self._rejections = 0
+        self._blocks = 0
+
+    @staticmethod
+    def _digest(token):
+        return hashlib.sha256(token.encode('utf-8')).digest()
+
+    def is_rejected(self, token):
+        """최근 거절된 토큰이면 True (검증 생략)"""
+        if self.maxsize <= 0:
+            return False
+        now = time.monotonic()
+        digest = self._digest(token)
+        with self._lock:
+            expires_at = self._entries.get(digest)
+            if expires_at is None:
+                return False
+            if expires_at <= now:
+                del self._entries[digest]
+                return False
+            self._hits += 1
+            return True
+
+    def is_blocked(self, client_id):
+        """검증 실패를 반복해 일시 차단된 클라이언트면 True"""
+        if client_id is None or self.threshold <= 0:
+            return False
+        now = time.monotonic()
+        with self._lock:
+            state = self._clients.get(client_id)
+            if state is None or state[2] <= now:
+                return False
+            self._blocked_hits += 1
+            return True
+
+    def add(self, token, client_id=None, cache_token=True):
+        """검증 실패 기록 (cache_token=False면 클라이언트 카운터만 올림)"""
+        now = time.monotonic()
+        digest = self._digest(token) if cache_token and self.maxsize > 0 else None
+        with self._lock:
+            self._rejections += 1
+            if digest is not None:
+                self._entries[digest] = now + self.ttl
+                self._entries.move_to_end(digest)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+            if client_id is not None and self.threshold > 0:
+                self._count_client(client_id, now)
+
+    def _count_client(self, client_id, now):
+        state = self._clients.get(client_id)
+        if state is None or now - state[0] >= self.window:
+            state = [now, 0, state[2] if state else 0.0]
+            self._clients[client_id] = state
+        self._clients.move_to_end(client_id)
+        state[1] += 1
+        if state[1] >= self.threshold and state[2] <= now:
+            state[2] = now + self.block_seconds
+            self._blocks += 1
+            print(f"토큰 검증 실패 반복으로 클라이언트 일시 차단: {client_id} ({state[1]}회 / {self.window}초)")
+        while len(self._clients) > self.max_clients:
+            self._clients.popitem(last=False)
+
+    def clear(self):
+        """거절된 토큰 다이제스트 전체 삭제 (키 회전 시 호출, 클라이언트 카운터는 유지)"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """네거티브 캐시 크기, 적중 수, 차단 중인 클라이언트 수"""
+        now = time.monotonic()
+        with self._lock:
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'ttl': self.ttl,
+                'hits': self._hits,
+                'rejections_recorded': self._rejections,
+                'clients_tracked': len(self._clients),
+                'clients_blocked': sum(1 for state in self._clients.values() if state[2] > now),
+                'blocked_hits': self._blocked_hits,
+                'blocks': self._blocks,
+                'threshold': self.threshold,
+                'window': self.window,
+                'block_seconds': self.block_seconds,
+            }
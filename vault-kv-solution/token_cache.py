@@ -0,0 +1,102 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+
+class VerifiedTokenCache:
+    """
+    검증에 성공한 토큰의 클레임 캐시 (LRU)
+
+    - 키는 토큰 원문이 아닌 SHA-256 다이제스트
+    - 항목은 토큰의 exp 또는 max_ttl 중 먼저 오는 시각에 만료
+    - 서명 키가 회전되면 clear()로 전체 무효화
+      키 버전이 여럿 공존하는 경우(Transit)는 put()에 서명 키 버전을 함께 저장하고,
+      키 목록에서 빠진 버전의 항목만 discard_versions()로 제거
+    """
+
+    def __init__(self, maxsize=10000, max_ttl=300):
+        self.maxsize = maxsize
+        self.max_ttl = max_ttl
+        self._entries = OrderedDict()  # digest -> (claims, expires_at, key_version)
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._invalidations = 0
+
+    @staticmethod
+    def _digest(token):
+        return hashlib.sha256(token.encode('utf-8')).digest()
+
+    def get(self, token):
+        """캐시된 클레임 반환 (없거나 만료되었으면 None)"""
+        if self.maxsize <= 0:
+            return None
+        digest = self._digest(token)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is None:
+                self._misses += 1
+                return None
+            if entry[1] <= now:
+                del self._entries[digest]
+                self._expirations += 1
+                self._misses += 1
+                return None
+            self._entries.move_to_end(digest)
+            self._hits += 1
+        # 호출자가 수정해도 캐시가 오염되지 않도록 복사본 반환
+        return dict(entry[0])
+
+    def put(self, token, claims, key_version=None):
+        """검증에 성공한 토큰의 클레임 저장 (key_version: 서명한 키 버전)"""
+        if self.maxsize <= 0:
+            return
+        now = time.time()
+        expires_at = now + self.max_ttl
+        exp = claims.get('exp')
+        if isinstance(exp, (int, float)):
+            expires_at = min(expires_at, exp)
+        if expires_at <= now:
+            return
+        digest = self._digest(token)
+        with self._lock:
+            self._entries[digest] = (dict(claims), expires_at, key_version)
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def clear(self):
+        """전체 무효화 (키 회전 시 호출)"""
+        with self._lock:
+            self._entries.clear()
+            self._invalidations += 1
+
+    def discard_versions(self, versions):
+        """주어진 키 버전으로 서명된 항목만 제거 (키 버전이 폐기되었을 때 호출)"""
+        versions = set(versions)
+        with self._lock:
+            stale = [digest for digest, entry in self._entries.items() if entry[2] in versions]
+            for digest in stale:
+                del self._entries[digest]
+            self._invalidations += 1
+        return len(stale)
+
+    def stats(self):
+        """캐시 크기 및 적중률"""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'hits': self._hits,
+                'misses': self._misses,
+                'hit_rate': self._hits / lookups if lookups else 0.0,
+                'evictions': self._evictions,
+                'expirations': self._expirations,
+                'invalidations': self._invalidations,
+            }
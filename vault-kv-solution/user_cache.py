@@ -0,0 +1,298 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+
+# 캐시에 "사용자 없음"을 저장할 때 쓰는 표식 (None은 캐시 미스를 뜻함)
+_MISSING = object()
+
+# 무효화 버전 키 유지 시간 (초, 조회 한 번에 걸리는 시간보다 충분히 길면 됨)
+VERSION_TTL = 3600
+
+
+class RedisUserBackend:
+    """
+    워커(프로세스) 간 공유 캐시 백엔드 (같은 노드의 redis)
+
+    - 값은 User 필드 목록의 JSON, 사용자 없음은 null
+    - delete()는 값을 지우고 사용자별 버전 키를 올림. 조회 시 읽은 버전이 저장 시점까지 그대로일 때만 저장하므로
+      (WATCH) 다른 워커가 조회하는 도중에 무효화된 이전 값이 다시 저장되지 않음
+    - redis 장애 시 예외를 올리지 않고 캐시 미스로 처리 (DB에서 직접 조회)
+    """
+
+    def __init__(self, url, prefix='user:', socket_timeout=0.2):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("USER_CACHE_URL에 redis://를 사용하려면 redis 패키지를 설치하세요 (pip install redis)")
+        self.prefix = prefix
+        self._redis = redis.Redis.from_url(url, socket_timeout=socket_timeout, socket_connect_timeout=socket_timeout)
+        self._watch_error = redis.WatchError
+        self.errors = 0
+        self.last_error = None
+        self.skipped_writes = 0
+
+    def _key(self, user_id):
+        return f'{self.prefix}{user_id}'
+
+    def _version_key(self, user_id):
+        return f'{self.prefix}version:{user_id}'
+
+    @staticmethod
+    def _decode(raw, record_cls):
+        if raw is None:
+            return None
+        fields = json.loads(raw)
+        return _MISSING if fields is None else record_cls._make(fields)
+
+    def get(self, user_id, record_cls):
+        """(record 또는 None(미스), 버전): 값과 버전을 MGET 한 번으로 읽음"""
+        try:
+            raw, version = self._redis.mget([self._key(user_id), self._version_key(user_id)])
+        except Exception as e:
+            self._record_error(e)
+            return None, None
+        return self._decode(raw, record_cls), version
+
+    def get_many(self, user_ids, record_cls):
+        """여러 사용자를 한 번의 MGET으로 조회: ({user_id: record} (없는 항목은 제외), {user_id: 버전})"""
+        keys = [self._key(user_id) for user_id in user_ids]
+        try:
+            values = self._redis.mget(keys + [self._version_key(user_id) for user_id in user_ids])
+        except Exception as e:
+            self._record_error(e)
+            return {}, {}
+        found = {}
+        for user_id, raw in zip(user_ids, values):
+            record = self._decode(raw, record_cls)
+            if record is not None:
+                found[user_id] = record
+        return found, dict(zip(user_ids, values[len(keys):]))
+
+    def set(self, user_id, record, ttl, version):
+        """get()에서 읽은 버전이 그대로일 때만 저장"""
+        self._set_if_unchanged({user_id: record}, {user_id: version}, ttl)
+
+    def set_many(self, records, ttl, versions):
+        """{user_id: record}를 트랜잭션 한 번으로 저장 (get_many()에서 읽은 버전이 하나라도 바뀌었으면 모두 버림)"""
+        self._set_if_unchanged(records, versions, ttl)
+
+    def _set_if_unchanged(self, records, versions, ttl):
+        version_keys = [self._version_key(user_id) for user_id in records]
+        try:
+            with self._redis.pipeline() as pipeline:
+                # 버전 확인 이후 EXEC 전까지의 무효화는 WATCH로 감지 (EXEC가 WatchError로 실패)
+                pipeline.watch(*version_keys)
+                if pipeline.mget(version_keys) != [versions.get(user_id) for user_id in records]:
+                    self.skipped_writes += 1
+                    return
+                pipeline.multi()
+                for user_id, record in records.items():
+                    value = json.dumps(None if record is _MISSING else list(record), ensure_ascii=False)
+                    pipeline.set(self._key(user_id), value, ex=max(int(ttl), 1))
+                pipeline.execute()
+        except self._watch_error:
+            self.skipped_writes += 1
+        except Exception as e:
+            self._record_error(e)
+
+    def delete(self, user_id):
+        """값 삭제 + 버전 증가 (조회 중이던 다른 워커가 이전 값을 다시 저장하지 못하게 함)"""
+        try:
+            pipeline = self._redis.pipeline()
+            pipeline.incr(self._version_key(user_id))
+            pipeline.expire(self._version_key(user_id), VERSION_TTL)
+            pipeline.delete(self._key(user_id))
+            pipeline.execute()
+        except Exception as e:
+            self._record_error(e)
+
+    def _record_error(self, error):
+        self.errors += 1
+        self.last_error = str(error)
+
+    def stats(self):
+        return {
+            'type': 'redis',
+            'errors': self.errors,
+            'last_error': self.last_error,
+            'skipped_writes': self.skipped_writes,
+        }
+
+
+def make_backend(url):
+    """USER_CACHE_URL로 공유 백엔드 생성 (비어 있으면 프로세스 내 캐시만 사용)"""
+    if not url:
+        return None
+    if url.startswith(('redis://', 'rediss://', 'unix://')):
+        return RedisUserBackend(url)
+    raise ValueError(f"지원하지 않는 USER_CACHE_URL: {url}")
+
+
+class UserCache:
+    """
+    사용자 레코드 read-through 캐시 (LRU + TTL)
+
+    - get_or_load(user_id, loader): 캐시에 없으면 loader(user_id)로 조회하여 저장
+      존재하지 않는 사용자(None)도 저장하여 없는 ID 반복 조회가 DB로 가지 않게 함
+    - 사용자 정보를 바꾸는 코드(생성, 수정)는 반드시 invalidate(user_id)를 호출해야 함
+    - backend가 있으면 프로세스 캐시(local_ttl) -> 공유 백엔드(ttl) -> DB 순으로 조회
+      (다른 워커의 프로세스 캐시는 무효화되지 않으므로 local_ttl을 짧게 두어 오래된 값 유지 시간을 제한)
+    - 조회 도중 무효화된 결과는 프로세스 캐시와 공유 백엔드에 저장하지 않음
+      (이 프로세스의 무효화는 세대 번호로, 다른 워커의 무효화는 백엔드의 버전으로 감지)
+    """
+
+    def __init__(self, record_cls, maxsize=10000, ttl=60, backend=None, local_ttl=None):
+        self.record_cls = record_cls
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.local_ttl = min(local_ttl, ttl) if local_ttl is not None else ttl
+        self.backend = backend
+        self._entries = OrderedDict()  # user_id -> (record 또는 _MISSING, expires_at)
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._hits = 0
+        self._backend_hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+
+    @property
+    def enabled(self):
+        return self.maxsize > 0 and self.ttl > 0
+
+    def get_or_load(self, user_id, loader):
+        """캐시된 사용자 반환, 없으면 loader(user_id) 결과를 저장 후 반환"""
+        if not self.enabled:
+            return loader(user_id)
+        hit, user, generation = self.peek(user_id)
+        if hit:
+            return user
+        found, user, version = self.shared_get(user_id)
+        if not found:
+            user = loader(user_id)
+            self.shared_set(user_id, user, version, generation)
+        self.store(user_id, user, generation)
+        return user
+
+    # get_or_load()의 단계 (I/O 종류별로 나누어 비동기 호출자는 공유 백엔드 호출만 스레드에서 실행할 수 있음)
+
+    def peek(self, user_id):
+        """프로세스 캐시만 조회 (I/O 없음): (적중 여부, User 또는 None, 세대 번호)"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and entry[1] > now:
+                self._entries.move_to_end(user_id)
+                self._hits += 1
+                return True, None if entry[0] is _MISSING else entry[0], self._generation
+            return False, None, self._generation
+
+    def shared_get(self, user_id):
+        """공유 백엔드 조회 (redis I/O): (적중 여부, User 또는 None, 버전), 백엔드가 없으면 항상 미스"""
+        record, version = self.backend.get(user_id, self.record_cls) if self.backend is not None else (None, None)
+        with self._lock:
+            if record is None:
+                self._misses += 1
+                return False, None, version
+            self._backend_hits += 1
+        return True, None if record is _MISSING else record, version
+
+    def shared_set(self, user_id, user, version, generation):
+        """DB에서 읽은 사용자를 공유 백엔드에 저장 (조회 도중 무효화되었으면 저장하지 않음)"""
+        if self.backend is not None and generation == self._generation:
+            self.backend.set(user_id, _MISSING if user is None else user, self.ttl, version)
+
+    def store(self, user_id, user, generation):
+        """프로세스 캐시에 저장 (peek() 이후 invalidate()가 호출되었으면 이전 값일 수 있으므로 저장하지 않음)"""
+        with self._lock:
+            if generation == self._generation:
+                self._entries[user_id] = (_MISSING if user is None else user, time.monotonic() + self.local_ttl)
+                self._entries.move_to_end(user_id)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+                    self._evictions += 1
+
+    def get_many_or_load(self, user_ids, loader):
+        """
+        여러 사용자 조회: {user_id: User 또는 None}
+        캐시에 없는 ID만 모아 loader(ids) -> {user_id: User}를 한 번 호출 (결과에 없는 ID는 사용자 없음)
+        """
+        user_ids = list(dict.fromkeys(user_ids))
+        if not self.enabled:
+            loaded = loader(user_ids) if user_ids else {}
+            return {user_id: loaded.get(user_id) for user_id in user_ids}
+
+        found = {}
+        now = time.monotonic()
+        with self._lock:
+            for user_id in user_ids:
+                entry = self._entries.get(user_id)
+                if entry is not None and entry[1] > now:
+                    self._entries.move_to_end(user_id)
+                    found[user_id] = entry[0]
+            self._hits += len(found)
+            generation = self._generation
+
+        missing = [user_id for user_id in user_ids if user_id not in found]
+        fresh = {}
+        versions = {}
+        if missing and self.backend is not None:
+            fresh, versions = self.backend.get_many(missing, self.record_cls)
+            with self._lock:
+                self._backend_hits += len(fresh)
+            missing = [user_id for user_id in missing if user_id not in fresh]
+        if missing:
+            with self._lock:
+                self._misses += len(missing)
+            loaded = loader(missing)
+            records = {user_id: loaded.get(user_id) or _MISSING for user_id in missing}
+            if self.backend is not None and generation == self._generation:
+                self.backend.set_many(records, self.ttl, versions)
+            fresh.update(records)
+
+        if fresh:
+            with self._lock:
+                if generation == self._generation:
+                    expires_at = time.monotonic() + self.local_ttl
+                    for user_id, record in fresh.items():
+                        self._entries[user_id] = (record, expires_at)
+                        self._entries.move_to_end(user_id)
+                    while len(self._entries) > self.maxsize:
+                        self._entries.popitem(last=False)
+                        self._evictions += 1
+            found.update(fresh)
+        return {user_id: None if found[user_id] is _MISSING else found[user_id] for user_id in user_ids}
+
+    def invalidate(self, user_id):
+        """사용자 정보 변경 후 호출 (생성, 수정, 삭제)"""
+        with self._lock:
+            self._entries.pop(user_id, None)
+            self._generation += 1
+            self._invalidations += 1
+        if self.backend is not None:
+            self.backend.delete(user_id)
+
+    def clear(self):
+        """프로세스 캐시 전체 삭제 (공유 백엔드 항목은 TTL로 만료)"""
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+
+    def stats(self):
+        """캐시 크기, 적중률, 무효화 횟수"""
+        with self._lock:
+            lookups = self._hits + self._backend_hits + self._misses
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'ttl': self.ttl,
+                'local_ttl': self.local_ttl,
+                'hits': self._hits,
+                'backend_hits': self._backend_hits,
+                'misses': self._misses,
+                'hit_rate': round((self._hits + self._backend_hits) / lookups, 4) if lookups else 0.0,
+                'evictions': self._evictions,
+                'invalidations': self._invalidations,
+                'backend': self.backend.stats() if self.backend is not None else None,
+            }
@@ -0,0 +1,214 @@
+import bisect
+import hashlib
+import threading
+import time
+from urllib.parse import parse_qs, urlsplit
+
+# memory://?users=N로 채우는 데모 사용자의 비밀번호 해시 (scripts/init_db.sql과 같은 "password123")
+DEMO_PASSWORD_HASH = hashlib.sha256(b'password123').hexdigest()
+
+
+class PostgresUserStore:
+    """
+    PostgreSQL users 테이블 저장소 (psycopg2 커넥션 풀 사용)
+
+    조회 결과는 record_cls(id, username, email, phone_num, address) 튜플
+    """
+
+    def __init__(self, pool, record_cls):
+        self.pool = pool
+        self.record_cls = record_cls
+        self._columns = ', '.join(record_cls._fields)
+
+    def warm(self):
+        self.pool.warm()
+
+    def _fetchone(self, query, params):
+        with self.pool.connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(query, params)
+                return cur.fetchone()
+
+    def get_by_id(self, user_id):
+        row = self._fetchone(f"SELECT {self._columns} FROM users WHERE id = %s", (user_id,))
+        return self.record_cls._make(row) if row else None
+
+    def get_by_ids(self, user_ids):
+        """{user_id: User} (없는 ID는 결과에 없음)"""
+        with self.pool.connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    f"SELECT {self._columns} FROM users WHERE id = ANY(%s)",
+                    (list(user_ids),)
+                )
+                return {row[0]: self.record_cls._make(row) for row in cur.fetchall()}
+
+    def get_by_username(self, username):
+        row = self._fetchone(f"SELECT {self._columns} FROM users WHERE username = %s", (username,))
+        return self.record_cls._make(row) if row else None
+
+    def get_by_username_with_hash(self, username):
+        """(User, password_hash) 또는 None"""
+        row = self._fetchone(
+            f"SELECT {self._columns}, password_hash FROM users WHERE username = %s",
+            (username,)
+        )
+        if not row:
+            return None
+        return self.record_cls._make(row[:-1]), row[-1]
+
+    def create(self, username, password_hash, email, phone_num=None, address=None):
+        with self.pool.connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    f"""INSERT INTO users (username, password_hash, email, phone_num, address)
+                       VALUES (%s, %s, %s, %s, %s)
+                       RETURNING {self._columns}""",
+                    (username, password_hash, email, phone_num, address)
+                )
+                new_user = self.record_cls._make(cur.fetchone())
+            conn.commit()
+        return new_user
+
+    def update_password_hash(self, user_id, password_hash):
+        with self.pool.connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("UPDATE users SET password_hash = %s WHERE id = %s", (password_hash, user_id))
+            conn.commit()
+
+    def list_page(self, after_id=0, limit=100):
+        """id > after_id인 (id, username, email)을 id 순으로 limit개 (키셋 페이지네이션)"""
+        with self.pool.connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    "SELECT id, username, email FROM users WHERE id > %s ORDER BY id LIMIT %s",
+                    (after_id, limit)
+                )
+                return cur.fetchall()
+
+    def iter_users(self, after_id=0, batch_size=1000):
+        """
+        id > after_id인 (id, username, email)을 id 순으로 순회 (서버 측 named cursor, batch_size행씩 가져옴)
+        순회가 끝나거나 중단될 때까지 풀의 연결 하나를 점유
+        """
+        with self.pool.connection() as conn:
+            with conn.cursor(name='iter_users') as cur:
+                cur.itersize = batch_size
+                cur.execute(
+                    "SELECT id, username, email FROM users WHERE id > %s ORDER BY id",
+                    (after_id,)
+                )
+                yield from cur
+
+    def stats(self):
+        return self.pool.stats()
+
+
+class MemoryUserStore:
+    """
+    프로세스 메모리 저장소 (DATABASE_URL=memory://, 단위 테스트 / 벤치마크용)
+
+    - id, username dict 인덱스로 조회하고, 정렬된 id 목록으로 키셋 페이지네이션
+    - users=N이면 user1..userN (비밀번호 password123) 데모 사용자로 시작
+    - latency_ms만큼 호출마다 대기하여 DB 왕복을 흉내냄 (0이면 순수 앱 / 암호화 / Vault 비용만 측정)
+    - 워커 프로세스 간에 공유되지 않으며 재시작하면 사라짐
+    """
+
+    def __init__(self, record_cls, users=0, latency_ms=0.0, password_hash=DEMO_PASSWORD_HASH):
+        self.record_cls = record_cls
+        self.latency = latency_ms / 1000.0
+        self._lock = threading.Lock()
+        self._by_id = {}          # id -> User
+        self._by_username = {}    # username -> id
+        self._password_hashes = {}  # id -> password_hash
+        self._ids = []            # 오름차순 id (id는 증가하는 값으로만 추가)
+        self._next_id = 1
+        self._calls = 0
+        for user_id in range(1, users + 1):
+            self.create(f'user{user_id}', password_hash, f'user{user_id}@example.com', '010-0000-0000', '서울시')
+        self._calls = 0
+
+    def _call(self):
+        with self._lock:
+            self._calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def warm(self):
+        pass
+
+    def get_by_id(self, user_id):
+        self._call()
+        return self._by_id.get(user_id)
+
+    def get_by_ids(self, user_ids):
+        self._call()
+        return {user_id: self._by_id[user_id] for user_id in user_ids if user_id in self._by_id}
+
+    def get_by_username(self, username):
+        self._call()
+        user_id = self._by_username.get(username)
+        return self._by_id.get(user_id) if user_id is not None else None
+
+    def get_by_username_with_hash(self, username):
+        self._call()
+        with self._lock:
+            user_id = self._by_username.get(username)
+            if user_id is None:
+                return None
+            return self._by_id[user_id], self._password_hashes[user_id]
+
+    def create(self, username, password_hash, email, phone_num=None, address=None):
+        self._call()
+        with self._lock:
+            if username in self._by_username:
+                raise ValueError(f"이미 존재하는 사용자명: {username}")
+            user = self.record_cls(self._next_id, username, email, phone_num, address)
+            self._next_id += 1
+            self._by_id[user.id] = user
+            self._by_username[username] = user.id
+            self._password_hashes[user.id] = password_hash
+            self._ids.append(user.id)
+        return user
+
+    def update_password_hash(self, user_id, password_hash):
+        self._call()
+        with self._lock:
+            if user_id in self._password_hashes:
+                self._password_hashes[user_id] = password_hash
+
+    def list_page(self, after_id=0, limit=100):
+        self._call()
+        with self._lock:
+            start = bisect.bisect_right(self._ids, after_id)
+            users = [self._by_id[user_id] for user_id in self._ids[start:start + limit]]
+        return [(user.id, user.username, user.email) for user in users]
+
+    def iter_users(self, after_id=0, batch_size=1000):
+        while True:
+            rows = self.list_page(after_id, batch_size)
+            yield from rows
+            if len(rows) < batch_size:
+                return
+            after_id = rows[-1][0]
+
+    def stats(self):
+        with self._lock:
+            return {'type': 'memory', 'users': len(self._by_id), 'calls': self._calls}
+
+
+def make_store(url, record_cls, pool_factory):
+    """
+    DATABASE_URL 스킴으로 저장소 선택
+    - memory://[?users=N&latency_ms=X]: MemoryUserStore
+    - 그 외(postgresql://): pool_factory(url)로 만든 커넥션 풀의 PostgresUserStore
+    """
+    parts = urlsplit(url)
+    if parts.scheme == 'memory':
+        params = parse_qs(parts.query)
+        return MemoryUserStore(
+            record_cls,
+            users=int(params.get('users', ['0'])[0]),
+            latency_ms=float(params.get('latency_ms', ['0'])[0])
+        )
+    return PostgresUserStore(pool_factory(url), record_cls)
@@ -0,0 +1,107 @@
+import gc
+import os
+import threading
+import time
+
+
+class Warmup:
+    """
+    pre-fork 서버(gunicorn)용 준비 단계 실행기
+
+    - preload(): 마스터 프로세스에서 fork 전에 한 번 실행 (키 로드 등)
+      이후 gc.freeze()로 로드된 객체를 GC 대상에서 빼서 워커가 copy-on-write 페이지를 그대로 공유
+    - warm_worker(): 워커마다 요청을 받기 전에 실행 (DB 커넥션 풀, Vault 클라이언트 연결)
+      attempts번 안에 성공하지 못하면 백그라운드에서 계속 재시도하고 그동안 준비되지 않음 상태 유지
+      deadline(초)을 주면 다음 시도가 그 안에 끝나지 않을 것 같을 때 바로 백그라운드 재시도로 넘김
+      (gunicorn은 post_worker_init이 timeout보다 오래 걸리면 워커를 죽이고 다시 띄움)
+    - ready: 워커 준비 단계가 모두 성공했는지 (/readyz 응답에 사용)
+    - 단계는 (이름, 함수) 목록이며 함수는 인자 없이 호출
+    """
+
+    def __init__(self, preload_steps=(), worker_steps=(), attempts=5, retry_interval=2):
+        self.preload_steps = list(preload_steps)
+        self.worker_steps = list(worker_steps)
+        self.attempts = attempts
+        self.retry_interval = retry_interval
+        self._reset_state()
+        if hasattr(os, 'register_at_fork'):
+            # 마스터의 준비 상태는 워커에 물려주지 않음 (워커는 자기 연결을 직접 준비해야 함)
+            os.register_at_fork(after_in_child=self._reset_state)
+
+    def _reset_state(self):
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._results = {}  # 단계 이름 -> {'ok', 'seconds', 'error'}
+        self._worker_attempts = 0
+        self._retry_thread = None
+
+    @property
+    def ready(self):
+        return self._ready.is_set()
+
+    def _run_steps(self, steps):
+        ok = True
+        for name, step in steps:
+            started = time.perf_counter()
+            try:
+                step()
+                error = None
+            except Exception as e:
+                error = str(e)
+                ok = False
+            with self._lock:
+                self._results[name] = {
+                    'ok': error is None,
+                    'seconds': round(time.perf_counter() - started, 4),
+                    'error': error,
+                }
+            if error is not None:
+                print(f"준비 단계 실패 ({name}): {error}")
+        return ok
+
+    def preload(self):
+        """마스터 프로세스에서 fork 전에 실행 (실패해도 워커가 첫 사용 시 다시 로드하므로 계속 진행)"""
+        ok = self._run_steps(self.preload_steps)
+        if hasattr(gc, 'freeze'):
+            gc.collect()
+            gc.freeze()
+        return ok
+
+    def warm_worker(self, deadline=None):
+        """워커에서 요청 처리 전에 실행, 성공하면 ready로 전환"""
+        started = time.monotonic()
+        for attempt in range(max(self.attempts, 1)):
+            if attempt:
+                # 직전 시도만큼 걸린다고 보고 deadline을 넘길 것 같으면 중단
+                elapsed = time.monotonic() - started
+                if deadline is not None and elapsed + self.retry_interval + last_attempt > deadline:
+                    break
+                time.sleep(self.retry_interval)
+            attempt_started = time.monotonic()
+            self._worker_attempts += 1
+            if self._run_steps(self.worker_steps):
+                self._ready.set()
+                return True
+            last_attempt = time.monotonic() - attempt_started
+        # 의존성(DB, Vault)이 아직 뜨지 않은 경우: 워커는 띄우되 준비될 때까지 /readyz는 503
+        self._retry_thread = threading.Thread(target=self._retry_loop, name='warmup-retry', daemon=True)
+        self._retry_thread.start()
+        return False
+
+    def _retry_loop(self):
+        while not self._ready.is_set():
+            time.sleep(self.retry_interval)
+            self._worker_attempts += 1
+            if self._run_steps(self.worker_steps):
+                self._ready.set()
+
+    def stats(self):
+        """준비 상태와 단계별 결과"""
+        with self._lock:
+            results = {name: dict(result) for name, result in self._results.items()}
+        return {
+            'ready': self.ready,
+            'pid': os.getpid(),
+            'attempts': self._worker_attempts,
+            'steps': results,
+        }
@@ -1,12 +1,36 @@
-from flask import Flask, request, jsonify, render_template, session, redirect, url_for
-from auth import hash_password, verify_password, create_token, verify_token
-from database import get_user_by_username, get_user_by_id, get_user_by_username_with_hash
-from config import Config
+from flask import Flask, Response, request, jsonify, render_template, session, redirect, url_for, stream_with_context
+from auth import hash_password, verify_password, upgrade_password_hash, hash_upgrade_error, password_hasher, create_token, create_tokens, verify_token, can_access_user, token_cache, rejected_tokens, preflight
+from database import get_user_by_id, get_users_by_ids, get_user_by_username_with_hash, store as db_store, user_lookups, user_cache
+from config import Config, vault_clients, transit_public_keys
 import jwt
+import request_timing
+from password_hasher import PasswordHasherBusy
+from warmup import Warmup
+import hmac
+import math
+import time
 
 app = Flask(__name__)
 app.secret_key = Config.SECRET_KEY
 
+# 요청 단계별(db, vault, crypto, template) 처리 시간 측정: Server-Timing 헤더 + /metrics
+request_metrics = request_timing.init_app(app, server_timing_header=Config.SERVER_TIMING_HEADER)
+request_metrics.add_collector(vault_clients.breaker.render_prometheus)
+request_metrics.add_collector(preflight.render_prometheus)
+
+# 준비 단계: Transit 공개키는 fork 전에 한 번 로드하여 워커가 공유, DB 커넥션 풀 / 비밀번호 해시 프로세스 풀 / Vault 연결은 워커마다 준비
+warmup = Warmup(
+    preload_steps=[('transit_keys', transit_public_keys.latest_version)],
+    worker_steps=[
+        ('db_pool', db_store.warm),
+        ('password_hasher', password_hasher.warm),
+        ('vault_client', vault_clients.warm),
+        ('transit_keys', transit_public_keys.latest_version),
+    ],
+    attempts=Config.WARMUP_ATTEMPTS,
+    retry_interval=Config.WARMUP_RETRY_INTERVAL
+)
+
 @app.route('/')
 def index():
     """메인 페이지"""
@@ -22,34 +46,41 @@ def login():
         if not username or not password:
             return render_template('login.html', error='사용자명과 비밀번호를 입력하세요.')
         
-        # 데이터베이스에서 사용자 조회
-        user = get_user_by_username(username)
+        # 데이터베이스에서 사용자와 비밀번호 해시를 한 번에 조회
+        result = get_user_by_username_with_hash(username)
         
-        if not user:
+        if not result:
             return render_template('login.html', error='사용자를 찾을 수 없습니다.')
         
         # 비밀번호 검증
-        user_with_hash = get_user_by_username_with_hash(username)
-        if not user_with_hash or not verify_password(password, user_with_hash['password_hash']):
+        user, password_hash = result
+        try:
+            password_ok = verify_password(password, password_hash)
+        except PasswordHasherBusy:
+            return render_template('login.html', error='로그인 요청이 많습니다. 잠시 후 다시 시도하세요.'), 503
+        if not password_ok:
             return render_template('login.html', error='비밀번호가 올바르지 않습니다.')
         
+        # 이전 SHA256 해시(또는 이전 KDF 설정)면 현재 설정으로 교체
+        upgrade_password_hash(user.id, password, password_hash)
+        
         # JWT 토큰 생성 (Vault Transit으로 서명)
         try:
             token = create_token(
-                user_id=user['id'],
-                username=user['username'],
-                email=user['email']
+                user_id=user.id,
+                username=user.username,
+                email=user.email
             )
         except Exception as e:
             return render_template('login.html', error=f'토큰 생성 실패: {str(e)}')
         
         # 세션에 저장
         session['token'] = token
-        session['user_id'] = user['id']
-        session['username'] = user['username']
+        session['user_id'] = user.id
+        session['username'] = user.username
         
         # 사용자 정보 페이지로 리다이렉트
-        return redirect(url_for('user_info', user_id=user['id']))
+        return redirect(url_for('user_info', user_id=user.id))
     
     return render_template('login.html')
 
@@ -68,13 +99,13 @@ def user_info(user_id):
         return redirect(url_for('login'))
     
     # Vault Transit으로 토큰 검증
-    decoded_token = verify_token(token)
+    decoded_token = verify_token(token, client_id=request.remote_addr)
     
     if not decoded_token:
         return redirect(url_for('login'))
     
     # 토큰의 user_id와 요청한 user_id 일치 확인
-    if decoded_token.get('user_id') != user_id:
+    if not can_access_user(decoded_token, user_id):
         return jsonify({'error': '토큰의 user_id와 요청한 user_id가 일치하지 않습니다.'}), 403
     
     # 사용자 정보 조회
@@ -102,13 +133,13 @@ def api_user_info(user_id):
         return jsonify({'error': '토큰이 필요합니다.'}), 401
     
     # Vault Transit으로 토큰 검증
-    decoded_token = verify_token(token)
+    decoded_token = verify_token(token, client_id=request.remote_addr)
     
     if not decoded_token:
         return jsonify({'error': '토큰 검증 실패'}), 401
     
     # 토큰의 user_id와 요청한 user_id 일치 확인
-    if decoded_token.get('user_id') != user_id:
+    if not can_access_user(decoded_token, user_id):
         return jsonify({'error': '토큰의 user_id와 요청한 user_id가 일치하지 않습니다.'}), 403
     
     # 사용자 정보 조회
@@ -118,15 +149,166 @@ def api_user_info(user_id):
         return jsonify({'error': '사용자를 찾을 수 없습니다.'}), 404
     
     return jsonify({
-        'id': user['id'],
-        'username': user['username'],
-        'email': user['email'],
-        'phone_num': user['phone_num'],
-        'address': user['address'],
+        'id': user.id,
+        'username': user.username,
+        'email': user.email,
+        'phone_num': user.phone_num,
+        'address': user.address,
         'token_info': decoded_token,
         'vault_info': '키는 Vault Transit에서 생성 및 관리되며, 앱에서 직접 접근할 수 없습니다.'
     })
 
+@app.route('/api/users/batch', methods=['POST'])
+def api_users_batch():
+    """
+    API 엔드포인트 - 여러 사용자 정보 일괄 조회
+    본문: {"ids": [1, 2, ...]} (최대 USER_BATCH_MAX개)
+    토큰은 한 번만 검증하고 ID마다 /api/user/<id>와 같은 권한 규칙을 적용한 뒤,
+    허용된 ID만 쿼리 한 번(WHERE id = ANY)으로 조회하여 항목별 status가 담긴 JSON 배열로 스트리밍
+    """
+    token = request.headers.get('Authorization', '').replace('Bearer ', '')
+    
+    if not token:
+        token = session.get('token')
+    
+    if not token:
+        return jsonify({'error': '토큰이 필요합니다.'}), 401
+    
+    data = request.get_json(silent=True)
+    user_ids = data.get('ids') if isinstance(data, dict) else None
+    if not isinstance(user_ids, list) or not user_ids:
+        return jsonify({'error': 'ids 목록이 필요합니다.'}), 400
+    if len(user_ids) > Config.USER_BATCH_MAX:
+        return jsonify({'error': f'한 번에 최대 {Config.USER_BATCH_MAX}개까지 조회할 수 있습니다.'}), 400
+    if not all(isinstance(user_id, int) and not isinstance(user_id, bool) for user_id in user_ids):
+        return jsonify({'error': 'ids는 정수 목록이어야 합니다.'}), 400
+    
+    # 토큰 검증은 요청당 한 번
+    decoded_token = verify_token(token, client_id=request.remote_addr)
+    
+    if not decoded_token:
+        return jsonify({'error': '토큰 검증 실패'}), 401
+    
+    allowed = [user_id for user_id in user_ids if can_access_user(decoded_token, user_id)]
+    users = get_users_by_ids(allowed) if allowed else {}
+    
+    def generate():
+        yield '['
+        for index, user_id in enumerate(user_ids):
+            if user_id not in users:
+                item = {'id': user_id, 'status': 403, 'error': '토큰의 user_id와 요청한 user_id가 일치하지 않습니다.'}
+            elif users[user_id] is None:
+                item = {'id': user_id, 'status': 404, 'error': '사용자를 찾을 수 없습니다.'}
+            else:
+                user = users[user_id]
+                item = {'id': user_id, 'status': 200, 'user': {
+                    'id': user.id,
+                    'username': user.username,
+                    'email': user.email,
+                    'phone_num': user.phone_num,
+                    'address': user.address,
+                }}
+            yield (',' if index else '') + app.json.dumps(item)
+        yield ']'
+    
+    return Response(stream_with_context(generate()), mimetype='application/json')
+
+@app.route('/admin/tokens/batch', methods=['POST'])
+def admin_batch_tokens():
+    """
+    관리자 API - JWT 일괄 발급 (서비스 계정, 대량 마이그레이션용)
+    Vault Transit batch_input으로 chunk 단위 서명
+    """
+    admin_token = request.headers.get('X-Admin-Token', '')
+    if not Config.ADMIN_API_TOKEN or not hmac.compare_digest(admin_token, Config.ADMIN_API_TOKEN):
+        return jsonify({'error': '관리자 권한이 필요합니다.'}), 403
+    
+    data = request.get_json(silent=True)
+    users = data.get('users') if isinstance(data, dict) else None
+    if not isinstance(users, list) or not users:
+        return jsonify({'error': 'users 목록이 필요합니다.'}), 400
+    if len(users) > Config.ADMIN_BATCH_MAX:
+        return jsonify({'error': f'한 번에 최대 {Config.ADMIN_BATCH_MAX}개까지 발급할 수 있습니다.'}), 400
+    for user in users:
+        if not isinstance(user, dict) or not {'user_id', 'username', 'email'} <= user.keys():
+            return jsonify({'error': '각 항목에는 user_id, username, email이 필요합니다.'}), 400
+    
+    chunk_size = data.get('chunk_size')
+    if chunk_size is None:
+        chunk_size = Config.TRANSIT_BATCH_SIZE
+    # bool은 int의 하위 클래스이므로 따로 거절 (true가 chunk_size 1로 처리되지 않게)
+    if not isinstance(chunk_size, int) or isinstance(chunk_size, bool) or chunk_size <= 0:
+        return jsonify({'error': 'chunk_size는 양의 정수여야 합니다.'}), 400
+    
+    started = time.perf_counter()
+    try:
+        tokens = create_tokens(users, chunk_size=chunk_size)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 502
+    elapsed = time.perf_counter() - started
+    
+    return jsonify({
+        'tokens': tokens,
+        'count': len(tokens),
+        'chunk_size': chunk_size,
+        'vault_calls': math.ceil(len(tokens) / chunk_size),
+        'elapsed_ms': round(elapsed * 1000, 2),
+        'tokens_per_sec': round(len(tokens) / elapsed, 1) if elapsed > 0 else None
+    })
+
+@app.route('/api/transit-keys/stats', methods=['GET'])
+def transit_keys_stats():
+    """Transit 공개키 캐시 통계 (조회 / 합쳐진 조회 수)"""
+    return jsonify(transit_public_keys.stats())
+
+@app.route('/api/token-preflight/stats', methods=['GET'])
+def token_preflight_stats():
+    """서명 검증 전 사전 검사 통계 (사유별 거절 횟수)"""
+    return jsonify(preflight.stats())
+
+@app.route('/api/rejected-tokens/stats', methods=['GET'])
+def rejected_tokens_stats():
+    """검증 실패 토큰 캐시 / 클라이언트 차단 통계"""
+    return jsonify(rejected_tokens.stats())
+
+@app.route('/api/token-cache/stats', methods=['GET'])
+def token_cache_stats():
+    """검증된 토큰 캐시 통계 (크기, 적중률)"""
+    return jsonify(token_cache.stats())
+
+@app.route('/api/singleflight/stats', methods=['GET'])
+def singleflight_stats():
+    """동시 조회 합치기 통계 (실행 / 합쳐진 호출 수)"""
+    return jsonify({'get_user_by_id': user_lookups.stats()})
+
+@app.route('/api/user-cache/stats', methods=['GET'])
+def user_cache_stats():
+    """사용자 레코드 캐시 통계 (적중률, 무효화 횟수)"""
+    return jsonify(user_cache.stats())
+
+@app.route('/api/password-hasher/stats', methods=['GET'])
+def password_hasher_stats():
+    """비밀번호 해시 통계 (KDF 설정, 대기 중 작업 수, 대기열 초과 거절 수, 해시 업그레이드 중단 사유)"""
+    return jsonify({**password_hasher.stats(), 'upgrade_error': hash_upgrade_error()})
+
+@app.route('/api/db-pool/stats', methods=['GET'])
+def db_pool_stats():
+    """DB 커넥션 풀 통계 (대기 시간, 포화도, memory:// 저장소면 사용자 수 / 호출 수)"""
+    return jsonify(db_store.stats())
+
+@app.route('/api/vault-client/stats', methods=['GET'])
+def vault_client_stats():
+    """Vault 클라이언트 토큰 갱신 상태"""
+    return jsonify(vault_clients.stats())
+
+@app.route('/readyz', methods=['GET'])
+def readiness():
+    """준비 상태 (이 워커의 DB 커넥션 풀, 비밀번호 해시 프로세스 풀, Vault 연결 준비가 끝나야 200, 그 전에는 503)"""
+    stats = warmup.stats()
+    return jsonify(stats), 200 if stats['ready'] else 503
+
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=5000, debug=True)
+    # 개발용 단일 프로세스 서버 (운영은 gunicorn app:app, gunicorn.conf.py 참고)
+    warmup.warm_worker()
+    app.run(host='0.0.0.0', port=5000, debug=Config.DEBUG)
 
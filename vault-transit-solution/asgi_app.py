@@ -0,0 +1,217 @@
+"""
+Vault Transit 앱의 비동기(ASGI) 버전
+
+app.py와 같은 라우트를 Quart로 제공하며, Vault Transit 호출(httpx)과 DB 조회(asyncpg)를
+이벤트 루프에서 처리하므로 요청마다 스레드를 점유하지 않습니다.
+/api/user/<id>에서 토큰의 user_id가 URL과 같으면 서명 검증과 사용자 조회를 동시에 실행합니다.
+
+실행:
+    uvicorn asgi_app:app --host 0.0.0.0 --port 5000
+"""
+
+import asyncio
+from quart import Quart, request, jsonify, render_template, session, redirect, url_for
+from auth import can_access_user, password_hasher, hash_upgrade_error, token_cache, rejected_tokens, preflight
+from async_auth import create_token, check_password, upgrade_password_hash, precheck_token, verify_parsed_token, transit
+from async_database import get_user_by_id, get_user_by_username_with_hash, close_pool, pool_stats
+from config import Config, transit_public_keys
+from password_hasher import PasswordHasherBusy
+
+app = Quart(__name__)
+app.secret_key = Config.SECRET_KEY
+
+@app.before_serving
+async def start_password_hasher():
+    """비밀번호 해시 프로세스를 미리 띄움 (첫 로그인이 프로세스 시작을 기다리지 않게 함)"""
+    await asyncio.to_thread(password_hasher.warm)
+
+@app.after_serving
+async def close_connections():
+    """종료 시 Vault / DB 커넥션 풀 정리"""
+    await transit.aclose()
+    await close_pool()
+
+def request_token():
+    """Authorization 헤더 또는 세션의 토큰"""
+    token = request.headers.get('Authorization', '').replace('Bearer ', '')
+    return token or session.get('token')
+
+async def verify_and_fetch_user(token, user_id):
+    """
+    토큰 검증 + 사용자 조회
+    반환: (클레임, 사용자) - 토큰이 유효하지 않으면 클레임이 None, user_id가 다르면 사용자 조회 안 함
+
+    캐시에 없는 토큰은 사전 검사에서 꺼낸 user_id가 URL과 같을 때 서명 검증과 사용자 조회를
+    동시에 실행 (검증에 실패하면 조회 결과는 버림)
+    """
+    client_id = request.remote_addr
+    claims, parsed = precheck_token(token, client_id)
+    if claims is None:
+        if parsed is None:
+            return None, None
+        if can_access_user(parsed.claims, user_id):
+            claims, user = await asyncio.gather(
+                verify_parsed_token(token, parsed, client_id),
+                get_user_by_id(user_id),
+                return_exceptions=True
+            )
+            if claims is None:
+                return None, None
+            if isinstance(claims, BaseException):
+                raise claims
+            if isinstance(user, BaseException):
+                raise user
+            return claims, user
+        claims = await verify_parsed_token(token, parsed, client_id)
+        if claims is None:
+            return None, None
+    if not can_access_user(claims, user_id):
+        return claims, None
+    return claims, await get_user_by_id(user_id)
+
+@app.route('/')
+async def index():
+    """메인 페이지"""
+    return await render_template('index.html')
+
+@app.route('/login', methods=['GET', 'POST'])
+async def login():
+    """로그인 페이지 및 처리"""
+    if request.method == 'POST':
+        form = await request.form
+        username = form.get('username')
+        password = form.get('password')
+
+        if not username or not password:
+            return await render_template('login.html', error='사용자명과 비밀번호를 입력하세요.')
+
+        result = await get_user_by_username_with_hash(username)
+
+        if not result:
+            return await render_template('login.html', error='사용자를 찾을 수 없습니다.')
+
+        user, password_hash = result
+        try:
+            password_ok = await check_password(password, password_hash)
+        except PasswordHasherBusy:
+            return await render_template('login.html', error='로그인 요청이 많습니다. 잠시 후 다시 시도하세요.'), 503
+        if not password_ok:
+            return await render_template('login.html', error='비밀번호가 올바르지 않습니다.')
+
+        # 이전 SHA256 해시(또는 이전 KDF 설정)면 현재 설정으로 교체
+        await upgrade_password_hash(user.id, password, password_hash)
+
+        # JWT 토큰 생성 (Vault Transit으로 서명)
+        try:
+            token = await create_token(
+                user_id=user.id,
+                username=user.username,
+                email=user.email
+            )
+        except Exception as e:
+            return await render_template('login.html', error=f'토큰 생성 실패: {str(e)}')
+
+        session['token'] = token
+        session['user_id'] = user.id
+        session['username'] = user.username
+
+        return redirect(url_for('user_info', user_id=user.id))
+
+    return await render_template('login.html')
+
+@app.route('/user/<int:user_id>')
+async def user_info(user_id):
+    """
+    사용자 정보 페이지
+    Vault Transit으로 토큰 검증
+    """
+    token = request_token()
+    if not token:
+        return redirect(url_for('login'))
+
+    decoded_token, user = await verify_and_fetch_user(token, user_id)
+
+    if not decoded_token:
+        return redirect(url_for('login'))
+
+    if not can_access_user(decoded_token, user_id):
+        return jsonify({'error': '토큰의 user_id와 요청한 user_id가 일치하지 않습니다.'}), 403
+
+    if not user:
+        return jsonify({'error': '사용자를 찾을 수 없습니다.'}), 404
+
+    return await render_template('user_info.html',
+                                 user=user,
+                                 token_info=decoded_token,
+                                 current_token=token)
+
+@app.route('/api/user/<int:user_id>', methods=['GET'])
+async def api_user_info(user_id):
+    """
+    API 엔드포인트 - Vault Transit으로 토큰 검증
+    """
+    token = request_token()
+
+    if not token:
+        return jsonify({'error': '토큰이 필요합니다.'}), 401
+
+    decoded_token, user = await verify_and_fetch_user(token, user_id)
+
+    if not decoded_token:
+        return jsonify({'error': '토큰 검증 실패'}), 401
+
+    # 토큰의 user_id와 요청한 user_id 일치 확인
+    if not can_access_user(decoded_token, user_id):
+        return jsonify({'error': '토큰의 user_id와 요청한 user_id가 일치하지 않습니다.'}), 403
+
+    if not user:
+        return jsonify({'error': '사용자를 찾을 수 없습니다.'}), 404
+
+    return jsonify({
+        'id': user.id,
+        'username': user.username,
+        'email': user.email,
+        'phone_num': user.phone_num,
+        'address': user.address,
+        'token_info': decoded_token,
+        'vault_info': '키는 Vault Transit에서 생성 및 관리되며, 앱에서 직접 접근할 수 없습니다.'
+    })
+
+@app.route('/api/transit-keys/stats', methods=['GET'])
+async def transit_keys_stats():
+    """Transit 공개키 캐시 통계 (조회 / 합쳐진 조회 수)"""
+    return jsonify(transit_public_keys.stats())
+
+@app.route('/api/token-preflight/stats', methods=['GET'])
+async def token_preflight_stats():
+    """서명 검증 전 사전 검사 통계 (사유별 거절 횟수)"""
+    return jsonify(preflight.stats())
+
+@app.route('/api/rejected-tokens/stats', methods=['GET'])
+async def rejected_tokens_stats():
+    """검증 실패 토큰 캐시 / 클라이언트 차단 통계"""
+    return jsonify(rejected_tokens.stats())
+
+@app.route('/api/token-cache/stats', methods=['GET'])
+async def token_cache_stats():
+    """검증된 토큰 캐시 통계 (크기, 적중률)"""
+    return jsonify(token_cache.stats())
+
+@app.route('/api/password-hasher/stats', methods=['GET'])
+async def password_hasher_stats():
+    """비밀번호 해시 통계 (KDF 설정, 대기 중 작업 수, 대기열 초과 거절 수, 해시 업그레이드 중단 사유)"""
+    return jsonify({**password_hasher.stats(), 'upgrade_error': hash_upgrade_error()})
+
+@app.route('/api/db-pool/stats', methods=['GET'])
+async def db_pool_stats():
+    """asyncpg 커넥션 풀 통계"""
+    return jsonify(pool_stats())
+
+@app.route('/api/vault-client/stats', methods=['GET'])
+async def vault_client_stats():
+    """비동기 Transit 클라이언트 통계 (요청 수, 열린 연결 수, 서킷 브레이커)"""
+    return jsonify(transit.stats())
+
+if __name__ == '__main__':
+    import uvicorn
+    uvicorn.run(app, host='0.0.0.0', port=5000)
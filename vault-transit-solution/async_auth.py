@@ -0,0 +1,127 @@
+import asyncio
+import jwt_codec
+from async_vault import AsyncTransitClient, is_async_vault_outage
+from async_database import update_password_hash
+from auth import (
+    build_signing_input, transit_signature_to_jwt, verify_signature_locally,
+    hash_password, verify_password, needs_password_upgrade, record_upgrade_failure,
+    token_cache, rejected_tokens, preflight
+)
+from circuit_breaker import CircuitOpenError
+from config import Config, transit_public_keys
+from token_preflight import PreflightRejected
+
+# 비동기 앱 전역 Transit 클라이언트 (httpx 커넥션 풀, 동기 앱과 같은 timeout / 서킷 브레이커 설정)
+# 토큰 캐시, 네거티브 캐시, 사전 검사, 공개키 캐시는 auth 모듈의 인스턴스를 그대로 사용
+transit = AsyncTransitClient(
+    url=Config.VAULT_ADDR,
+    token=Config.VAULT_TOKEN,
+    timeout=Config.VAULT_TIMEOUT,
+    connect_timeout=Config.VAULT_CONNECT_TIMEOUT,
+    pool_maxsize=Config.VAULT_POOL_MAXSIZE,
+    failure_threshold=Config.VAULT_BREAKER_FAILURES,
+    reset_timeout=Config.VAULT_BREAKER_RESET
+)
+
+async def check_password(password, password_hash):
+    """
+    비밀번호 검증 (auth.verify_password의 비동기 버전)
+    KDF 프로세스 풀의 결과를 스레드에서 기다려 이벤트 루프를 막지 않음 (대기열이 가득 차면 PasswordHasherBusy)
+    """
+    return await asyncio.to_thread(verify_password, password, password_hash)
+
+async def upgrade_password_hash(user_id, password, password_hash):
+    """로그인 성공 후 호출: 이전 SHA256이거나 KDF 설정이 바뀐 해시면 다시 해시하여 저장 (auth.upgrade_password_hash와 같음)"""
+    if not needs_password_upgrade(password_hash):
+        return False
+    try:
+        await update_password_hash(user_id, await asyncio.to_thread(hash_password, password))
+    except Exception as e:
+        record_upgrade_failure(user_id, e)
+        return False
+    return True
+
+async def create_token(user_id, username, email):
+    """
+    JWT 토큰 생성 (RS256, auth.create_token의 비동기 버전)
+    Vault Transit API를 통해 서명 (키는 Vault에서 관리되며 앱에서 직접 접근 불가)
+    """
+    try:
+        # 키 버전은 공개키 캐시에서 조회 (캐시 만료 시에만 동기 hvac 호출이 발생하므로 스레드에서 실행)
+        key_version = await asyncio.to_thread(transit_public_keys.latest_version)
+        signing_input = build_signing_input(user_id, username, email, key_version)
+        signing_input_b64 = jwt_codec.transit_input(signing_input)
+        signature = await transit.sign_data(
+            Config.TRANSIT_KEY_NAME,
+            signing_input_b64,
+            key_version=key_version
+        )
+        return f"{signing_input}.{transit_signature_to_jwt(signature, key_version)}"
+    except Exception as e:
+        raise Exception(f"Vault Transit 서명 실패: {str(e)}")
+
+def precheck_token(token, client_id=None):
+    """
+    서명 검증 전 단계 (I/O 없음)
+    반환: (캐시된 클레임, None) / (None, ParsedToken) / (None, None: 거절)
+    """
+    cached = token_cache.get(token)
+    if cached is not None:
+        return cached, None
+    if rejected_tokens.is_rejected(token):
+        return None, None
+    try:
+        return None, preflight.check(token)
+    except PreflightRejected as e:
+        # nbf는 곧 유효해질 수 있으므로 토큰은 캐시하지 않음
+        rejected_tokens.add(token, client_id, cache_token=e.reason != 'nbf')
+        return None, None
+
+async def verify_parsed_token(token, parsed, client_id=None):
+    """사전 검사를 통과한 토큰의 서명 검증, 성공 시 클레임 반환 (auth.verify_token과 같은 캐시 규칙)"""
+    try:
+        valid = await verify_signature(
+            parsed.signing_input, parsed.signature, parsed.key_version,
+            prefer_local=rejected_tokens.is_blocked(client_id)
+        )
+    except Exception as e:
+        print(f"Vault Transit 검증 오류: {e}")
+        return None
+
+    if not valid:
+        # 아직 받지 못한 키 버전(회전 직후)이면 토큰은 캐시하지 않음 (auth.verify_token과 같음)
+        definitive = parsed.key_version in transit_public_keys.versions()
+        rejected_tokens.add(token, client_id, cache_token=definitive)
+        return None
+
+    token_cache.put(token, parsed.claims, parsed.key_version)
+    return parsed.claims
+
+async def verify_token(token, client_id=None):
+    """JWT 토큰 검증 (auth.verify_token의 비동기 버전)"""
+    cached, parsed = precheck_token(token, client_id)
+    if cached is not None:
+        return cached
+    if parsed is None:
+        return None
+    return await verify_parsed_token(token, parsed, client_id)
+
+async def verify_signature(signing_input, signature_bytes, key_version, prefer_local=False):
+    """TRANSIT_VERIFY_MODE에 따라 서명 검증 (auth.verify_signature와 같은 규칙)"""
+    if Config.TRANSIT_VERIFY_MODE == 'local' or (prefer_local and key_version in transit_public_keys.versions()):
+        return await _verify_locally(signing_input, signature_bytes, key_version)
+    try:
+        signature = f"vault:v{key_version}:{jwt_codec.b64encode(signature_bytes)}"
+        return await transit.verify_signed_data(
+            Config.TRANSIT_KEY_NAME,
+            jwt_codec.transit_input(signing_input),
+            signature
+        )
+    except Exception as e:
+        if not isinstance(e, CircuitOpenError) and not is_async_vault_outage(e):
+            raise
+        return await _verify_locally(signing_input, signature_bytes, key_version)
+
+async def _verify_locally(signing_input, signature_bytes, key_version):
+    # 공개키 캐시 갱신(동기 hvac 호출)과 RSA 연산이 이벤트 루프를 막지 않도록 스레드에서 실행
+    return await asyncio.to_thread(verify_signature_locally, signing_input, signature_bytes, key_version)
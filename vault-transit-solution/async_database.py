@@ -0,0 +1,92 @@
+import asyncio
+import asyncpg
+from config import Config
+from database import User, USER_COLUMNS, store, user_cache
+from user_store import MemoryUserStore
+
+# DATABASE_URL=memory://이면 asyncpg 대신 동기 앱과 같은 메모리 저장소 사용
+# (I/O가 없으므로 바로 호출, latency_ms 대기는 이벤트 루프를 막으므로 0으로 사용)
+_memory_store = store if isinstance(store, MemoryUserStore) else None
+
+# 프로세스(이벤트 루프) 전역 asyncpg 커넥션 풀 (첫 사용 시 생성)
+_pool = None
+_pool_lock = asyncio.Lock()
+
+async def get_pool():
+    """asyncpg 커넥션 풀 반환 (DB_POOL_* 설정은 동기 앱과 같음)"""
+    global _pool
+    if _pool is None:
+        async with _pool_lock:
+            if _pool is None:
+                _pool = await asyncpg.create_pool(
+                    Config.DATABASE_URL,
+                    min_size=Config.DB_POOL_MIN,
+                    max_size=Config.DB_POOL_MAX,
+                    max_inactive_connection_lifetime=Config.DB_POOL_MAX_IDLE,
+                    timeout=Config.DB_POOL_TIMEOUT
+                )
+    return _pool
+
+async def close_pool():
+    """커넥션 풀 종료 (앱 종료 시 호출)"""
+    global _pool
+    if _pool is not None:
+        await _pool.close()
+        _pool = None
+
+def pool_stats():
+    """커넥션 풀 크기 / 유휴 연결 수"""
+    if _memory_store is not None:
+        return _memory_store.stats()
+    if _pool is None:
+        return {'size': 0, 'idle': 0, 'max_size': Config.DB_POOL_MAX}
+    return {'size': _pool.get_size(), 'idle': _pool.get_idle_size(), 'max_size': _pool.get_max_size()}
+
+async def get_user_by_id(user_id):
+    """
+    ID로 사용자 정보 조회 (동기 앱과 같은 user_cache를 거침)
+    프로세스 캐시는 이벤트 루프에서 바로 확인하고, redis(동기 클라이언트) 호출만 스레드에서 실행
+    """
+    if not user_cache.enabled:
+        return await _fetch_user_by_id(user_id)
+    hit, user, generation = user_cache.peek(user_id)
+    if hit:
+        return user
+    shared = user_cache.backend is not None
+    if shared:
+        found, user, version = await asyncio.to_thread(user_cache.shared_get, user_id)
+    else:
+        found, user, version = user_cache.shared_get(user_id)
+    if not found:
+        user = await _fetch_user_by_id(user_id)
+        if shared:
+            await asyncio.to_thread(user_cache.shared_set, user_id, user, version, generation)
+    user_cache.store(user_id, user, generation)
+    return user
+
+async def _fetch_user_by_id(user_id):
+    if _memory_store is not None:
+        return _memory_store.get_by_id(user_id)
+    pool = await get_pool()
+    row = await pool.fetchrow(f"SELECT {USER_COLUMNS} FROM users WHERE id = $1", user_id)
+    return User._make(row) if row else None
+
+async def get_user_by_username_with_hash(username):
+    """로그인용 사용자 조회: (User, password_hash)를 한 번의 쿼리로 반환"""
+    if _memory_store is not None:
+        return _memory_store.get_by_username_with_hash(username)
+    pool = await get_pool()
+    row = await pool.fetchrow(
+        f"SELECT {USER_COLUMNS}, password_hash FROM users WHERE username = $1",
+        username
+    )
+    if not row:
+        return None
+    return User._make(tuple(row)[:-1]), row[-1]
+
+async def update_password_hash(user_id, password_hash):
+    """비밀번호 해시 교체"""
+    if _memory_store is not None:
+        return _memory_store.update_password_hash(user_id, password_hash)
+    pool = await get_pool()
+    await pool.execute("UPDATE users SET password_hash = $1 WHERE id = $2", password_hash, user_id)
@@ -0,0 +1,108 @@
+import httpx
+from hvac import utils as hvac_utils
+from circuit_breaker import CircuitBreaker
+from vault_client import is_vault_outage
+
+
+def is_async_vault_outage(error):
+    """httpx 전송 오류(연결 실패, 타임아웃)와 Vault 5xx만 회로 실패로 셈"""
+    return isinstance(error, httpx.TransportError) or is_vault_outage(error)
+
+
+class AsyncTransitClient:
+    """
+    Vault Transit 비동기 HTTP 클라이언트 (ASGI 앱용, httpx.AsyncClient)
+
+    - 앱이 사용하는 Transit API(sign, verify, keys 조회)만 구현
+    - keep-alive 커넥션 풀을 공유하고 모든 호출에 연결/응답 timeout 적용
+    - 오류 응답은 hvac과 같은 예외로 변환하고 동기 클라이언트와 같은 방식의 서킷 브레이커를 거침
+    """
+
+    def __init__(self, url, token, timeout=3, connect_timeout=1, pool_maxsize=20,
+                 failure_threshold=5, reset_timeout=10, mount_point='transit'):
+        self.url = url.rstrip('/')
+        self.token = token
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.pool_maxsize = pool_maxsize
+        self.mount_point = mount_point
+        self.breaker = CircuitBreaker(
+            'vault_async',
+            failure_threshold=failure_threshold,
+            reset_timeout=reset_timeout,
+            is_failure=is_async_vault_outage
+        )
+        self._client = None
+        self.requests = 0
+
+    def _get_client(self):
+        # 이벤트 루프 안에서 처음 사용할 때 생성 (루프마다 커넥션 풀이 따로 있어야 함)
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self.url,
+                headers={'X-Vault-Token': self.token},
+                timeout=httpx.Timeout(self.timeout, connect=self.connect_timeout),
+                limits=httpx.Limits(max_connections=self.pool_maxsize, max_keepalive_connections=self.pool_maxsize),
+            )
+        return self._client
+
+    async def aclose(self):
+        """커넥션 풀 종료 (앱 종료 시 호출)"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _request(self, method, path, json=None):
+        return await self.breaker.call_async(self._send, method, path, json)
+
+    async def _send(self, method, path, json):
+        self.requests += 1
+        response = await self._get_client().request(method, f'/v1/{path}', json=json)
+        if response.status_code >= 400:
+            try:
+                errors = response.json().get('errors')
+            except ValueError:
+                errors = None
+            hvac_utils.raise_for_error(
+                method, str(response.url), response.status_code,
+                message=', '.join(errors) if errors else response.text,
+                errors=errors, text=response.text
+            )
+        if response.status_code == 204:
+            return None
+        return response.json()
+
+    async def sign_data(self, name, hash_input, key_version=None, signature_algorithm='pss'):
+        """transit/sign/<name> 호출, 서명 문자열(vault:vN:...) 반환"""
+        payload = {'input': hash_input, 'signature_algorithm': signature_algorithm}
+        if key_version is not None:
+            payload['key_version'] = key_version
+        response = await self._request('POST', f'{self.mount_point}/sign/{name}', payload)
+        return response['data']['signature']
+
+    async def verify_signed_data(self, name, hash_input, signature, signature_algorithm='pss'):
+        """transit/verify/<name> 호출, 서명 유효 여부 반환"""
+        response = await self._request('POST', f'{self.mount_point}/verify/{name}', {
+            'input': hash_input,
+            'signature': signature,
+            'signature_algorithm': signature_algorithm,
+        })
+        return response['data']['valid']
+
+    async def read_key(self, name):
+        """transit/keys/<name> 조회 (공개키, 최신 버전)"""
+        return await self._request('GET', f'{self.mount_point}/keys/{name}')
+
+    def stats(self):
+        """요청 수와 서킷 브레이커 상태"""
+        pool = None
+        if self._client is not None:
+            # httpx 내부 풀에서 열린 연결 수 (keep-alive 재사용 확인용)
+            connections = getattr(self._client._transport, '_pool', None)
+            pool = len(connections.connections) if connections is not None else None
+        return {
+            'requests': self.requests,
+            'open_connections': pool,
+            'pool_maxsize': self.pool_maxsize,
+            'circuit_breaker': self.breaker.stats(),
+        }
@@ -1,23 +1,96 @@
-import hashlib
-import jwt
-import base64
-import json
+import jwt_codec
 from datetime import datetime, timedelta
-from config import Config
+from token_cache import VerifiedTokenCache
+from rejection_cache import RejectedTokenCache
+from config import Config, transit_public_keys
+from password_hasher import PasswordHasher
+from database import update_password_hash
+from circuit_breaker import CircuitOpenError
+from vault_client import is_vault_outage
+from token_preflight import TokenPreflight, PreflightRejected
+from request_timing import stage
+
+# 검증에 성공한 토큰 캐시 (같은 세션 토큰의 반복 검증 생략)
+# 키 회전(새 버전 추가)으로는 비우지 않고, 폐기된 키 버전으로 서명된 항목만 제거
+token_cache = VerifiedTokenCache(maxsize=Config.TOKEN_CACHE_SIZE, max_ttl=Config.TOKEN_CACHE_MAX_TTL)
+transit_public_keys.add_retirement_listener(token_cache.discard_versions)
+
+# 검증에 실패한 토큰 캐시 (같은 위조 토큰의 반복 검증 생략, 반복 실패 클라이언트는 Vault 대신 로컬 검증)
+rejected_tokens = RejectedTokenCache(
+    maxsize=Config.NEGATIVE_CACHE_SIZE,
+    ttl=Config.NEGATIVE_CACHE_TTL,
+    threshold=Config.CLIENT_REJECT_THRESHOLD,
+    window=Config.CLIENT_REJECT_WINDOW,
+    block_seconds=Config.CLIENT_BLOCK_SECONDS
+)
+
+# 서명 검증 전 로컬 사전 검사 (만료/다른 발급자/형식 오류 토큰은 Vault 호출 없이 거절)
+preflight = TokenPreflight(
+    issuer=Config.JWT_ISSUER,
+    leeway=Config.TOKEN_LEEWAY,
+    max_token_bytes=Config.TOKEN_MAX_BYTES
+)
+
+# 비밀번호 해시 (KDF는 별도 프로세스 풀에서 실행, 대기열이 가득 차면 PasswordHasherBusy)
+password_hasher = PasswordHasher(
+    algorithm=Config.PASSWORD_HASH_ALGORITHM,
+    scrypt_n=Config.PASSWORD_HASH_SCRYPT_N,
+    scrypt_r=Config.PASSWORD_HASH_SCRYPT_R,
+    scrypt_p=Config.PASSWORD_HASH_SCRYPT_P,
+    pbkdf2_iterations=Config.PASSWORD_HASH_PBKDF2_ITERATIONS,
+    workers=Config.PASSWORD_HASH_WORKERS,
+    max_queue=Config.PASSWORD_HASH_MAX_QUEUE,
+    queue_timeout=Config.PASSWORD_HASH_QUEUE_TIMEOUT
+)
 
 def hash_password(password):
-    """비밀번호를 SHA256으로 해시"""
-    return hashlib.sha256(password.encode('utf-8')).hexdigest()
+    """비밀번호를 현재 KDF 설정(scrypt / PBKDF2)으로 해시"""
+    with stage('crypto'):
+        return password_hasher.hash(password)
 
 def verify_password(password, password_hash):
-    """비밀번호 검증"""
-    return hash_password(password) == password_hash
+    """비밀번호 검증 (이전 SHA256 해시도 검증)"""
+    with stage('crypto'):
+        return password_hasher.verify(password, password_hash)
 
-def create_token(user_id, username, email):
+# 새 해시를 저장할 수 없는 DB 오류(SQLSTATE 22xxx, 예: 이전 스키마의 VARCHAR(64) 열)로 업그레이드가 실패하면
+# 이 프로세스에서는 업그레이드를 중단 (로그인마다 KDF를 한 번 더 계산하고 같은 오류를 반복하지 않게 함)
+_hash_upgrade_error = None
+
+def hash_upgrade_error():
+    """업그레이드를 중단시킨 오류 메시지 (중단되지 않았으면 None)"""
+    return _hash_upgrade_error
+
+def needs_password_upgrade(password_hash):
+    return _hash_upgrade_error is None and password_hasher.needs_rehash(password_hash)
+
+def record_upgrade_failure(user_id, error):
+    """업그레이드 실패 기록 (데이터 오류면 이후 업그레이드 중단, 그 외에는 다음 로그인 때 다시 시도)"""
+    global _hash_upgrade_error
+    code = getattr(error, 'pgcode', None) or getattr(error, 'sqlstate', None)
+    if isinstance(code, str) and code.startswith('22'):
+        _hash_upgrade_error = str(error).strip()
+        print(f"비밀번호 해시 업그레이드 중단: 새 해시를 저장할 수 없습니다 ({_hash_upgrade_error}). "
+              f"scripts/migrations/001_widen_password_hash.sql 적용 후 재시작하세요")
+    else:
+        print(f"비밀번호 해시 업그레이드 실패 (user_id={user_id}): {error}")
+
+def upgrade_password_hash(user_id, password, password_hash):
     """
-    JWT 토큰 생성 (RS256)
-    Vault Transit API를 통해 서명 (키는 Vault에서 관리되며 앱에서 직접 접근 불가)
+    로그인 성공 후 호출: 이전 SHA256이거나 KDF 설정이 바뀐 해시면 현재 설정으로 다시 해시하여 저장
+    실패해도 로그인은 계속 진행 (일시적인 오류면 다음 로그인 때 다시 시도)
     """
+    if not needs_password_upgrade(password_hash):
+        return False
+    try:
+        update_password_hash(user_id, hash_password(password))
+    except Exception as e:
+        record_upgrade_failure(user_id, e)
+        return False
+    return True
+
+def build_signing_input(user_id, username, email, key_version):
+    """JWT 헤더와 페이로드를 만들어 서명할 데이터(header.payload) 반환"""
     now = datetime.utcnow()
     payload = {
         'user_id': user_id,
@@ -25,107 +98,174 @@ def create_token(user_id, username, email):
         'email': email,
         'iat': int(now.timestamp()),
         'exp': int((now + timedelta(hours=24)).timestamp()),
-        'iss': 'vault-transit-app'
+        'iss': Config.JWT_ISSUER
     }
     
-    # JWT 헤더와 페이로드 생성
-    header = {'alg': 'RS256', 'typ': 'JWT'}
-    header_b64 = base64.urlsafe_b64encode(
-        jwt.encode(header, '', algorithm='none').split('.')[0].encode()
-    ).decode().rstrip('=')
-    
-    payload_json = jwt.encode(payload, '', algorithm='none').split('.')[1]
-    payload_b64 = payload_json  # 이미 base64 인코딩됨
-    
-    # 서명할 데이터 (JWT 표준 형식)
-    signing_input = f"{header_b64}.{payload_b64}"
-    
-    # Vault Transit API 호출: 서명을 Vault에 위임 (키는 Vault에서 관리)
+    # 서명할 데이터 (JWT 표준 형식): 헤더의 kid에 Transit 키 버전을 담아 검증 시 vault:vN: 으로 복원
+    return jwt_codec.signing_input(key_version, payload)
+
+def transit_signature_to_jwt(signature, key_version):
+    """Transit 서명(vault:vN:...)을 JWT 서명 세그먼트(base64url)로 변환"""
+    prefix = f'vault:v{key_version}:'
+    if not signature.startswith(prefix):
+        # 헤더의 kid와 실제 서명 키 버전이 다르면 검증할 수 없는 토큰이 됨
+        raise Exception(f"Transit 서명 키 버전이 일치하지 않습니다: {signature.split(':')[1]} (기대값 v{key_version})")
+    return jwt_codec.transit_signature_segment(signature[len(prefix):])
+
+def create_token(user_id, username, email):
+    """
+    JWT 토큰 생성 (RS256)
+    Vault Transit API를 통해 서명 (키는 Vault에서 관리되며 앱에서 직접 접근 불가)
+    """
     client = Config.get_vault_client()
     try:
+        # 최신 키 버전으로 서명하고 같은 버전을 헤더의 kid에 기록
+        key_version = transit_public_keys.latest_version()
+        signing_input = build_signing_input(user_id, username, email, key_version)
+        
         # Transit은 바이너리 데이터를 서명하므로, 서명할 데이터를 base64로 인코딩
-        signing_input_b64 = base64.b64encode(signing_input.encode('utf-8')).decode('utf-8')
+        signing_input_b64 = jwt_codec.transit_input(signing_input)
         # Vault Transit API를 통해 서명 (키는 앱에서 직접 접근 불가)
-        response = client.secrets.transit.sign_data(
-            name=Config.TRANSIT_KEY_NAME,
-            hash_input=signing_input_b64,
-            signature_algorithm='pss'
-        )
-        
-        # Transit 서명 형식: vault:v1:... 에서 실제 서명 부분만 추출
-        signature = response['data']['signature']
-        if signature.startswith('vault:v1:'):
-            signature_part = signature[9:]  # 'vault:v1:' 제거
-        else:
-            signature_part = signature
-        
-        # Base64 디코딩 후 URL-safe 인코딩으로 변환
-        try:
-            signature_bytes = base64.b64decode(signature_part)
-            signature_b64 = base64.urlsafe_b64encode(signature_bytes).decode().rstrip('=')
-        except:
-            # 이미 URL-safe 형식일 수 있음
-            signature_b64 = signature_part.replace('+', '-').replace('/', '_').rstrip('=')
+        with stage('vault'):
+            response = client.secrets.transit.sign_data(
+                name=Config.TRANSIT_KEY_NAME,
+                hash_input=signing_input_b64,
+                key_version=key_version,
+                signature_algorithm='pss'
+            )
         
-        token = f"{header_b64}.{payload_b64}.{signature_b64}"
-        return token
+        signature_b64 = transit_signature_to_jwt(response['data']['signature'], key_version)
+        return f"{signing_input}.{signature_b64}"
     except Exception as e:
         raise Exception(f"Vault Transit 서명 실패: {str(e)}")
 
-def verify_token(token):
+def create_tokens(users, chunk_size=None):
     """
-    JWT 토큰 검증
-    Vault Transit API를 통해 서명 검증 (키는 Vault에서 관리되며 앱에서 직접 접근 불가)
+    JWT 토큰 일괄 생성
+    모든 서명 데이터를 먼저 만든 뒤 Transit batch_input으로 chunk_size개씩 서명
+    users: [{'user_id': ..., 'username': ..., 'email': ...}, ...] (결과는 같은 순서)
     """
+    chunk_size = chunk_size or Config.TRANSIT_BATCH_SIZE
     try:
-        parts = token.split('.')
-        if len(parts) != 3:
-            return None
-        
-        header_b64, payload_b64, signature_b64 = parts
-        signing_input = f"{header_b64}.{payload_b64}"
-        
-        # Vault Transit API를 통해 서명 검증 (키는 Vault에서 관리되며 앱에서 직접 접근 불가)
-        client = Config.get_vault_client()
-        
-        # 서명을 Transit 형식으로 변환
-        signature_bytes = base64.urlsafe_b64decode(signature_b64 + '==')
-        signature_b64_std = base64.b64encode(signature_bytes).decode()
-        transit_signature = f"vault:v1:{signature_b64_std}"
-        
+        key_version = transit_public_keys.latest_version()
+    except Exception as e:
+        raise Exception(f"Vault Transit 키 버전 조회 실패: {str(e)}")
+    signing_inputs = [
+        build_signing_input(user['user_id'], user['username'], user['email'], key_version)
+        for user in users
+    ]
+    
+    client = Config.get_vault_client()
+    tokens = []
+    for start in range(0, len(signing_inputs), chunk_size):
+        chunk = signing_inputs[start:start + chunk_size]
+        batch_input = [
+            {'input': jwt_codec.transit_input(signing_input)}
+            for signing_input in chunk
+        ]
         try:
-            # 서명할 데이터를 base64로 인코딩
-            signing_input_b64 = base64.b64encode(signing_input.encode('utf-8')).decode('utf-8')
-            # Vault Transit API 호출: 서명 검증을 Vault에 위임
-            response = client.secrets.transit.verify_signed_data(
-                name=Config.TRANSIT_KEY_NAME,
-                hash_input=signing_input_b64,
-                signature=transit_signature,
-                signature_algorithm='pss'
-            )
-            
-            if response['data']['valid']:
-                # 페이로드를 직접 base64 디코딩하여 파싱
-                try:
-                    # JWT 토큰에서 페이로드 부분 추출 (두 번째 부분)
-                    payload_b64 = parts[1]
-                    # padding 추가
-                    padding = 4 - len(payload_b64) % 4
-                    if padding != 4:
-                        payload_b64 += '=' * padding
-                    # base64 디코딩
-                    payload_bytes = base64.urlsafe_b64decode(payload_b64)
-                    payload = json.loads(payload_bytes.decode('utf-8'))
-                    return payload
-                except Exception as e:
-                    print(f"페이로드 디코딩 오류: {e}")
-                    return None
-            else:
-                return None
+            with stage('vault'):
+                response = client.secrets.transit.sign_data(
+                    name=Config.TRANSIT_KEY_NAME,
+                    batch_input=batch_input,
+                    key_version=key_version,
+                    signature_algorithm='pss'
+                )
         except Exception as e:
-            print(f"Vault Transit 검증 오류: {e}")
-            return None
+            raise Exception(f"Vault Transit 일괄 서명 실패: {str(e)}")
+        
+        results = response['data']['batch_results']
+        if len(results) != len(chunk):
+            raise Exception(f"Vault Transit 일괄 서명 결과 수가 일치하지 않습니다: {len(results)}/{len(chunk)}")
+        for index, (signing_input, result) in enumerate(zip(chunk, results)):
+            if result.get('error'):
+                raise Exception(f"Vault Transit 일괄 서명 실패 (항목 {start + index}): {result['error']}")
+            tokens.append(f"{signing_input}.{transit_signature_to_jwt(result['signature'], key_version)}")
+    return tokens
+
+def can_access_user(claims, user_id):
+    """토큰 소유자만 자기 사용자 정보를 조회할 수 있음 (토큰의 user_id와 요청한 user_id 비교)"""
+    return claims.get('user_id') == user_id
+
+def verify_token(token, client_id=None):
+    """
+    JWT 토큰 검증
+    TRANSIT_VERIFY_MODE=vault: Vault Transit API를 통해 서명 검증
+    TRANSIT_VERIFY_MODE=local: Transit에서 내보낸 공개키로 로컬 검증 (서명은 계속 Vault에서만 수행)
+    서명 검증 전에 구조/alg/iss/exp/nbf/크기를 먼저 확인하여 잘못된 토큰은 Vault 호출 없이 거절
+    client_id: 요청한 클라이언트 식별자 (IP, 반복 실패 시 일시 차단되어 Vault 대신 로컬 검증)
+    """
+    # 이미 검증된 토큰이면 서명 검증(Vault 호출 포함) 생략
+    cached = token_cache.get(token)
+    if cached is not None:
+        return cached
+    
+    # 최근 거절된 토큰은 서명 검증 없이 거절
+    if rejected_tokens.is_rejected(token):
+        return None
+    
+    try:
+        # 헤더/페이로드는 여기서 한 번만 파싱
+        parsed = preflight.check(token)
+    except PreflightRejected as e:
+        # nbf는 곧 유효해질 수 있으므로 토큰은 캐시하지 않음
+        rejected_tokens.add(token, client_id, cache_token=e.reason != 'nbf')
+        return None
+    
+    try:
+        # 차단 중인 클라이언트(IP)의 토큰도 검증하지만 캐시된 공개키가 있으면 Vault를 호출하지 않음
+        valid = verify_signature(
+            parsed.signing_input, parsed.signature, parsed.key_version,
+            prefer_local=rejected_tokens.is_blocked(client_id)
+        )
     except Exception as e:
-        print(f"토큰 검증 오류: {e}")
+        print(f"Vault Transit 검증 오류: {e}")
+        return None
+    
+    if not valid:
+        # 아직 받지 못한 키 버전(회전 직후)이면 토큰은 캐시하지 않음 (Vault 장애 시 로컬 검증으로 넘어온 경우 포함)
+        # 그래서 회전 때 네거티브 캐시를 비우지 않아도 새 버전으로 서명된 토큰이 거절된 채 남지 않음
+        definitive = parsed.key_version in transit_public_keys.versions()
+        rejected_tokens.add(token, client_id, cache_token=definitive)
         return None
+    
+    token_cache.put(token, parsed.claims, parsed.key_version)
+    return parsed.claims
+
+def verify_signature(signing_input, signature_bytes, key_version, prefer_local=False):
+    """
+    TRANSIT_VERIFY_MODE에 따라 서명 검증 (Vault 장애 시 캐시된 공개키로 로컬 검증)
+    prefer_local: 키 버전의 공개키가 캐시에 있으면 vault 모드에서도 로컬 검증
+    """
+    if Config.TRANSIT_VERIFY_MODE == 'local' or (prefer_local and key_version in transit_public_keys.versions()):
+        return verify_signature_locally(signing_input, signature_bytes, key_version)
+    try:
+        return verify_signature_with_vault(signing_input, signature_bytes, key_version)
+    except Exception as e:
+        if not isinstance(e, CircuitOpenError) and not is_vault_outage(e):
+            raise
+        # 마지막으로 받은 공개키가 TRANSIT_KEY_CACHE_MAX_STALE 안에 있을 때만 검증 성공 가능
+        return verify_signature_locally(signing_input, signature_bytes, key_version)
+
+def verify_signature_with_vault(signing_input, signature_bytes, key_version):
+    """Vault Transit API 호출: 서명 검증을 Vault에 위임"""
+    client = Config.get_vault_client()
+    
+    # 서명을 Transit 형식으로 변환
+    transit_signature = f"vault:v{key_version}:{jwt_codec.b64encode(signature_bytes)}"
+    
+    # 서명할 데이터를 base64로 인코딩
+    signing_input_b64 = jwt_codec.transit_input(signing_input)
+    with stage('vault'):
+        response = client.secrets.transit.verify_signed_data(
+            name=Config.TRANSIT_KEY_NAME,
+            hash_input=signing_input_b64,
+            signature=transit_signature,
+            signature_algorithm='pss'
+        )
+    return response['data']['valid']
 
+def verify_signature_locally(signing_input, signature_bytes, key_version):
+    """캐시된 Transit 공개키로 RSA-PSS 서명을 로컬 검증 (Vault 호출 없음)"""
+    with stage('crypto'):
+        return transit_public_keys.verify(key_version, signing_input.encode('utf-8'), signature_bytes)
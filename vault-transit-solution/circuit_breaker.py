@@ -0,0 +1,198 @@
+import os
+import threading
+import time
+
+
+class CircuitOpenError(Exception):
+    """회로가 열려 있어 호출하지 않고 즉시 실패"""
+
+
+class CircuitBreaker:
+    """
+    외부 의존성(Vault) 호출용 서킷 브레이커
+
+    - closed: 정상 호출, 연속 실패가 failure_threshold에 도달하면 open
+    - open: 호출하지 않고 CircuitOpenError로 즉시 실패 (타임아웃까지 기다리지 않음)
+    - reset_timeout이 지나면 half_open: 시험 호출 하나만 허용하고 성공하면 closed, 실패하면 다시 open
+    - is_failure(예외)가 False인 예외(권한 오류 등)는 상대가 응답한 것이므로 실패로 세지 않음
+    - 시험 호출이 취소되면 회로는 half_open으로 두고 다음 호출이 다시 시험 호출이 됨
+    - 상태 전환 횟수와 상태별 누적 시간을 기록
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+    STATES = (CLOSED, OPEN, HALF_OPEN)
+
+    def __init__(self, name, failure_threshold=5, reset_timeout=10, is_failure=None):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._is_failure = is_failure or (lambda e: True)
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._state_since = time.monotonic()
+        self._opened_at = 0.0
+        self._consecutive_failures = 0
+        self._probe_in_flight = False
+        self._time_in_state = {state: 0.0 for state in self.STATES}
+        self._transitions = {}
+        self._successes = 0
+        self._failures = 0
+        self._rejected = 0
+        self.last_error = None
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._reset_lock)
+
+    def _reset_lock(self):
+        self._lock = threading.Lock()
+        self._probe_in_flight = False
+
+    @property
+    def state(self):
+        return self._state
+
+    def call(self, fn, *args, **kwargs):
+        """회로 상태에 따라 fn(*args, **kwargs)을 호출하거나 CircuitOpenError로 즉시 실패"""
+        self._before_call()
+        try:
+            result = fn(*args, **kwargs)
+        except Exception as e:
+            if self._is_failure(e):
+                self._on_failure(e)
+            else:
+                self._on_success()
+            raise
+        except BaseException:
+            # 취소(asyncio.CancelledError) / 인터럽트: 결과를 알 수 없으므로 성공 / 실패로 세지 않고 시험 호출만 반납
+            self._release_probe()
+            raise
+        self._on_success()
+        return result
+
+    async def call_async(self, fn, *args, **kwargs):
+        """call()의 비동기 버전 (fn은 코루틴 함수)"""
+        self._before_call()
+        try:
+            result = await fn(*args, **kwargs)
+        except Exception as e:
+            if self._is_failure(e):
+                self._on_failure(e)
+            else:
+                self._on_success()
+            raise
+        except BaseException:
+            # 취소(asyncio.CancelledError) / 인터럽트: 결과를 알 수 없으므로 성공 / 실패로 세지 않고 시험 호출만 반납
+            self._release_probe()
+            raise
+        self._on_success()
+        return result
+
+    def _before_call(self):
+        with self._lock:
+            if self._state == self.OPEN:
+                if time.monotonic() - self._opened_at < self.reset_timeout:
+                    self._rejected += 1
+                    raise CircuitOpenError(f"{self.name} 회로가 열려 있습니다 (최근 오류: {self.last_error})")
+                self._transition(self.HALF_OPEN)
+            if self._state == self.HALF_OPEN:
+                if self._probe_in_flight:
+                    self._rejected += 1
+                    raise CircuitOpenError(f"{self.name} 회로 복구 확인 중입니다")
+                self._probe_in_flight = True
+
+    def _release_probe(self):
+        with self._lock:
+            self._probe_in_flight = False
+
+    def _on_success(self):
+        with self._lock:
+            self._successes += 1
+            self._consecutive_failures = 0
+            if self._state == self.HALF_OPEN:
+                self._probe_in_flight = False
+                self._transition(self.CLOSED)
+
+    def _on_failure(self, error):
+        with self._lock:
+            self._failures += 1
+            self._consecutive_failures += 1
+            self.last_error = str(error)
+            if self._state == self.HALF_OPEN:
+                self._probe_in_flight = False
+                self._open()
+            elif self._state == self.CLOSED and self._consecutive_failures >= self.failure_threshold:
+                self._open()
+
+    def _open(self):
+        self._opened_at = time.monotonic()
+        self._transition(self.OPEN)
+
+    def _transition(self, new_state):
+        # 호출자가 self._lock을 잡고 있어야 함
+        now = time.monotonic()
+        old_state = self._state
+        self._time_in_state[old_state] += now - self._state_since
+        self._state = new_state
+        self._state_since = now
+        key = (old_state, new_state)
+        self._transitions[key] = self._transitions.get(key, 0) + 1
+        print(f"{self.name} 회로 상태 변경: {old_state} -> {new_state}")
+
+    def stats(self):
+        """현재 상태, 상태 전환 횟수, 상태별 누적 시간(초)"""
+        with self._lock:
+            time_in_state = dict(self._time_in_state)
+            time_in_state[self._state] += time.monotonic() - self._state_since
+            return {
+                'name': self.name,
+                'state': self._state,
+                'consecutive_failures': self._consecutive_failures,
+                'failure_threshold': self.failure_threshold,
+                'reset_timeout': self.reset_timeout,
+                'successes': self._successes,
+                'failures': self._failures,
+                'rejected': self._rejected,
+                'last_error': self.last_error,
+                'time_in_state_seconds': time_in_state,
+                'transitions': [
+                    {'from': old, 'to': new, 'count': count}
+                    for (old, new), count in sorted(self._transitions.items())
+                ],
+            }
+
+    def render_prometheus(self):
+        """Prometheus 텍스트 형식 지표 (/metrics에 추가)"""
+        stats = self.stats()
+        name = stats['name']
+        lines = [
+            '# HELP circuit_breaker_state 현재 회로 상태 (해당 상태면 1)',
+            '# TYPE circuit_breaker_state gauge',
+        ]
+        for state in self.STATES:
+            lines.append(f'circuit_breaker_state{{name="{name}",state="{state}"}} {int(stats["state"] == state)}')
+        lines += [
+            '# HELP circuit_breaker_state_seconds_total 상태별 누적 시간',
+            '# TYPE circuit_breaker_state_seconds_total counter',
+        ]
+        for state in self.STATES:
+            lines.append(
+                f'circuit_breaker_state_seconds_total{{name="{name}",state="{state}"}} '
+                f'{stats["time_in_state_seconds"][state]:.3f}'
+            )
+        lines += [
+            '# HELP circuit_breaker_transitions_total 상태 전환 횟수',
+            '# TYPE circuit_breaker_transitions_total counter',
+        ]
+        for transition in stats['transitions']:
+            lines.append(
+                f'circuit_breaker_transitions_total{{name="{name}",from="{transition["from"]}",'
+                f'to="{transition["to"]}"}} {transition["count"]}'
+            )
+        lines += [
+            '# HELP circuit_breaker_calls_total 호출 결과별 횟수 (rejected: 회로가 열려 즉시 실패)',
+            '# TYPE circuit_breaker_calls_total counter',
+        ]
+        for result in ('successes', 'failures', 'rejected'):
+            lines.append(f'circuit_breaker_calls_total{{name="{name}",result="{result}"}} {stats[result]}')
+        return '\n'.join(lines) + '\n'
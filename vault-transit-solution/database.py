@@ -1,47 +1,71 @@
-import psycopg2
-from psycopg2.extras import RealDictCursor
+from collections import namedtuple
 from config import Config
+from db_pool import ConnectionPool
+from request_timing import timed
+from singleflight import SingleFlight
+from user_cache import UserCache, make_backend
+from user_store import make_store
 
-def get_db_connection():
-    """데이터베이스 연결"""
-    return psycopg2.connect(Config.DATABASE_URL)
+# 사용자 레코드 (행마다 dict를 만들지 않는 튜플 기반 레코드, 비밀번호 해시는 포함하지 않음)
+User = namedtuple('User', ['id', 'username', 'email', 'phone_num', 'address'])
+USER_COLUMNS = "id, username, email, phone_num, address"
 
+# 사용자 저장소: DATABASE_URL이 memory://이면 프로세스 메모리, 그 외에는 PostgreSQL (커넥션 풀은 첫 사용 시 연결)
+store = make_store(
+    Config.DATABASE_URL,
+    User,
+    pool_factory=lambda url: ConnectionPool(
+        url,
+        minconn=Config.DB_POOL_MIN,
+        maxconn=Config.DB_POOL_MAX,
+        timeout=Config.DB_POOL_TIMEOUT,
+        max_idle=Config.DB_POOL_MAX_IDLE,
+        connect_timeout=Config.DB_CONNECT_TIMEOUT
+    )
+)
+# PostgreSQL 저장소의 커넥션 풀 (memory://이면 None)
+pool = getattr(store, 'pool', None)
+
+# 같은 사용자 ID를 동시에 조회하면 쿼리 하나의 결과를 함께 사용 (User는 불변 튜플이라 공유해도 안전)
+user_lookups = SingleFlight('get_user_by_id')
+
+# 사용자 레코드 read-through 캐시 (사용자 정보를 바꾸는 함수는 user_cache.invalidate(user_id) 호출)
+_user_cache_backend = make_backend(Config.USER_CACHE_URL)
+user_cache = UserCache(
+    User,
+    maxsize=Config.USER_CACHE_SIZE,
+    ttl=Config.USER_CACHE_TTL,
+    backend=_user_cache_backend,
+    local_ttl=Config.USER_CACHE_LOCAL_TTL if _user_cache_backend is not None else None
+)
+
+@timed('db')
 def get_user_by_username(username):
     """사용자명으로 사용자 정보 조회"""
-    conn = get_db_connection()
-    try:
-        with conn.cursor(cursor_factory=RealDictCursor) as cur:
-            cur.execute(
-                "SELECT id, username, email, phone_num, address FROM users WHERE username = %s",
-                (username,)
-            )
-            return cur.fetchone()
-    finally:
-        conn.close()
+    return store.get_by_username(username)
 
 def get_user_by_id(user_id):
-    """ID로 사용자 정보 조회"""
-    conn = get_db_connection()
-    try:
-        with conn.cursor(cursor_factory=RealDictCursor) as cur:
-            cur.execute(
-                "SELECT id, username, email, phone_num, address FROM users WHERE id = %s",
-                (user_id,)
-            )
-            return cur.fetchone()
-    finally:
-        conn.close()
+    """ID로 사용자 정보 조회 (캐시에 없으면 DB 조회, 동시 조회는 하나로 합침)"""
+    return user_cache.get_or_load(user_id, _load_user_by_id)
+
+@timed('db')
+def _load_user_by_id(user_id):
+    return user_lookups.do(user_id, store.get_by_id, user_id)
+
+def get_users_by_ids(user_ids):
+    """여러 사용자 조회: {user_id: User 또는 None} (캐시에 없는 ID는 쿼리 한 번으로 조회)"""
+    return user_cache.get_many_or_load(user_ids, _fetch_users_by_ids)
+
+@timed('db')
+def _fetch_users_by_ids(user_ids):
+    return store.get_by_ids(user_ids)
 
+@timed('db')
 def get_user_by_username_with_hash(username):
-    """비밀번호 해시 포함 사용자 조회"""
-    conn = get_db_connection()
-    try:
-        with conn.cursor(cursor_factory=RealDictCursor) as cur:
-            cur.execute(
-                "SELECT id, username, password_hash, email, phone_num, address FROM users WHERE username = %s",
-                (username,)
-            )
-            return cur.fetchone()
-    finally:
-        conn.close()
+    """로그인용 사용자 조회: (User, password_hash)를 한 번의 쿼리로 반환"""
+    return store.get_by_username_with_hash(username)
 
+@timed('db')
+def update_password_hash(user_id, password_hash):
+    """비밀번호 해시 교체 (User 레코드에 해시가 없으므로 사용자 캐시는 무효화하지 않음)"""
+    store.update_password_hash(user_id, password_hash)
@@ -0,0 +1,35 @@
+# gunicorn 설정 (운영용 pre-fork 멀티 워커 서버)
+#
+#   gunicorn app:app   (이 디렉토리에서 실행하면 이 파일을 자동으로 읽음)
+#
+# - preload_app: 마스터에서 앱과 키를 한 번 로드한 뒤 fork하여 워커가 메모리 페이지를 공유
+# - 워커마다 DB 커넥션 풀 / Vault 클라이언트 연결을 준비한 뒤 요청 처리 (/readyz로 확인)
+#   준비는 timeout의 절반 안에 끝내고 나머지 재시도는 백그라운드로 넘김 (넘기면 마스터가 워커를 죽임)
+import multiprocessing
+import os
+
+bind = os.getenv('BIND', '0.0.0.0:5000')
+workers = int(os.getenv('WEB_CONCURRENCY', str(multiprocessing.cpu_count())))
+# 워커당 스레드 수 (DB_POOL_MAX보다 크면 커넥션 대기가 생김)
+worker_class = 'gthread'
+threads = int(os.getenv('GUNICORN_THREADS', '4'))
+timeout = int(os.getenv('GUNICORN_TIMEOUT', '30'))
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', '30'))
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE', '5'))
+preload_app = True
+accesslog = os.getenv('GUNICORN_ACCESS_LOG') or None
+errorlog = '-'
+
+
+def when_ready(server):
+    # preload_app=True이므로 앱은 이미 마스터에 import됨, 워커 fork 직전에 키 로드
+    import app
+    app.warmup.preload()
+    server.log.info("preload 완료: %s", app.warmup.stats()['steps'])
+
+
+def post_worker_init(worker):
+    # 워커가 요청을 받기 전에 실행 (여기서 반환해야 요청 처리 시작, 그 전에는 하트비트도 보내지 않음)
+    import app
+    if not app.warmup.warm_worker(deadline=worker.cfg.timeout / 2):
+        worker.log.warning("워커 준비 실패, 백그라운드에서 재시도 (pid %s)", worker.pid)
@@ -0,0 +1,57 @@
+import binascii
+import json
+from functools import lru_cache
+
+# base64 <-> base64url 문자 변환 표 (bytes.translate는 한 번의 C 루프로 처리)
+_TO_URLSAFE = bytes.maketrans(b'+/', b'-_')
+_FROM_URLSAFE = bytes.maketrans(b'-_', b'+/')
+_TO_URLSAFE_STR = str.maketrans('+/', '-_')
+
+# 공백 없는 JSON (json.dumps에 인자를 넘기면 호출마다 인코더를 새로 만들므로 하나를 재사용)
+# ensure_ascii는 PyJWT와 같게 유지 (한글 사용자명도 \uXXXX로 이스케이프되어 같은 바이트가 나옴)
+_compact_encoder = json.JSONEncoder(separators=(',', ':'))
+
+
+def compact_json(obj):
+    """공백 없는 ASCII JSON 바이트"""
+    return _compact_encoder.encode(obj).encode('ascii')
+
+
+def b64url_encode(data):
+    """bytes -> 패딩 없는 base64url 문자열"""
+    return binascii.b2a_base64(data, newline=False).translate(_TO_URLSAFE).rstrip(b'=').decode('ascii')
+
+
+def b64url_decode(segment):
+    """패딩 없는 base64url 문자열 -> bytes (형식 오류는 binascii.Error / ValueError)"""
+    data = segment.encode('ascii').translate(_FROM_URLSAFE)
+    return binascii.a2b_base64(data + b'==='[:-len(data) % 4])
+
+
+def b64encode(data):
+    """bytes -> 표준 base64 문자열 (Transit hash_input / 서명 형식)"""
+    return binascii.b2a_base64(data, newline=False).decode('ascii')
+
+
+@lru_cache(maxsize=64)
+def header_segment(key_version, alg='RS256'):
+    """kid(vN)를 담은 JWT 헤더 세그먼트 (키 버전마다 한 번만 만듦)"""
+    return b64url_encode(compact_json({'alg': alg, 'typ': 'JWT', 'kid': f'v{key_version}'}))
+
+
+def signing_input(key_version, claims):
+    """서명할 데이터 'header.payload' (헤더는 미리 만든 세그먼트 사용)"""
+    return f"{header_segment(key_version)}.{b64url_encode(compact_json(claims))}"
+
+
+def transit_input(signing_input):
+    """Transit sign / verify의 input (서명할 데이터의 표준 base64)"""
+    return b64encode(signing_input.encode('ascii'))
+
+
+def transit_signature_segment(signature_b64):
+    """
+    Transit 서명의 표준 base64 부분 -> JWT 서명 세그먼트
+    디코딩 / 재인코딩 없이 문자만 바꾸고 패딩 제거
+    """
+    return signature_b64.translate(_TO_URLSAFE_STR).rstrip('=')
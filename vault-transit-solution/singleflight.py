@@ -0,0 +1,82 @@
+import os
+import threading
+
+
+class _Call:
+    __slots__ = ('done', 'result', 'error', 'waiters')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    동시 요청 합치기 (singleflight)
+
+    - 같은 키로 동시에 들어온 호출 중 첫 호출만 실제로 fn을 실행하고,
+      나머지는 그 결과(또는 예외)를 함께 받음
+    - 결과를 보관하지 않으므로 캐시가 아님: 실행이 끝난 뒤의 호출은 다시 실행됨
+    - 콜드 캐시 / 재시작 직후 Vault·DB로 같은 조회가 몰리는 현상(thundering herd) 방지
+    """
+
+    def __init__(self, name=None):
+        self.name = name
+        self._reset_state()
+        if hasattr(os, 'register_at_fork'):
+            # fork 시점에 다른 스레드가 잡고 있던 락/진행 중 호출을 자식에게 물려주지 않음
+            os.register_at_fork(after_in_child=self._reset_state)
+
+    def _reset_state(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._executions = 0
+        self._coalesced = 0
+        self._errors = 0
+
+    def do(self, key, fn, *args, **kwargs):
+        """key에 대해 진행 중인 호출이 있으면 그 결과를 기다리고, 없으면 fn(*args, **kwargs) 실행"""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self._coalesced += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                self._executions += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+        except BaseException as e:
+            call.error = e
+            with self._lock:
+                self._errors += 1
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def stats(self):
+        """실행 / 합쳐진 호출 수"""
+        with self._lock:
+            total = self._executions + self._coalesced
+            return {
+                'calls': total,
+                'executions': self._executions,
+                'coalesced': self._coalesced,
+                'coalesced_rate': self._coalesced / total if total else 0.0,
+                'errors': self._errors,
+                'in_flight': len(self._calls),
+            }
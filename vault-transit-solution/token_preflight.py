@@ -0,0 +1,166 @@
+import binascii
+import functools
+import json
+import threading
+import time
+from collections import namedtuple
+from jwt_codec import b64url_decode
+
+# 사전 검사를 통과한 토큰 (헤더/페이로드는 여기서 한 번만 파싱)
+ParsedToken = namedtuple('ParsedToken', ['signing_input', 'signature', 'key_version', 'claims'])
+
+# 거절 사유 (/metrics, 통계 라벨)
+REJECT_REASONS = ('size', 'structure', 'header', 'alg', 'kid', 'payload', 'signature', 'iss', 'exp', 'nbf')
+
+# 파싱 결과를 캐시할 헤더 세그먼트 수 (LRU, 임의 헤더를 보내도 메모리가 늘지 않게 함)
+MAX_CACHED_HEADERS = 64
+
+
+class PreflightRejected(Exception):
+    """서명 검증 전에 거절된 토큰"""
+
+    def __init__(self, reason, detail=''):
+        super().__init__(f"{reason}: {detail}" if detail else reason)
+        self.reason = reason
+
+
+# kid 도입 이전 토큰의 alg 자리 표시 (alg를 확인하지 않음)
+LEGACY_HEADER = object()
+
+
+@functools.lru_cache(maxsize=MAX_CACHED_HEADERS)
+def decode_header(header_b64):
+    """
+    헤더 세그먼트를 (alg, 키 버전)으로 파싱 (형식 오류 시 PreflightRejected)
+    발급 측 헤더는 키 버전마다 하나이므로 같은 세그먼트는 다시 파싱하지 않음 (예외는 캐시되지 않음)
+    """
+    try:
+        header_bytes = b64url_decode(header_b64)
+    except (binascii.Error, ValueError):
+        raise PreflightRejected('header', "헤더를 디코딩할 수 없습니다")
+    try:
+        header = json.loads(header_bytes)
+    except ValueError:
+        # kid 도입 이전 토큰: 헤더가 한 번 더 base64 인코딩되어 있고 항상 v1 키로 서명됨
+        try:
+            legacy_header = json.loads(b64url_decode(header_bytes.decode('ascii')))
+        except (binascii.Error, ValueError):
+            legacy_header = None
+        if not isinstance(legacy_header, dict):
+            raise PreflightRejected('header', "헤더가 JSON이 아닙니다")
+        return LEGACY_HEADER, 1
+    if not isinstance(header, dict):
+        raise PreflightRejected('header', "헤더가 JSON 객체가 아닙니다")
+    alg = header.get('alg')
+    kid = header.get('kid')
+    if kid is None:
+        return alg, 1
+    if not isinstance(kid, str) or not kid.startswith('v') or not kid[1:].isdigit():
+        raise PreflightRejected('kid', f"지원하지 않는 kid: {kid!r}")
+    return alg, int(kid[1:])
+
+
+class TokenPreflight:
+    """
+    서명 검증(Vault 호출) 전에 수행하는 로컬 토큰 사전 검사
+
+    - 크기, 구조(header.payload.signature), 헤더의 alg/kid, 페이로드의 iss/exp/nbf 확인
+    - 만료되었거나 다른 앱(vulnerable-app, vault-kv-app)이 발급한 토큰은 Transit 왕복 없이 거절
+    - 헤더와 페이로드를 한 번만 파싱하여 검증 이후 단계에서 그대로 사용
+    - 거절 사유별 횟수를 기록
+    """
+
+    def __init__(self, issuer, algorithms=('RS256',), leeway=0, max_token_bytes=4096):
+        self.issuer = issuer
+        self.algorithms = tuple(algorithms)
+        self.leeway = leeway
+        self.max_token_bytes = max_token_bytes
+        self._lock = threading.Lock()
+        self._passed = 0
+        self._rejections = {reason: 0 for reason in REJECT_REASONS}
+
+    def check(self, token):
+        """토큰을 파싱해 ParsedToken 반환 (거절 시 PreflightRejected)"""
+        try:
+            parsed = self._check(token)
+        except PreflightRejected as e:
+            with self._lock:
+                self._rejections[e.reason] += 1
+            raise
+        with self._lock:
+            self._passed += 1
+        return parsed
+
+    def _check(self, token):
+        if not isinstance(token, str) or len(token) > self.max_token_bytes:
+            raise PreflightRejected('size', f"토큰 길이 제한 {self.max_token_bytes}바이트 초과")
+        parts = token.split('.')
+        if len(parts) != 3 or not all(parts):
+            raise PreflightRejected('structure', "header.payload.signature 형식이 아닙니다")
+        header_b64, payload_b64, signature_b64 = parts
+
+        key_version = self._check_header(header_b64)
+
+        try:
+            claims = json.loads(b64url_decode(payload_b64))
+        except (binascii.Error, ValueError):
+            raise PreflightRejected('payload', "페이로드를 디코딩할 수 없습니다")
+        if not isinstance(claims, dict):
+            raise PreflightRejected('payload', "페이로드가 JSON 객체가 아닙니다")
+
+        try:
+            signature = b64url_decode(signature_b64)
+        except (binascii.Error, ValueError):
+            signature = b''
+        if not signature:
+            raise PreflightRejected('signature', "서명을 디코딩할 수 없습니다")
+
+        self._check_claims(claims)
+        return ParsedToken(f"{header_b64}.{payload_b64}", signature, key_version, claims)
+
+    def _check_header(self, header_b64):
+        """헤더의 alg 확인 후 kid(vN)에서 Transit 키 버전 반환"""
+        alg, key_version = decode_header(header_b64)
+        if alg is not LEGACY_HEADER and alg not in self.algorithms:
+            raise PreflightRejected('alg', f"허용하지 않는 alg: {alg!r}")
+        return key_version
+
+    def _check_claims(self, claims):
+        if claims.get('iss') != self.issuer:
+            raise PreflightRejected('iss', f"다른 발급자의 토큰: {claims.get('iss')!r}")
+        now = time.time()
+        exp = claims.get('exp')
+        if not isinstance(exp, (int, float)) or isinstance(exp, bool):
+            raise PreflightRejected('exp', "exp 클레임이 없습니다")
+        if exp + self.leeway <= now:
+            raise PreflightRejected('exp', "만료된 토큰")
+        nbf = claims.get('nbf')
+        if nbf is not None:
+            if not isinstance(nbf, (int, float)) or isinstance(nbf, bool):
+                raise PreflightRejected('nbf', "nbf 클레임 형식 오류")
+            if nbf - self.leeway > now:
+                raise PreflightRejected('nbf', "아직 유효하지 않은 토큰")
+
+    def stats(self):
+        """통과 / 사유별 거절 횟수"""
+        with self._lock:
+            return {
+                'passed': self._passed,
+                'rejected': sum(self._rejections.values()),
+                'rejections': dict(self._rejections),
+                'issuer': self.issuer,
+                'leeway': self.leeway,
+                'max_token_bytes': self.max_token_bytes,
+            }
+
+    def render_prometheus(self):
+        """Prometheus 텍스트 형식 지표 (/metrics에 추가)"""
+        stats = self.stats()
+        lines = [
+            '# HELP token_preflight_total 서명 검증 전 사전 검사 결과 (reason: 거절 사유)',
+            '# TYPE token_preflight_total counter',
+            f'token_preflight_total{{result="passed",reason=""}} {stats["passed"]}',
+        ]
+        for reason, count in stats['rejections'].items():
+            lines.append(f'token_preflight_total{{result="rejected",reason="{reason}"}} {count}')
+        return '\n'.join(lines) + '\n'
@@ -0,0 +1,126 @@
+import time
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import padding
+from singleflight import SingleFlight
+
+# Vault Transit의 기본 PSS 서명 설정과 동일 (SHA-256, MGF1, salt 길이 자동)
+PSS_PADDING = padding.PSS(mgf=padding.MGF1(hashes.SHA256()), salt_length=padding.PSS.AUTO)
+
+
+class TransitPublicKeyCache:
+    """
+    Vault Transit 공개키 캐시 (키 버전별)
+
+    - transit/keys/<name> 조회 결과의 공개키(PEM)를 버전별로 파싱해 보관
+    - 최신 키 버전도 함께 보관하여 서명 시 JWT 헤더의 kid로 사용
+    - 서명 검증은 로컬에서 수행하므로 검증 경로에 Vault 호출이 없음
+    - 캐시에 없는 버전이 요청되면 키 목록을 다시 읽되, 위조 토큰이 임의 버전으로
+      Vault를 두드리지 못하도록 재조회 간격을 제한
+    - 동시에 들어온 재조회는 singleflight로 합쳐 Vault 호출을 한 번만 수행
+    - Vault 장애로 재조회에 실패하면 마지막으로 받은 공개키를 max_stale(초)까지 계속 사용
+    """
+
+    def __init__(self, fetch_keys, ttl=300, min_refresh_interval=5, max_stale=900, stale_retry_interval=5):
+        # fetch_keys() -> (최신 버전(int), {버전(int): 공개키 PEM(str)})
+        self._fetch_keys = fetch_keys
+        self.ttl = ttl
+        self.min_refresh_interval = min_refresh_interval
+        self.max_stale = max_stale
+        self.stale_retry_interval = stale_retry_interval
+        self.stale_fallbacks = 0
+        self.last_error = None
+        self._keys = {}
+        self._latest_version = None
+        self._expires_at = 0.0
+        self._last_refresh = 0.0
+        self._flight = SingleFlight('transit_public_keys')
+        self.fetches = 0
+        self._retirement_listeners = []
+
+    def add_retirement_listener(self, callback):
+        """
+        키 버전이 목록에서 빠졌을 때(min_decryption_version 상향 등) callback(빠진 버전 집합) 호출
+        새 버전이 추가되는 회전만으로는 호출하지 않음 (이전 버전으로 서명된 토큰은 계속 유효)
+        """
+        self._retirement_listeners.append(callback)
+
+    def get(self, version):
+        """키 버전의 공개키 객체 반환 (없으면 None)"""
+        now = time.monotonic()
+        if now >= self._expires_at:
+            self.refresh()
+        key = self._keys.get(version)
+        if key is None and time.monotonic() - self._last_refresh >= self.min_refresh_interval:
+            # 키 회전 직후 새 버전일 수 있으므로 한 번 더 조회
+            self.refresh()
+            key = self._keys.get(version)
+        return key
+
+    def refresh(self):
+        """Vault에서 공개키 목록을 다시 읽어 캐시 교체"""
+        self._flight.do('keys', self._refresh_once)
+
+    def _refresh_once(self):
+        now = time.monotonic()
+        if now < self._expires_at and now - self._last_refresh < self.min_refresh_interval:
+            return
+        try:
+            latest_version, pems = self._fetch_keys()
+        except Exception as e:
+            if not self._keys or now - self._last_refresh > self.max_stale:
+                raise
+            # Vault 장애: 마지막으로 받은 공개키를 잠시 더 사용하고 나중에 다시 시도
+            self.last_error = str(e)
+            self.stale_fallbacks += 1
+            self._expires_at = now + min(self.stale_retry_interval, self.ttl)
+            return
+        self.last_error = None
+        self.fetches += 1
+        keys = {}
+        for version, pem in pems.items():
+            # 이미 파싱한 버전은 재사용 (PEM 파싱 비용 절약)
+            keys[version] = self._keys.get(version) or serialization.load_pem_public_key(pem.encode('utf-8'))
+        retired = self._keys.keys() - keys.keys()
+        self._keys = keys
+        self._latest_version = latest_version
+        self._last_refresh = now
+        self._expires_at = now + self.ttl
+        if retired:
+            for callback in self._retirement_listeners:
+                callback(retired)
+
+    def latest_version(self):
+        """서명에 사용할 최신 키 버전"""
+        if time.monotonic() >= self._expires_at or self._latest_version is None:
+            self.refresh()
+        return self._latest_version
+
+    def verify(self, version, signing_input, signature):
+        """로컬에서 RSA-PSS 서명 검증"""
+        public_key = self.get(version)
+        if public_key is None:
+            return False
+        try:
+            public_key.verify(signature, signing_input, PSS_PADDING, hashes.SHA256())
+            return True
+        except InvalidSignature:
+            return False
+
+    def versions(self):
+        """캐시된 키 버전 목록"""
+        return sorted(self._keys)
+
+    def stats(self):
+        """공개키 조회 / 합쳐진 조회 수"""
+        return {
+            'versions': self.versions(),
+            'latest_version': self._latest_version,
+            'fetches': self.fetches,
+            'coalesced': self._flight.stats()['coalesced'],
+            'stale_fallbacks': self.stale_fallbacks,
+            'stale_seconds': time.monotonic() - self._last_refresh if self._keys else None,
+            'max_stale': self.max_stale,
+            'last_error': self.last_error,
+            'ttl': self.ttl,
+        }
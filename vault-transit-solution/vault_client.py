@@ -0,0 +1,151 @@
+import os
+import threading
+import hvac
+import hvac.exceptions
+import requests
+from hvac.adapters import JSONAdapter
+from requests.adapters import HTTPAdapter
+from circuit_breaker import CircuitBreaker
+
+
+def is_vault_outage(error):
+    """Vault가 응답하지 못한 경우만 회로 실패로 셈 (권한/경로 오류는 Vault가 정상 응답한 것)"""
+    return isinstance(error, (
+        requests.exceptions.ConnectionError,
+        requests.exceptions.Timeout,
+        hvac.exceptions.VaultDown,
+        hvac.exceptions.InternalServerError,
+        hvac.exceptions.BadGateway,
+    ))
+
+
+class CircuitBreakerAdapter(JSONAdapter):
+    """모든 Vault HTTP 호출을 서킷 브레이커를 거쳐 보내는 hvac 어댑터"""
+
+    def __init__(self, *args, breaker=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.breaker = breaker
+
+    def request(self, *args, **kwargs):
+        return self.breaker.call(super().request, *args, **kwargs)
+
+
+class VaultClientManager:
+    """
+    프로세스당 하나의 hvac 클라이언트를 재사용
+
+    - requests 세션의 HTTP 커넥션 풀을 공유하여 keep-alive로 TCP/TLS 핸드셰이크 재사용
+    - 모든 호출에 짧은 연결/응답 timeout 적용
+    - 서킷 브레이커: Vault 장애가 이어지면 타임아웃을 기다리지 않고 즉시 실패 (CircuitOpenError)
+    - 백그라운드 스레드가 토큰 TTL이 끝나기 전에 토큰을 갱신 (TTL이 없는 토큰은 갱신하지 않음)
+    - fork 이후 자식 프로세스에서는 부모의 소켓을 공유하지 않도록 클라이언트를 새로 생성
+    """
+
+    def __init__(self, url, token, timeout=5, pool_maxsize=20, renew_fraction=2 / 3, retry_interval=5,
+                 connect_timeout=None, failure_threshold=5, reset_timeout=10):
+        self.url = url
+        self.token = token
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.breaker = CircuitBreaker(
+            'vault',
+            failure_threshold=failure_threshold,
+            reset_timeout=reset_timeout,
+            is_failure=is_vault_outage
+        )
+        self.pool_maxsize = pool_maxsize
+        self.renew_fraction = renew_fraction
+        self.retry_interval = retry_interval
+        self._lock = threading.Lock()
+        self._client = None
+        self._pid = None
+        self._stop = threading.Event()
+        self._renew_thread = None
+        self.renewals = 0
+        self.renewal_failures = 0
+        self.last_renewal_error = None
+        self.token_ttl = None
+
+    def get_client(self):
+        """공유 hvac 클라이언트 반환 (최초 호출 시 생성 및 토큰 갱신 스레드 시작)"""
+        client = self._client
+        if client is not None and self._pid == os.getpid():
+            return client
+        with self._lock:
+            if self._client is None or self._pid != os.getpid():
+                self._client = self._build_client()
+                self._pid = os.getpid()
+                self._start_renewal()
+            return self._client
+
+    def _build_client(self):
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_maxsize, pool_block=False)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        # requests의 (연결, 응답) timeout 튜플: 연결 실패는 응답 대기보다 훨씬 빨리 판단
+        timeout = (self.connect_timeout, self.timeout) if self.connect_timeout else self.timeout
+        return hvac.Client(
+            url=self.url,
+            token=self.token,
+            timeout=timeout,
+            session=session,
+            adapter=CircuitBreakerAdapter,
+            breaker=self.breaker
+        )
+
+    def warm(self):
+        """연결을 미리 열고 토큰 정보를 확인 (요청 처리 전에 호출)"""
+        client = self.get_client()
+        info = client.auth.token.lookup_self()
+        self.token_ttl = info['data'].get('ttl')
+        return info
+
+    def _start_renewal(self):
+        # fork 이후에는 부모의 스레드가 존재하지 않으므로 프로세스마다 새로 시작
+        self._stop = threading.Event()
+        self._renew_thread = threading.Thread(target=self._renew_loop, name='vault-token-renewal', daemon=True)
+        self._renew_thread.start()
+
+    def _renew_loop(self):
+        stop = self._stop
+        while not stop.is_set():
+            try:
+                data = self._client.auth.token.lookup_self()['data']
+            except Exception as e:
+                self.last_renewal_error = str(e)
+                stop.wait(self.retry_interval)
+                continue
+
+            ttl = data.get('ttl') or 0
+            self.token_ttl = ttl
+            if ttl <= 0 or not data.get('renewable'):
+                # root 토큰처럼 만료되지 않거나 갱신할 수 없는 토큰
+                return
+
+            if stop.wait(max(ttl * self.renew_fraction, 1)):
+                return
+            try:
+                self._client.auth.token.renew_self()
+                self.renewals += 1
+                self.last_renewal_error = None
+            except Exception as e:
+                self.renewal_failures += 1
+                self.last_renewal_error = str(e)
+                print(f"Vault 토큰 갱신 실패: {e}")
+                stop.wait(self.retry_interval)
+
+    def stop(self):
+        """토큰 갱신 스레드 종료"""
+        self._stop.set()
+
+    def stats(self):
+        """토큰 갱신 상태"""
+        return {
+            'token_ttl': self.token_ttl,
+            'renewals': self.renewals,
+            'renewal_failures': self.renewal_failures,
+            'last_renewal_error': self.last_renewal_error,
+            'renewal_thread_alive': bool(self._renew_thread and self._renew_thread.is_alive()),
+            'circuit_breaker': self.breaker.stats(),
+        }
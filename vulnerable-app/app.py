@@ -1,12 +1,27 @@
-from flask import Flask, request, jsonify, render_template, session, redirect, url_for
-from auth import hash_password, verify_password, create_token, verify_token
-from database import get_user_by_username, get_user_by_id
-from config import Config
+from flask import Flask, Response, request, jsonify, render_template, session, redirect, url_for, stream_with_context
+from auth import hash_password, verify_password, upgrade_password_hash, hash_upgrade_error, password_hasher, create_token, verify_token, token_cache
+from database import get_user_by_id, get_user_by_username_with_hash, list_users_page, iter_users, store as db_store, user_lookups, user_cache
+from config import Config, private_key_file, public_key_file
+import itertools
 import jwt
+import request_timing
+from password_hasher import PasswordHasherBusy
+from warmup import Warmup
 
 app = Flask(__name__)
 app.secret_key = Config.SECRET_KEY
 
+# 요청 단계별(db, vault, crypto, template) 처리 시간 측정: Server-Timing 헤더 + /metrics
+request_metrics = request_timing.init_app(app, server_timing_header=Config.SERVER_TIMING_HEADER)
+
+# 준비 단계: 키 파일은 fork 전에 한 번 로드하여 워커가 공유, DB 연결은 워커마다 준비
+warmup = Warmup(
+    preload_steps=[('private_key', private_key_file.get_key), ('public_key', public_key_file.get_key)],
+    worker_steps=[('db_pool', db_store.warm), ('password_hasher', password_hasher.warm)],
+    attempts=Config.WARMUP_ATTEMPTS,
+    retry_interval=Config.WARMUP_RETRY_INTERVAL
+)
+
 @app.route('/')
 def index():
     """메인 페이지"""
@@ -22,53 +37,41 @@ def login():
         if not username or not password:
             return render_template('login.html', error='사용자명과 비밀번호를 입력하세요.')
         
-        # 데이터베이스에서 사용자 조회
-        user = get_user_by_username(username)
+        # 데이터베이스에서 사용자와 비밀번호 해시를 한 번에 조회
+        result = get_user_by_username_with_hash(username)
         
-        if not user:
+        if not result:
             return render_template('login.html', error='사용자를 찾을 수 없습니다.')
         
         # 비밀번호 검증
-        # 실제로는 데이터베이스에서 password_hash를 가져와야 하지만,
-        # 여기서는 간단히 사용자 정보만 반환하는 것으로 가정
-        # 실제 검증은 데이터베이스 쿼리를 수정해야 함
-        user_with_hash = get_user_by_username_with_hash(username)
-        if not user_with_hash or not verify_password(password, user_with_hash['password_hash']):
+        user, password_hash = result
+        try:
+            password_ok = verify_password(password, password_hash)
+        except PasswordHasherBusy:
+            return render_template('login.html', error='로그인 요청이 많습니다. 잠시 후 다시 시도하세요.'), 503
+        if not password_ok:
             return render_template('login.html', error='비밀번호가 올바르지 않습니다.')
         
+        # 이전 SHA256 해시(또는 이전 KDF 설정)면 현재 설정으로 교체
+        upgrade_password_hash(user.id, password, password_hash)
+        
         # JWT 토큰 생성 (내부적으로만 사용되는 API)
         token = create_token(
-            user_id=user['id'],
-            username=user['username'],
-            email=user['email']
+            user_id=user.id,
+            username=user.username,
+            email=user.email
         )
         
         # 세션에 저장
         session['token'] = token
-        session['user_id'] = user['id']
-        session['username'] = user['username']
+        session['user_id'] = user.id
+        session['username'] = user.username
         
         # 사용자 정보 페이지로 리다이렉트
-        return redirect(url_for('user_info', user_id=user['id']))
+        return redirect(url_for('user_info', user_id=user.id))
     
     return render_template('login.html')
 
-def get_user_by_username_with_hash(username):
-    """비밀번호 해시 포함 사용자 조회"""
-    from database import get_db_connection
-    from psycopg2.extras import RealDictCursor
-    
-    conn = get_db_connection()
-    try:
-        with conn.cursor(cursor_factory=RealDictCursor) as cur:
-            cur.execute(
-                "SELECT id, username, password_hash, email, phone_num, address FROM users WHERE username = %s",
-                (username,)
-            )
-            return cur.fetchone()
-    finally:
-        conn.close()
-
 @app.route('/user/<int:user_id>')
 def user_info(user_id):
     """
@@ -142,34 +145,63 @@ def api_user_info(user_id):
         return jsonify({'error': '사용자를 찾을 수 없습니다.'}), 404
     
     return jsonify({
-        'id': user['id'],
-        'username': user['username'],
-        'email': user['email'],
-        'phone_num': user['phone_num'],
-        'address': user['address'],
+        'id': user.id,
+        'username': user.username,
+        'email': user.email,
+        'phone_num': user.phone_num,
+        'address': user.address,
         'token_info': decoded_token
     })
 
 @app.route('/users', methods=['GET'])
 def list_users():
-    """모든 사용자 목록 (공격자가 타겟 선택용)"""
-    from database import get_db_connection
-    from psycopg2.extras import RealDictCursor
+    """
+    사용자 목록 (공격자가 타겟 선택용)
+    - ?limit=N[&after_id=M]: id > after_id인 사용자 N명 (키셋 페이지네이션)
+      다음 페이지가 있으면 X-Next-After-Id / Link 헤더로 다음 커서 전달
+    - limit 없음: after_id 이후 전체 목록을 서버 측 커서로 읽으며 JSON 배열로 스트리밍
+    응답 본문은 두 경우 모두 [{"id", "username", "email"}, ...] 배열
+    """
+    after_id = request.args.get('after_id', type=int)
+    limit = request.args.get('limit', type=int)
+    if 'after_id' not in request.args:
+        after_id = 0
+    elif after_id is None or after_id < 0:
+        return jsonify({'error': 'after_id는 0 이상의 정수여야 합니다.'}), 400
+    if 'limit' in request.args and (limit is None or not 1 <= limit <= Config.USERS_PAGE_MAX):
+        return jsonify({'error': f'limit는 1~{Config.USERS_PAGE_MAX} 사이의 정수여야 합니다.'}), 400
     
-    conn = get_db_connection()
-    try:
-        with conn.cursor(cursor_factory=RealDictCursor) as cur:
-            cur.execute(
-                "SELECT id, username, email FROM users ORDER BY id"
-            )
-            users = cur.fetchall()
-            return jsonify([{
-                'id': u['id'],
-                'username': u['username'],
-                'email': u['email']
-            } for u in users])
-    finally:
-        conn.close()
+    if limit is not None:
+        rows = list_users_page(after_id, limit)
+        response = jsonify([{'id': row[0], 'username': row[1], 'email': row[2]} for row in rows])
+        if len(rows) == limit:
+            next_after_id = rows[-1][0]
+            response.headers['X-Next-After-Id'] = str(next_after_id)
+            response.headers['Link'] = f'<{url_for("list_users", after_id=next_after_id, limit=limit)}>; rel="next"'
+        return response
+    
+    # 첫 행을 미리 읽어 쿼리 실패는 스트리밍 시작 전에 500으로 응답
+    rows = iter_users(after_id, Config.USERS_STREAM_BATCH)
+    first_row = next(rows, None)
+    
+    def generate():
+        yield '['
+        if first_row is None:
+            yield ']'
+            return
+        first = True
+        chunk = []
+        for row in itertools.chain((first_row,), rows):
+            chunk.append(app.json.dumps({'id': row[0], 'username': row[1], 'email': row[2]}))
+            if len(chunk) >= Config.USERS_STREAM_BATCH:
+                yield ('' if first else ',') + ','.join(chunk)
+                first = False
+                chunk = []
+        if chunk:
+            yield ('' if first else ',') + ','.join(chunk)
+        yield ']'
+    
+    return Response(stream_with_context(generate()), mimetype='application/json')
 
 @app.route('/attack-demo')
 def attack_demo():
@@ -199,8 +231,8 @@ def generate_fake_token():
         now = datetime.utcnow()
         payload = {
             'user_id': user_id,
-            'username': user['username'],
-            'email': user['email'],
+            'username': user.username,
+            'email': user.email,
             'iat': int(now.timestamp()),
             'exp': int((now + timedelta(hours=24)).timestamp()),
             'iss': 'vulnerable-app'
@@ -214,9 +246,9 @@ def generate_fake_token():
             'token': token,
             'payload': payload,
             'user': {
-                'id': user['id'],
-                'username': user['username'],
-                'email': user['email']
+                'id': user.id,
+                'username': user.username,
+                'email': user.email
             }
         })
     except Exception as e:
@@ -256,11 +288,11 @@ def test_token():
         return jsonify({
             'success': True,
             'user': {
-                'id': user['id'],
-                'username': user['username'],
-                'email': user['email'],
-                'phone_num': user['phone_num'],
-                'address': user['address']
+                'id': user.id,
+                'username': user.username,
+                'email': user.email,
+                'phone_num': user.phone_num,
+                'address': user.address
             },
             'token_info': decoded_token,
             'message': '공격 성공! 유출된 키로 생성한 토큰으로 다른 사용자 정보에 접근했습니다.'
@@ -302,6 +334,47 @@ def resign_token():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/key-cache/stats', methods=['GET'])
+def key_cache_stats():
+    """키 파일 캐시 통계 (stat 확인/재로드 횟수)"""
+    return jsonify({
+        'private_key': private_key_file.stats(),
+        'public_key': public_key_file.stats(),
+    })
+
+@app.route('/api/token-cache/stats', methods=['GET'])
+def token_cache_stats():
+    """검증된 토큰 캐시 통계 (크기, 적중률)"""
+    return jsonify(token_cache.stats())
+
+@app.route('/api/singleflight/stats', methods=['GET'])
+def singleflight_stats():
+    """동시 조회 합치기 통계 (실행 / 합쳐진 호출 수)"""
+    return jsonify({'get_user_by_id': user_lookups.stats()})
+
+@app.route('/api/user-cache/stats', methods=['GET'])
+def user_cache_stats():
+    """사용자 레코드 캐시 통계 (적중률, 무효화 횟수)"""
+    return jsonify(user_cache.stats())
+
+@app.route('/api/password-hasher/stats', methods=['GET'])
+def password_hasher_stats():
+    """비밀번호 해시 통계 (KDF 설정, 대기 중 작업 수, 대기열 초과 거절 수, 해시 업그레이드 중단 사유)"""
+    return jsonify({**password_hasher.stats(), 'upgrade_error': hash_upgrade_error()})
+
+@app.route('/api/db-pool/stats', methods=['GET'])
+def db_pool_stats():
+    """DB 커넥션 풀 통계 (대기 시간, 포화도, memory:// 저장소면 사용자 수 / 호출 수)"""
+    return jsonify(db_store.stats())
+
+@app.route('/readyz', methods=['GET'])
+def readiness():
+    """준비 상태 (이 워커의 DB 커넥션 풀과 비밀번호 해시 프로세스 풀 준비가 끝나야 200, 그 전에는 503)"""
+    stats = warmup.stats()
+    return jsonify(stats), 200 if stats['ready'] else 503
+
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=5000, debug=True)
+    # 개발용 단일 프로세스 서버 (운영은 gunicorn app:app, gunicorn.conf.py 참고)
+    warmup.warm_worker()
+    app.run(host='0.0.0.0', port=5000, debug=Config.DEBUG)
 
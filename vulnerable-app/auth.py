@@ -1,15 +1,72 @@
-import hashlib
 import jwt
 from datetime import datetime, timedelta
-from config import Config
+from token_cache import VerifiedTokenCache
+from config import Config, public_key_file
+from password_hasher import PasswordHasher
+from database import update_password_hash
+from request_timing import stage
+
+# 검증에 성공한 토큰 캐시 (같은 세션 토큰의 반복 검증 생략)
+token_cache = VerifiedTokenCache(maxsize=Config.TOKEN_CACHE_SIZE, max_ttl=Config.TOKEN_CACHE_MAX_TTL)
+public_key_file.add_change_listener(token_cache.clear)
+
+# 비밀번호 해시 (KDF는 별도 프로세스 풀에서 실행, 대기열이 가득 차면 PasswordHasherBusy)
+password_hasher = PasswordHasher(
+    algorithm=Config.PASSWORD_HASH_ALGORITHM,
+    scrypt_n=Config.PASSWORD_HASH_SCRYPT_N,
+    scrypt_r=Config.PASSWORD_HASH_SCRYPT_R,
+    scrypt_p=Config.PASSWORD_HASH_SCRYPT_P,
+    pbkdf2_iterations=Config.PASSWORD_HASH_PBKDF2_ITERATIONS,
+    workers=Config.PASSWORD_HASH_WORKERS,
+    max_queue=Config.PASSWORD_HASH_MAX_QUEUE,
+    queue_timeout=Config.PASSWORD_HASH_QUEUE_TIMEOUT
+)
 
 def hash_password(password):
-    """비밀번호를 SHA256으로 해시"""
-    return hashlib.sha256(password.encode('utf-8')).hexdigest()
+    """비밀번호를 현재 KDF 설정(scrypt / PBKDF2)으로 해시"""
+    with stage('crypto'):
+        return password_hasher.hash(password)
 
 def verify_password(password, password_hash):
-    """비밀번호 검증"""
-    return hash_password(password) == password_hash
+    """비밀번호 검증 (이전 SHA256 해시도 검증)"""
+    with stage('crypto'):
+        return password_hasher.verify(password, password_hash)
+
+# 새 해시를 저장할 수 없는 DB 오류(SQLSTATE 22xxx, 예: 이전 스키마의 VARCHAR(64) 열)로 업그레이드가 실패하면
+# 이 프로세스에서는 업그레이드를 중단 (로그인마다 KDF를 한 번 더 계산하고 같은 오류를 반복하지 않게 함)
+_hash_upgrade_error = None
+
+def hash_upgrade_error():
+    """업그레이드를 중단시킨 오류 메시지 (중단되지 않았으면 None)"""
+    return _hash_upgrade_error
+
+def needs_password_upgrade(password_hash):
+    return _hash_upgrade_error is None and password_hasher.needs_rehash(password_hash)
+
+def record_upgrade_failure(user_id, error):
+    """업그레이드 실패 기록 (데이터 오류면 이후 업그레이드 중단, 그 외에는 다음 로그인 때 다시 시도)"""
+    global _hash_upgrade_error
+    code = getattr(error, 'pgcode', None) or getattr(error, 'sqlstate', None)
+    if isinstance(code, str) and code.startswith('22'):
+        _hash_upgrade_error = str(error).strip()
+        print(f"비밀번호 해시 업그레이드 중단: 새 해시를 저장할 수 없습니다 ({_hash_upgrade_error}). "
+              f"scripts/migrations/001_widen_password_hash.sql 적용 후 재시작하세요")
+    else:
+        print(f"비밀번호 해시 업그레이드 실패 (user_id={user_id}): {error}")
+
+def upgrade_password_hash(user_id, password, password_hash):
+    """
+    로그인 성공 후 호출: 이전 SHA256이거나 KDF 설정이 바뀐 해시면 현재 설정으로 다시 해시하여 저장
+    실패해도 로그인은 계속 진행 (일시적인 오류면 다음 로그인 때 다시 시도)
+    """
+    if not needs_password_upgrade(password_hash):
+        return False
+    try:
+        update_password_hash(user_id, hash_password(password))
+    except Exception as e:
+        record_upgrade_failure(user_id, e)
+        return False
+    return True
 
 def create_token(user_id, username, email):
     """
@@ -27,8 +84,9 @@ def create_token(user_id, username, email):
     }
     
     # RSA 개인키로 서명
-    private_key = Config.load_private_key()
-    token = jwt.encode(payload, private_key, algorithm='RS256')
+    with stage('crypto'):
+        private_key = Config.load_private_key()
+        token = jwt.encode(payload, private_key, algorithm='RS256')
     return token
 
 def verify_token(token):
@@ -39,10 +97,17 @@ def verify_token(token):
     핵심 문제: 유출된 개인키로 서명한 토큰도 정상적으로 검증을 통과합니다.
     부가 취약점: 검증 실패 시에도 서명 검증 없이 디코딩을 시도합니다.
     """
+    # 이미 검증된 토큰이면 서명 검증 생략
+    cached = token_cache.get(token)
+    if cached is not None:
+        return cached
+    
     try:
         # RSA 공개키로 정상 검증
-        public_key = Config.load_public_key()
-        decoded = jwt.decode(token, public_key, algorithms=['RS256'])
+        with stage('crypto'):
+            public_key = Config.load_public_key()
+            decoded = jwt.decode(token, public_key, algorithms=['RS256'])
+        token_cache.put(token, decoded)
         return decoded
     except jwt.ExpiredSignatureError:
         # 만료된 토큰
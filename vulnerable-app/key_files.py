@@ -0,0 +1,103 @@
+import os
+import threading
+import time
+from collections import namedtuple
+
+# 파일 식별 정보 (파일 교체 시 inode, 덮어쓰기 시 mtime/크기가 바뀜)
+FileSignature = namedtuple('FileSignature', ['inode', 'mtime_ns', 'size'])
+
+# 읽어 둔 키 파일 스냅샷 (통째로 교체하여 원자적으로 스왑)
+KeyFileSnapshot = namedtuple('KeyFileSnapshot', ['signature', 'pem', 'key'])
+
+
+def _file_signature(path):
+    st = os.stat(path)
+    return FileSignature(st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+class KeyFileCache:
+    """
+    PEM 키 파일 인메모리 캐시
+
+    - 파일을 한 번 읽고 파싱한 키 객체와 PEM 문자열을 메모리에 보관
+    - check_interval(초)마다 한 번만 stat()으로 inode/mtime/크기를 확인하고,
+      바뀐 경우에만 다시 읽어 파싱 (파일 교체 방식의 키 회전 지원)
+    - 새 스냅샷은 (스냅샷, 다음 확인 시각) 튜플 하나로 교체되므로 읽는 쪽은 락이 필요 없음
+    """
+
+    def __init__(self, path, parse, check_interval=5):
+        # parse(pem_bytes) -> 키 객체
+        self.path = path
+        self._parse = parse
+        self.check_interval = check_interval
+        self._entry = None
+        self._lock = threading.Lock()
+        self._stat_checks = 0
+        self._reloads = 0
+        self._loaded_at = None
+        self._change_listeners = []
+
+    def add_change_listener(self, callback):
+        """키 파일이 바뀌어 다시 로드했을 때 호출할 콜백 등록 (예: 검증 캐시 무효화)"""
+        self._change_listeners.append(callback)
+
+    def get_key(self):
+        """파싱된 키 객체 반환"""
+        return self._get_snapshot().key
+
+    def get_pem(self):
+        """PEM 문자열 반환"""
+        return self._get_snapshot().pem
+
+    def invalidate(self):
+        """다음 조회 시 파일을 다시 읽도록 캐시 무효화"""
+        self._entry = None
+
+    def _get_snapshot(self):
+        entry = self._entry
+        if entry is not None and time.monotonic() < entry[1]:
+            return entry[0]
+        return self._refresh()
+
+    def _refresh(self):
+        with self._lock:
+            # 락을 기다리는 동안 다른 스레드가 이미 확인했을 수 있음
+            entry = self._entry
+            if entry is not None and time.monotonic() < entry[1]:
+                return entry[0]
+
+            signature = _file_signature(self.path)
+            self._stat_checks += 1
+            changed = False
+            if entry is not None and entry[0].signature == signature:
+                snapshot = entry[0]
+            else:
+                snapshot = self._load(signature)
+                changed = entry is not None and snapshot.pem != entry[0].pem
+
+            self._entry = (snapshot, time.monotonic() + self.check_interval)
+        if changed:
+            for callback in self._change_listeners:
+                callback()
+        return snapshot
+
+    def _load(self, signature):
+        # 읽기 전에 얻은 stat을 기록하므로, 읽는 도중 파일이 교체되어도 다음 확인에서 다시 읽음
+        with open(self.path, 'rb') as f:
+            data = f.read()
+        snapshot = KeyFileSnapshot(signature, data.decode('utf-8'), self._parse(data))
+        self._reloads += 1
+        self._loaded_at = time.time()
+        return snapshot
+
+    def stats(self):
+        """stat 확인 / 재로드 횟수"""
+        entry = self._entry
+        return {
+            'path': self.path,
+            'stat_checks': self._stat_checks,
+            'reloads': self._reloads,
+            'loaded_at': self._loaded_at,
+            'signature': entry[0].signature._asdict() if entry else None,
+            'check_interval': self.check_interval,
+        }
@@ -0,0 +1,181 @@
+import base64
+import hashlib
+import hmac
+import multiprocessing
+import os
+import re
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+SALT_BYTES = 16
+KEY_BYTES = 32
+# 이전 버전의 솔트 없는 SHA256 hex 해시 (로그인 성공 시 현재 KDF로 업그레이드)
+_LEGACY_SHA256 = re.compile(r'^[0-9a-f]{64}$')
+
+
+class PasswordHasherBusy(Exception):
+    """해시 작업 대기열이 가득 차 제한 시간 내에 작업을 넣지 못함"""
+
+
+def _b64encode(data):
+    return base64.urlsafe_b64encode(data).rstrip(b'=').decode('ascii')
+
+
+def _b64decode(text):
+    return base64.urlsafe_b64decode(text + '=' * (-len(text) % 4))
+
+
+def _derive(algorithm, params, password, salt):
+    """KDF 실행 (프로세스 풀의 자식 프로세스에서 호출되므로 모듈 수준 함수)"""
+    if algorithm == 'scrypt':
+        n, r, p = params['n'], params['r'], params['p']
+        # OpenSSL이 요구하는 메모리(128 * r * (n + p + 2))보다 약간 크게 허용
+        return hashlib.scrypt(
+            password.encode('utf-8'), salt=salt, n=n, r=r, p=p,
+            maxmem=128 * r * (n + p + 2) + 1024 * 1024, dklen=KEY_BYTES
+        )
+    if algorithm == 'pbkdf2_sha256':
+        return hashlib.pbkdf2_hmac('sha256', password.encode('utf-8'), salt, params['i'], dklen=KEY_BYTES)
+    raise ValueError(f"지원하지 않는 해시 알고리즘: {algorithm}")
+
+
+def _parse(encoded):
+    """'알고리즘$k=v,...$솔트$해시' -> (algorithm, params, salt, key), 형식이 다르면 None"""
+    try:
+        algorithm, raw_params, salt, key = encoded.split('$')
+        params = {name: int(value) for name, value in (item.split('=') for item in raw_params.split(','))}
+        return algorithm, params, _b64decode(salt), _b64decode(key)
+    except (ValueError, AttributeError):
+        return None
+
+
+class PasswordHasher:
+    """
+    비밀번호 해시 (scrypt / PBKDF2-SHA256)
+
+    - 저장 형식: 'scrypt$n=16384,r=8,p=1$<솔트>$<해시>', 'pbkdf2_sha256$i=600000$<솔트>$<해시>'
+      파라미터가 해시에 들어 있으므로 설정을 바꿔도 기존 해시는 그대로 검증되고, needs_rehash()로 교체 대상 확인
+    - 64자 hex는 이전 버전의 솔트 없는 SHA256 해시로 검증 (needs_rehash()는 항상 True)
+    - workers > 0이면 KDF를 별도 프로세스 풀에서 실행하여 요청 스레드가 GIL을 잡고 있지 않게 함
+      실행 중 + 대기 작업이 workers + max_queue개를 넘으면 queue_timeout초 동안 기다린 뒤 PasswordHasherBusy
+    - 프로세스 풀은 첫 사용 시 생성하며, fork 이후 자식 프로세스는 부모의 풀을 버리고 새로 만듦 (pre-fork 서버 대응)
+    """
+
+    def __init__(self, algorithm='scrypt', scrypt_n=16384, scrypt_r=8, scrypt_p=1, pbkdf2_iterations=600000,
+                 workers=0, max_queue=32, queue_timeout=1.0):
+        if algorithm == 'scrypt':
+            self.params = {'n': scrypt_n, 'r': scrypt_r, 'p': scrypt_p}
+        elif algorithm == 'pbkdf2_sha256':
+            self.params = {'i': pbkdf2_iterations}
+        else:
+            raise ValueError(f"지원하지 않는 해시 알고리즘: {algorithm}")
+        self.algorithm = algorithm
+        self.workers = workers
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._reset_state()
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._reset_state)
+
+    def _reset_state(self):
+        self._lock = threading.Lock()
+        self._executor = None
+        self._slots = threading.BoundedSemaphore(max(self.workers, 1) + self.max_queue)
+        self._pending = 0
+        self._peak_pending = 0
+        self._completed = 0
+        self._rejected = 0
+        self._total_seconds = 0.0
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                # fork: 자식은 KDF만 실행하므로 __main__을 다시 import하는 spawn 대신 사용
+                # (fork 컨텍스트는 첫 작업 때 workers개를 한꺼번에 띄우므로 요청 스레드가 생기기 전 warm()에서 시작)
+                context = 'fork' if 'fork' in multiprocessing.get_all_start_methods() else None
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context(context)
+                )
+            return self._executor
+
+    def _discard_executor(self, executor):
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, algorithm, params, password, salt):
+        if self.workers <= 0:
+            return _derive(algorithm, params, password, salt)
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            with self._lock:
+                self._rejected += 1
+            raise PasswordHasherBusy(f"비밀번호 해시 대기열이 가득 찼습니다 ({self.workers + self.max_queue}개)")
+        started = time.perf_counter()
+        with self._lock:
+            self._pending += 1
+            self._peak_pending = max(self._peak_pending, self._pending)
+        try:
+            for attempt in range(2):
+                executor = self._get_executor()
+                try:
+                    return executor.submit(_derive, algorithm, params, password, salt).result()
+                except BrokenProcessPool:
+                    # 자식 프로세스가 죽은 경우(OOM 등) 풀을 새로 만들어 한 번 더 시도
+                    self._discard_executor(executor)
+                    if attempt:
+                        raise
+        finally:
+            with self._lock:
+                self._pending -= 1
+                self._completed += 1
+                self._total_seconds += time.perf_counter() - started
+            self._slots.release()
+
+    def warm(self):
+        """워커 프로세스를 미리 띄움 (첫 로그인이 프로세스 시작 시간을 기다리지 않게 함)"""
+        if self.workers > 0:
+            executor = self._get_executor()
+            for future in [executor.submit(int) for _ in range(self.workers)]:
+                future.result()
+
+    def hash(self, password):
+        """현재 설정으로 새 솔트를 만들어 해시"""
+        salt = os.urandom(SALT_BYTES)
+        key = self._run(self.algorithm, self.params, password, salt)
+        encoded_params = ','.join(f'{name}={value}' for name, value in self.params.items())
+        return f'{self.algorithm}${encoded_params}${_b64encode(salt)}${_b64encode(key)}'
+
+    def verify(self, password, encoded):
+        """저장된 해시(KDF 또는 이전 SHA256)와 비밀번호 비교"""
+        if _LEGACY_SHA256.match(encoded or ''):
+            digest = hashlib.sha256(password.encode('utf-8')).hexdigest()
+            return hmac.compare_digest(digest, encoded)
+        parsed = _parse(encoded or '')
+        if parsed is None or parsed[0] not in ('scrypt', 'pbkdf2_sha256'):
+            return False
+        algorithm, params, salt, key = parsed
+        return hmac.compare_digest(self._run(algorithm, params, password, salt), key)
+
+    def needs_rehash(self, encoded):
+        """이전 SHA256이거나 현재 설정과 알고리즘 / 파라미터가 다르면 True"""
+        parsed = _parse(encoded or '')
+        return parsed is None or parsed[0] != self.algorithm or parsed[1] != self.params
+
+    def stats(self):
+        """설정, 대기 중 작업 수, 대기열 초과로 거절한 횟수, 평균 처리 시간"""
+        with self._lock:
+            return {
+                'algorithm': self.algorithm,
+                'params': dict(self.params),
+                'workers': self.workers,
+                'max_queue': self.max_queue,
+                'pending': self._pending,
+                'peak_pending': self._peak_pending,
+                'completed': self._completed,
+                'rejected': self._rejected,
+                'avg_ms': round(self._total_seconds / self._completed * 1000, 3) if self._completed else 0.0,
+            }
@@ -0,0 +1,205 @@
+import bisect
+import contextvars
+import functools
+import threading
+import time
+from contextlib import contextmanager
+
+from flask import Response, g, request, template_rendered, before_render_template
+
+# 요청 처리 단계 (Server-Timing 항목 / 히스토그램 stage 라벨)
+STAGES = ('db', 'vault', 'crypto', 'template')
+
+# 히스토그램 버킷 상한 (초)
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+_current = contextvars.ContextVar('request_timing', default=None)
+
+
+class StageTimer:
+    """
+    요청 하나의 단계별 소요 시간 누적
+
+    단계가 중첩되면 바깥 단계에서 안쪽 단계 시간을 빼므로 각 단계 합계는 겹치지 않음
+    (예: vault 조회를 포함하는 crypto 구간은 순수 로컬 연산 시간만 남음)
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.durations = {}
+        self._stack = []  # [단계, 시작 시각, 안쪽 단계 소요 시간]
+
+    def enter(self, name):
+        self._stack.append([name, time.perf_counter(), 0.0])
+
+    def exit(self):
+        name, started, child_time = self._stack.pop()
+        elapsed = time.perf_counter() - started
+        self.durations[name] = self.durations.get(name, 0.0) + elapsed - child_time
+        if self._stack:
+            self._stack[-1][2] += elapsed
+
+    def total(self):
+        return time.perf_counter() - self.started
+
+
+@contextmanager
+def stage(name):
+    """현재 요청의 단계 시간 측정 (요청 밖에서 호출되면 아무것도 하지 않음)"""
+    timer = _current.get()
+    if timer is None:
+        yield
+        return
+    timer.enter(name)
+    try:
+        yield
+    finally:
+        timer.exit()
+
+
+def timed(name):
+    """함수 전체를 한 단계로 측정하는 데코레이터"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class _Histogram:
+    __slots__ = ('counts', 'sum', 'count')
+
+    def __init__(self, size):
+        self.counts = [0] * size
+        self.sum = 0.0
+        self.count = 0
+
+
+class StageMetrics:
+    """
+    라우트별 요청 시간 / 단계별 시간 히스토그램 (메모리 보관)
+
+    라우트 라벨은 URL 규칙(/api/user/<int:user_id>)을 사용하므로 라벨 수가 라우트 수로 제한됨
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._requests = {}  # (route, method, status) -> _Histogram
+        self._stages = {}    # (route, stage) -> _Histogram
+        self._collectors = []
+        self._lock = threading.Lock()
+
+    def add_collector(self, render):
+        """/metrics에 함께 내보낼 지표 추가 (render() -> Prometheus 텍스트)"""
+        self._collectors.append(render)
+
+    def _observe(self, table, key, value):
+        histogram = table.get(key)
+        if histogram is None:
+            histogram = table[key] = _Histogram(len(self.buckets) + 1)
+        histogram.counts[bisect.bisect_left(self.buckets, value)] += 1
+        histogram.sum += value
+        histogram.count += 1
+
+    def observe(self, route, method, status, total, durations):
+        """요청 하나의 전체 시간과 단계별 시간 기록 (초)"""
+        with self._lock:
+            self._observe(self._requests, (route, method, str(status)), total)
+            for name, seconds in durations.items():
+                self._observe(self._stages, (route, name), seconds)
+
+    def render_prometheus(self):
+        """Prometheus 텍스트 형식 (exposition format 0.0.4)"""
+        with self._lock:
+            requests_snapshot = [(key, list(h.counts), h.sum, h.count) for key, h in self._requests.items()]
+            stages_snapshot = [(key, list(h.counts), h.sum, h.count) for key, h in self._stages.items()]
+
+        lines = []
+        self._render(
+            lines, 'http_request_duration_seconds', '요청 처리 시간 (라우트별)',
+            ('route', 'method', 'status'), requests_snapshot
+        )
+        self._render(
+            lines, 'http_request_stage_duration_seconds', '요청 단계별 처리 시간 (db, vault, crypto, template)',
+            ('route', 'stage'), stages_snapshot
+        )
+        text = '\n'.join(lines) + '\n'
+        return text + ''.join(render() for render in self._collectors)
+
+    def _render(self, lines, metric, help_text, label_names, snapshot):
+        lines.append(f'# HELP {metric} {help_text}')
+        lines.append(f'# TYPE {metric} histogram')
+        for key, counts, total_sum, count in sorted(snapshot):
+            labels = ','.join(f'{name}="{_escape(value)}"' for name, value in zip(label_names, key))
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                lines.append(f'{metric}_bucket{{{labels},le="{bound:g}"}} {cumulative}')
+            lines.append(f'{metric}_bucket{{{labels},le="+Inf"}} {count}')
+            lines.append(f'{metric}_sum{{{labels}}} {total_sum:.6f}')
+            lines.append(f'{metric}_count{{{labels}}} {count}')
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _server_timing_header(durations, total):
+    parts = [f'{name};dur={seconds * 1000:.2f}' for name, seconds in durations.items()]
+    parts.append(f'total;dur={total * 1000:.2f}')
+    return ', '.join(parts)
+
+
+def init_app(app, metrics=None, server_timing_header=True):
+    """
+    Flask 앱에 단계별 시간 측정 연결
+
+    - 요청마다 StageTimer를 만들고 응답에 Server-Timing 헤더 추가
+    - 템플릿 렌더링은 Flask 시그널로 template 단계에 기록
+    - GET /metrics에서 히스토그램을 Prometheus 형식으로 제공
+    """
+    metrics = metrics or StageMetrics()
+
+    @app.before_request
+    def _start_timer():
+        g._stage_timer_token = _current.set(StageTimer())
+
+    @app.after_request
+    def _finish_timer(response):
+        timer = _current.get()
+        if timer is None:
+            return response
+        total = timer.total()
+        route = request.url_rule.rule if request.url_rule is not None else '<unmatched>'
+        metrics.observe(route, request.method, response.status_code, total, timer.durations)
+        if server_timing_header:
+            response.headers['Server-Timing'] = _server_timing_header(timer.durations, total)
+        return response
+
+    @app.teardown_request
+    def _reset_timer(exc=None):
+        token = g.pop('_stage_timer_token', None)
+        if token is not None:
+            _current.reset(token)
+
+    def _template_started(sender, template, context, **extra):
+        timer = _current.get()
+        if timer is not None:
+            timer.enter('template')
+
+    def _template_finished(sender, template, context, **extra):
+        timer = _current.get()
+        if timer is not None and timer._stack and timer._stack[-1][0] == 'template':
+            timer.exit()
+
+    before_render_template.connect(_template_started, app, weak=False)
+    template_rendered.connect(_template_finished, app, weak=False)
+
+    @app.route('/metrics', methods=['GET'])
+    def prometheus_metrics():
+        """요청/단계별 처리 시간 히스토그램 (Prometheus 텍스트 형식)"""
+        return Response(metrics.render_prometheus(), mimetype='text/plain; version=0.0.4')
+
+    return metrics